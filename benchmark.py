@@ -0,0 +1,730 @@
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+from cache import MemoryCache, SQLiteCache
+from clause_arrays import ClauseArrays
+from codec import (decode_clauses, decode_formulas, encode_clauses, encode_formulas,
+                   from_binary, from_flat_json, to_binary, to_flat_json)
+from enums import Connective, Quantifier, Type
+from events import NullSink, PrintSink, RecordSink
+from formula import Unary, Binary, Variable, Function, Formula
+from loader import Problem, load_problems
+from mvp.domain.services.transpiler import Transpiler
+from preprocessor import PreProcessor, count_conjuncts, create_formula_from_json
+from prover import ResolutionProver
+from simplifier import ClauseSimplifier
+from terms import SKOLEM_CONSTANT, SKOLEM_FUNCTION, get_skolem_name, is_skolem_constant, is_skolem_function
+from traversal import walk
+
+
+class DictNode:
+    # the layout formula nodes had before __slots__, an instance __dict__ with
+    # a var_count and quant_list of every node's own
+    def __init__(self, formula_type: Type):
+        self._formula_type = formula_type
+        self._var_count = {}
+        self._quant_list = []
+
+
+class DictBinary(DictNode):
+    def __init__(self, left: DictNode, right: DictNode, connective: Connective, is_clause=False):
+        super().__init__(Type.BINARY)
+        self._left = left
+        self._connective = connective
+        self._right = right
+        self._is_clause = is_clause
+
+
+class DictVariable(DictNode):
+    def __init__(self, var_name: str):
+        super().__init__(Type.VARIABLE)
+        self._var_name = var_name
+
+
+class DictFunction(DictNode):
+    def __init__(self, func_name: str, inside: DictNode, negation=False, assigned=True):
+        super().__init__(Type.FUNCTION)
+        self._func_name = func_name
+        self._inside = inside
+        self._negation = negation
+        self._assigned = assigned
+
+
+def build_disjunction(size: int, binary=Binary, function=Function, variable=Variable) -> Formula:
+    # left nested disjunction F0(x) ∨ F1(x) ∨ ... the shape generated problems come in
+    names = ["F" + str(i) for i in range(26)]
+    formula = function(names[0], variable("x"))
+    for i in range(1, size):
+        formula = binary(
+            formula,
+            function(names[i % 26], variable("x")),
+            Connective.OR
+        )
+    return formula
+
+
+def benchmark_node_memory(size=100000):
+    print("Node memory, " + str(size) + " literals")
+    # every literal is a Function over a Variable, joined by size - 1 Binary nodes
+    node_count = 3 * size - 1
+    print("nodes: " + str(node_count))
+
+    for name, classes in [("__dict__", (DictBinary, DictFunction, DictVariable)), ("__slots__", (Binary, Function, Variable))]:
+        tracemalloc.start()
+        start = tracemalloc.get_traced_memory()[0]
+        formula = build_disjunction(size, *classes)
+        used = tracemalloc.get_traced_memory()[0] - start
+        tracemalloc.stop()
+        del formula
+        print(name + ": " + str(used) + " bytes, " + str(round(used / node_count, 1)) + " bytes per node")
+
+
+def benchmark_rendering(size=10000, repeat=100):
+    print("Rendering, " + str(size) + " literals")
+    formula = build_disjunction(size)
+
+    start = time.perf_counter()
+    formula.to_string()
+    print("first render: " + str(round((time.perf_counter() - start) * 1000, 3)) + "ms")
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        formula.to_string()
+    elapsed = (time.perf_counter() - start) / repeat
+    print("unchanged render: " + str(round(elapsed * 1000, 3)) + "ms")
+
+    # changing the deepest literal invalidates the whole left spine, but not the other literals
+    leaf = formula
+    while isinstance(leaf, Binary):
+        leaf = leaf.get_left()
+    start = time.perf_counter()
+    for r in range(repeat):
+        leaf.set_negation(r % 2 == 0)
+        formula.to_string()
+    elapsed = (time.perf_counter() - start) / repeat
+    print("render after a change: " + str(round(elapsed * 1000, 3)) + "ms")
+
+
+def build_clauses(size: int) -> [[Formula]]:
+    # clauses of one to three literals over 26 predicates, some with Skolem terms
+    names = ["F" + str(i) for i in range(26)]
+    clauses = []
+    for c in range(size):
+        clause = []
+        for i in range(c % 3 + 1):
+            term = Variable("x" + str(c % 7))
+            if (c + i) % 5 == 0:
+                term = Function("f", term)
+            clause.append(Function(names[(c * 7 + i) % 26], term, (c + i) % 2 == 0))
+        clauses.append(clause)
+    return clauses
+
+
+def benchmark_clause_arrays(size=1000000):
+    print("Clause statistics, " + str(size) + " clauses")
+    clauses = build_clauses(size)
+
+    # literal counts, predicate frequencies and clause weights by looping over the objects
+    start = time.perf_counter()
+    lengths = [len(clause) for clause in clauses]
+    frequencies = {}
+    weights = []
+    for clause in clauses:
+        weight = 0
+        for literal in clause:
+            key = (literal.get_func_name(), literal.get_negation())
+            frequencies[key] = frequencies.get(key, 0) + 1
+            term = literal.get_inside()
+            weight += 2
+            while isinstance(term, Function):
+                weight += 1
+                term = term.get_inside()
+        weights.append(weight)
+    print("objects: " + str(round((time.perf_counter() - start) * 1000, 3)) + "ms")
+
+    start = time.perf_counter()
+    arrays = ClauseArrays.from_clauses(clauses)
+    print("export: " + str(round((time.perf_counter() - start) * 1000, 3)) + "ms")
+
+    start = time.perf_counter()
+    array_lengths = arrays.get_clause_lengths()
+    arrays.get_predicate_frequencies()
+    arrays.get_pure_predicates()
+    array_weights = arrays.get_clause_weights()
+    print("arrays: " + str(round((time.perf_counter() - start) * 1000, 3)) + "ms")
+    if array_lengths.tolist() != lengths or array_weights.tolist() != weights:
+        raise Exception("Clause arrays disagree with the clause objects")
+
+    start = time.perf_counter()
+    arrays.to_clauses()
+    print("load: " + str(round((time.perf_counter() - start) * 1000, 3)) + "ms")
+
+
+def build_postfix_corpus(size: int) -> [[str]]:
+    # postfix inputs shaped like the test files, with 2 to 9 atoms each
+    names = ["F" + str(i) for i in range(26)]
+    connectives = ["AND", "OR", "->", "<->"]
+    corpus = []
+    for f in range(size):
+        tokens = ["FORM", names[f % 26], "x"]
+        for i in range(1, f % 8 + 2):
+            tokens += ["FORM", names[(f + i) % 26], "y" if i % 2 else "x"]
+            if i % 3 == 0:
+                tokens.append("NOT")
+            tokens.append(connectives[(f + i) % 4])
+        tokens += ["EXIST", "y", "FORALL", "x"]
+        corpus.append(tokens)
+    return corpus
+
+
+def transpile_with_if_chain(formula_input: [str]) -> Formula:
+    # the postfix transpiler main.py had before Transpiler, every token tested against every keyword
+    formula_holder = []
+    var_count = {}
+
+    for p, part in enumerate(formula_input):
+        if part == "->":
+            right = formula_holder.pop()
+            left = formula_holder.pop()
+            formula_holder.append(Binary(left, right, Connective.IMPLICATION))
+        if part == "<->":
+            right = formula_holder.pop()
+            left = formula_holder.pop()
+            formula_holder.append(Binary(left, right, Connective.BICONDITIONAL))
+        if part == "AND":
+            right = formula_holder.pop()
+            left = formula_holder.pop()
+            formula_holder.append(Binary(left, right, Connective.AND))
+        if part == "OR":
+            right = formula_holder.pop()
+            left = formula_holder.pop()
+            formula_holder.append(Binary(left, right, Connective.OR))
+        if part == "FORM":
+            func_name = formula_input[p + 1]
+            var_name = formula_input[p + 2]
+            if var_name not in var_count:
+                var_count[var_name] = 1
+            else:
+                var_count[var_name] += 1
+            formula_holder.append(Function(func_name, Variable(var_name)))
+        if part == "NOT":
+            inside = formula_holder.pop()
+            formula_holder.append(Unary(inside, Quantifier.NONE, True, ""))
+        if part == "FORALL":
+            inside = formula_holder.pop()
+            var_name = formula_input[p + 1]
+            if var_name not in var_count:
+                var_count[var_name] = 1
+            formula_holder.append(Unary(inside, Quantifier.UNIVERSAL, False, var_name))
+        if part == "EXIST":
+            inside = formula_holder.pop()
+            var_name = formula_input[p + 1]
+            if var_name not in var_count:
+                var_count[var_name] = 1
+            formula_holder.append(Unary(inside, Quantifier.EXISTENTIAL, False, var_name))
+        if part == "done":
+            break
+
+    formula = formula_holder.pop()
+    formula.set_var_count(var_count)
+    return formula
+
+
+def benchmark_transpiler(size=100000):
+    print("Postfix transpiling, " + str(size) + " formulas")
+    corpus = build_postfix_corpus(size)
+    token_count = sum(len(tokens) for tokens in corpus)
+    transpiler = Transpiler(Unary, Binary, Function, Variable, Connective, Quantifier)
+    print("tokens: " + str(token_count))
+
+    for name, transpile in [("if-chain", transpile_with_if_chain), ("Transpiler", transpiler.transpile)]:
+        start = time.perf_counter()
+        for tokens in corpus:
+            transpile(tokens)
+        elapsed = time.perf_counter() - start
+        print(name + ": " + str(round(elapsed * 1000, 3)) + "ms, " + str(round(token_count / elapsed)) + " tokens per second")
+
+    for tokens in corpus[:1000]:
+        if transpile_with_if_chain(tokens).to_string() != transpiler.transpile(tokens).to_string():
+            raise Exception("Transpiler disagrees with the if-chain on " + " ".join(tokens))
+
+
+def build_quantified_formula(size: int, seed=0) -> Formula:
+    # a random formula of about size atoms with arrows and negations, where a fifth of the
+    # subformulas get a quantifier over a variable whose occurrences are all inside them,
+    # built bottom up without recursion
+    generator = random.Random(seed)
+    names = ["F" + str(i) for i in range(26)]
+    connectives = [Connective.AND, Connective.OR, Connective.IMPLICATION]
+    # names without digits, the subscripts added by standardization can't make one name into another
+    var_names = ["v" + "".join(chr(ord("a") + int(digit)) for digit in str(i)) for i in range(size // 4 + 1)]
+    var_count = {}
+
+    # every entry is a subformula and the occurrences of the variables it doesn't bind yet
+    level = []
+    for i in range(size):
+        var_name = var_names[generator.randrange(len(var_names))]
+        var_count[var_name] = var_count.get(var_name, 0) + 1
+        level.append((Function(names[i % 26], Variable(var_name)), {var_name: 1}))
+    while len(level) > 1:
+        next_level = []
+        for i in range(0, len(level) - 1, 2):
+            (left, left_free), (right, right_free) = level[i], level[i + 1]
+            formula = Binary(left, right, connectives[generator.randrange(3)])
+            free = left_free.copy()
+            for var_name, count in right_free.items():
+                free[var_name] = free.get(var_name, 0) + count
+            if generator.random() < 0.2:
+                formula = Unary(formula, Quantifier.NONE, True, "")
+            bindable = [var_name for var_name, count in free.items() if count == var_count[var_name]]
+            if bindable and generator.random() < 0.2:
+                var_name = min(bindable)
+                del free[var_name]
+                quantifier = generator.choice([Quantifier.UNIVERSAL, Quantifier.EXISTENTIAL])
+                formula = Unary(formula, quantifier, False, var_name)
+            next_level.append((formula, free))
+        if len(level) % 2:
+            next_level.append(level[-1])
+        level = next_level
+
+    formula, free = level[0]
+    for var_name in sorted(free):
+        formula = Unary(formula, Quantifier.UNIVERSAL, False, var_name)
+    formula.set_var_count(var_count)
+    return formula
+
+
+def normalize_in_steps(formula: Formula) -> Formula:
+    preprocessor = PreProcessor([formula], NullSink())
+    preprocessor.normalize_in_steps()
+    return preprocessor.get_arg()[0]
+
+
+def benchmark_prenex(size=2000):
+    print("Prenex normalization, " + str(size) + " atoms")
+    formula = build_quantified_formula(size)
+    print("variables: " + str(len(formula.get_var_count())))
+
+    steps_input = formula.copy()
+    start = time.perf_counter()
+    in_steps = normalize_in_steps(steps_input)
+    print("separate passes: " + str(round((time.perf_counter() - start) * 1000, 3)) + "ms")
+
+    fused_input = formula.copy()
+    start = time.perf_counter()
+    fused = PreProcessor([]).normalize_formula(fused_input)
+    print("fused pass: " + str(round((time.perf_counter() - start) * 1000, 3)) + "ms")
+
+    if (fused.to_string() != in_steps.to_string()
+            or fused.get_quant_list() != in_steps.get_quant_list()):
+        raise Exception("Fused normalization disagrees with the separate passes")
+
+
+def benchmark_standardize(size=4000):
+    print("Variable standardization, " + str(size) + " atoms")
+    formula = build_quantified_formula(size)
+    var_count = formula.get_var_count()
+    print("variables: " + str(len(var_count)))
+    preprocessor = PreProcessor([])
+
+    per_variable = formula.copy()
+    start = time.perf_counter()
+    for var in var_count:
+        preprocessor.set_subscript(0)
+        per_variable = preprocessor.standardize_variables(per_variable, var)
+    print("one pass per variable: " + str(round((time.perf_counter() - start) * 1000, 3)) + "ms")
+
+    scoped = formula.copy()
+    start = time.perf_counter()
+    scoped = preprocessor.standardize_all_variables(scoped)
+    print("scoped single pass: " + str(round((time.perf_counter() - start) * 1000, 3)) + "ms")
+
+    if scoped.to_string() != per_variable.to_string():
+        raise Exception("Scoped standardization disagrees with the per variable passes")
+
+
+def build_alternating_formula(depth: int) -> Formula:
+    # complete tree of ORs over ANDs over ORs ..., with ANDs right above the atoms,
+    # the shape of the infix.txt example grown to the given depth
+    names = ["F" + str(i) for i in range(26)]
+    level = [Function(names[i % 26], Variable("x")) for i in range(2 ** depth)]
+    connective = Connective.AND
+    while len(level) > 1:
+        level = [Binary(level[i], level[i + 1], connective) for i in range(0, len(level), 2)]
+        connective = Connective.OR if connective == Connective.AND else Connective.AND
+    return level[0]
+
+
+def benchmark_cnf(depth=6):
+    print("CNF conversion, " + str(2 ** depth) + " atoms")
+    formula = build_alternating_formula(depth)
+    for definitional in (False, True):
+        start = time.perf_counter()
+        cnf = PreProcessor([]).convert_to_cnf(formula.copy(), definitional)
+        elapsed = time.perf_counter() - start
+        mode = "definitional" if definitional else "distributive"
+        print(mode + ": " + str(count_conjuncts(cnf)) + " clauses, " + str(round(elapsed * 1000, 3)) + "ms")
+
+
+def build_biconditional_chain(size: int) -> Formula:
+    # F1(x) ⇔ (F2(x) ⇔ (... ⇔ Fsize(x)))
+    formula = Function("F" + str(size), Variable("x"))
+    for i in range(size - 1, 0, -1):
+        formula = Binary(Function("F" + str(i), Variable("x")), formula, Connective.BICONDITIONAL)
+    return formula
+
+
+def benchmark_biconditional(size=10):
+    print("Biconditional chain, " + str(size) + " atoms")
+    for negated in (False, True):
+        formula = build_biconditional_chain(size)
+        if negated:
+            formula = Unary(formula, Quantifier.NONE, True, "")
+        preprocessor = PreProcessor([])
+        start = time.perf_counter()
+        formula = preprocessor.remove_arrows(formula)
+        formula = preprocessor.move_negation_inward(formula, False)
+        cnf = preprocessor.convert_to_cnf(formula)
+        elapsed = time.perf_counter() - start
+        occurrence = "negative" if negated else "positive"
+        print(occurrence + ": " + str(count_conjuncts(cnf)) + " clauses, " + str(round(elapsed * 1000, 3)) + "ms")
+
+
+def benchmark_miniscope(size=2000):
+    print("Skolemization with and without miniscoping, " + str(size) + " atoms")
+    formula = build_quantified_formula(size)
+    for miniscoped in (False, True):
+        preprocessor = PreProcessor([formula.copy()], NullSink())
+        start = time.perf_counter()
+        preprocessor.normalize_to_prenex(scoped=True, miniscoped=miniscoped)
+        elapsed = time.perf_counter() - start
+        skolemized = preprocessor.get_arg()[0]
+
+        functions = 0
+        constants = 0
+        for node in walk(skolemized):
+            if node.get_formula_type() == Type.FUNCTION and is_skolem_function(node.get_func_name()):
+                functions += 1
+            elif node.get_formula_type() == Type.VARIABLE and is_skolem_constant(node.get_var_name()):
+                constants += 1
+        mode = "miniscoped" if miniscoped else "prenex"
+        print(mode + ": " + str(functions) + " Skolem functions, " + str(constants) + " Skolem constants, "
+              + str(len(skolemized.get_quant_list())) + " universals, " + str(round(elapsed * 1000, 3)) + "ms")
+
+
+def solve_problem(problem: Problem, sink):
+    # the steps of main.solve_problems, with the steps reported to sink
+    preprocessor = PreProcessor(Problem(problem.get_inputs()).get_arg(), sink)
+    preprocessor.negate_conclusion()
+    sink.argument(preprocessor)
+    preprocessor.normalize_to_prenex()
+    sink.argument(preprocessor)
+    clauses = preprocessor.convert_to_clauses()
+    sink.clauses(preprocessor)
+    ResolutionProver(clauses, preprocessor.get_negated_conclusion()[0], sink).apply_resolution()
+
+
+def benchmark_events(repeat=200):
+    # every problem of the example files, parsed again for each run since the passes modify it
+    problems = [
+        problem
+        for source in ("test1.txt", "test2.txt", "test3.txt")
+        for problem in load_problems(source)
+    ]
+    print("Event sinks, " + str(len(problems)) + " problems solved " + str(repeat) + " times")
+
+    with open(os.devnull, "w") as devnull:
+        for name, create_sink in (("printing", PrintSink), ("records", RecordSink), ("silent", NullSink)):
+            sink = create_sink()
+            start = time.perf_counter()
+            with redirect_stdout(devnull):
+                for _ in range(repeat):
+                    for problem in problems:
+                        solve_problem(problem, sink)
+            elapsed = time.perf_counter() - start
+            print(name + ": " + str(round(repeat * len(problems) / elapsed, 1)) + " problems/s")
+
+
+def print_clauses(clauses: [[Formula]]) -> [str]:
+    return [" ∨ ".join(literal.to_string() for literal in clause) for clause in clauses]
+
+
+def benchmark_parallel(count=1000, size=12):
+    print("Parallel preprocessing, " + str(count) + " formulas of " + str(size) + " atoms")
+    # the last formula is the conclusion, it is negated like main.preprocess does
+    argument = [build_quantified_formula(size, seed) for seed in range(count)]
+
+    preprocessor = PreProcessor([formula.copy() for formula in argument], NullSink())
+    preprocessor.negate_conclusion()
+    start = time.perf_counter()
+    preprocessor.normalize_to_prenex(scoped=True)
+    serial = print_clauses(preprocessor.convert_to_clauses(True))
+    print("serial: " + str(round((time.perf_counter() - start) * 1000, 3)) + "ms, " + str(len(serial)) + " clauses")
+
+    cores = os.cpu_count() or 1
+    for workers in sorted({1, 2, cores}):
+        preprocessor = PreProcessor([formula.copy() for formula in argument], NullSink())
+        preprocessor.negate_conclusion()
+        start = time.perf_counter()
+        parallel = print_clauses(preprocessor.preprocess_in_parallel(scoped=True, definitional=True, workers=workers))
+        print(str(workers) + " of " + str(cores) + " cores: " + str(round((time.perf_counter() - start) * 1000, 3)) + "ms")
+        if parallel != serial:
+            raise Exception("Parallel preprocessing disagrees with the serial steps")
+
+
+def rename_variables(formula: Formula, prefix: str) -> Formula:
+    # an alpha equivalent copy, every variable name gets the prefix
+    renamed = formula.copy()
+    for node in walk(renamed):
+        if node.get_formula_type() == Type.UNARY and node.get_quantifier() != Quantifier.NONE:
+            node.set_quant_var(prefix + node.get_quant_var())
+        elif node.get_formula_type() == Type.VARIABLE:
+            node.set_var(prefix + node.get_var_name())
+    renamed.set_var_count({prefix + var_name: count for var_name, count in formula.get_var_count().items()})
+    return renamed
+
+
+def benchmark_cache(count=1000, size=12):
+    print("Preprocessing cache, " + str(count) + " formulas of " + str(size) + " atoms")
+    argument = [build_quantified_formula(size, seed) for seed in range(count)]
+    # the second run has its first premise edited and every variable renamed
+    edited = [build_quantified_formula(size, count)] + [rename_variables(formula, "w") for formula in argument[1:]]
+
+    def preprocess(formulas: [Formula], cache=None) -> tuple:
+        preprocessor = PreProcessor([formula.copy() for formula in formulas], NullSink())
+        preprocessor.negate_conclusion()
+        start = time.perf_counter()
+        if cache is None:
+            preprocessor.normalize_to_prenex(scoped=True)
+            clauses = preprocessor.convert_to_clauses(True)
+        else:
+            clauses = preprocessor.preprocess_cached(cache, scoped=True, definitional=True)
+        return print_clauses(clauses), time.perf_counter() - start, preprocessor.get_cache_hits()
+
+    serial, elapsed, _ = preprocess(edited)
+    print("serial: " + str(round(elapsed * 1000, 3)) + "ms")
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_cache.db")
+    if os.path.exists(path):
+        os.remove(path)
+    sqlite_cache = SQLiteCache(path)
+    for name, cache in (("memory", MemoryCache()), ("sqlite", sqlite_cache)):
+        _, elapsed, _ = preprocess(argument, cache)
+        print(name + " cold: " + str(round(elapsed * 1000, 3)) + "ms")
+        cached, elapsed, hits = preprocess(edited, cache)
+        print(name + " after the edit: " + str(round(elapsed * 1000, 3)) + "ms, " + str(hits) + " formulas cached")
+        if cached != serial:
+            raise Exception("Cached preprocessing disagrees with the serial steps")
+    sqlite_cache.close()
+    os.remove(path)
+
+
+def benchmark_codec(size=100000):
+    print("Formula encodings, " + str(size) + " clauses")
+    clauses = build_clauses(size)
+    expected = [[literal.to_json() for literal in clause] for clause in clauses]
+
+    def encode_nested() -> str:
+        return json.dumps([[literal.to_json() for literal in clause] for clause in clauses])
+
+    def decode_nested(text: str) -> [[Formula]]:
+        return [[create_formula_from_json(literal) for literal in clause] for clause in json.loads(text)]
+
+    encodings = (
+        ("nested json", encode_nested, decode_nested),
+        ("flat json", lambda: to_flat_json(encode_clauses(clauses)), lambda text: decode_clauses(from_flat_json(text))),
+        ("binary", lambda: to_binary(encode_clauses(clauses)), lambda data: decode_clauses(from_binary(data)))
+    )
+    for name, encode, decode in encodings:
+        start = time.perf_counter()
+        encoded = encode()
+        encode_time = time.perf_counter() - start
+        start = time.perf_counter()
+        decoded = decode(encoded)
+        decode_time = time.perf_counter() - start
+        print(name + ": " + str(len(encoded)) + " bytes, encode " + str(round(encode_time * 1000, 3))
+              + "ms, decode " + str(round(decode_time * 1000, 3)) + "ms")
+        if [[literal.to_json() for literal in clause] for clause in decoded] != expected:
+            raise Exception(name + " doesn't give the clauses back")
+
+    # prenex formulas keep their quantifier list, which the nested json can't write out
+    preprocessor = PreProcessor([build_quantified_formula(2000), build_quantified_formula(2000, 1)], NullSink())
+    preprocessor.normalize_to_prenex(scoped=True)
+    formulas = preprocessor.get_arg()
+    for name, decoded in (
+            ("flat json", decode_formulas(from_flat_json(to_flat_json(encode_formulas(formulas))))),
+            ("binary", decode_formulas(from_binary(to_binary(encode_formulas(formulas)))))
+    ):
+        if [formula.to_json() for formula in decoded] != [formula.to_json() for formula in formulas]:
+            raise Exception(name + " doesn't give the prenex formulas back")
+    print("prenex formulas round trip")
+
+
+def benchmark_simplify(size=20000, seed=0):
+    print("Clause simplification, " + str(size) + " clauses")
+    # clauses of two to four literals over few predicates and variables, so that
+    # every rule has something to remove
+    generator = random.Random(seed)
+    names = ["F" + str(i) for i in range(100)]
+    clauses = []
+    for _ in range(size):
+        clause = []
+        for _ in range(generator.randint(2, 4)):
+            term = Variable(generator.choice(["x", "y", get_skolem_name(SKOLEM_CONSTANT, 1)]))
+            if generator.random() < 0.3:
+                term = Function(SKOLEM_FUNCTION, term)
+            clause.append(Function(generator.choice(names), term, generator.random() < 0.5))
+        clauses.append(clause)
+
+    simplifier = ClauseSimplifier()
+    start = time.perf_counter()
+    simplified = simplifier.simplify(clauses, 1)
+    elapsed = time.perf_counter() - start
+    for rule, count in simplifier.get_removed().items():
+        print(rule + ": " + str(count))
+    print("clauses left: " + str(len(simplified)) + ", " + str(round(elapsed * 1000, 3)) + "ms")
+
+
+def build_chain_problem(length: int, noise: int, seed=0) -> tuple:
+    # F0(u₁) and the chain ¬Fi(x) ∨ Fi+1(x) down to ¬Fn(x), among clauses with
+    # extra literals over other predicates that resolve into ever larger clauses
+    generator = random.Random(seed)
+    clauses = []
+    for i in range(length):
+        clauses.append([Function("F" + str(i), Variable("x"), True), Function("F" + str(i + 1), Variable("x"))])
+    clauses.append([Function("F" + str(length), Variable("x"), True)])
+    for _ in range(noise):
+        clause = [Function("F" + str(generator.randrange(length)), Variable("x"), True)]
+        for _ in range(generator.randint(2, 4)):
+            term = Variable("x")
+            if generator.random() < 0.5:
+                term = Function(SKOLEM_FUNCTION, term)
+            clause.append(Function("G" + str(generator.randrange(5)), term, generator.random() < 0.5))
+        clauses.append(clause)
+    generator.shuffle(clauses)
+    negated_conclusion = [[Function("F0", Variable(get_skolem_name(SKOLEM_CONSTANT, 1)))]]
+    return clauses + negated_conclusion, negated_conclusion
+
+
+def benchmark_given_clause(length=20, noise=60, max_given=200):
+    print("Given-clause loop, chain of " + str(length) + " among " + str(noise) + " noisy clauses")
+    clauses, negated_conclusion = build_chain_problem(length, noise)
+    # pick ratio 0 gives by age only, a breadth first search
+    for pick_ratio in [0, 1, 5, 20]:
+        sink = RecordSink()
+        prover = ResolutionProver(clauses, negated_conclusion, sink)
+        start = time.perf_counter()
+        proved = prover.saturate(pick_ratio, max_given)
+        elapsed = time.perf_counter() - start
+        events = [record["event"] for record in sink.get_records()]
+        print(
+            "pick ratio " + str(pick_ratio) + ": " + ("proved" if proved else "gave up") +
+            ", " + str(events.count("given")) + " given, " + str(events.count("resolution")) + " resolvents, " +
+            str(round(elapsed * 1000, 3)) + "ms"
+        )
+
+
+def benchmark_literal_index(sizes=(1000, 10000, 50000), lookups=200, seed=0):
+    print("Resolution partner lookups, " + str(lookups) + " literals")
+    generator = random.Random(seed)
+    names = ["F" + str(i) for i in range(200)]
+    constant = get_skolem_name(SKOLEM_CONSTANT, 1)
+    for size in sizes:
+        clauses = [
+            [Function(generator.choice(names), Variable("x"), generator.random() < 0.5) for _ in range(generator.randint(1, 4))]
+            for _ in range(size)
+        ]
+        start = time.perf_counter()
+        prover = ResolutionProver(clauses, [[Function(names[0], Variable(constant))]], NullSink())
+        loaded = time.perf_counter() - start
+        targets = [prover.load_clause([Function(generator.choice(names), Variable(constant))])[0] for _ in range(lookups)]
+
+        # what ResolutionProver.resolve did before the index, every atom of every clause
+        start = time.perf_counter()
+        found = 0
+        for target in targets:
+            for clause in prover.get_clauses():
+                for atom in clause:
+                    if atom.get_symbol() == target.get_symbol() and atom.get_negation() != target.get_negation():
+                        found += 1
+        scanned = time.perf_counter() - start
+
+        start = time.perf_counter()
+        indexed_found = 0
+        for target in targets:
+            for positions in prover.get_index().get_complements(target).values():
+                indexed_found += len(positions)
+        indexed = time.perf_counter() - start
+        if found != indexed_found:
+            raise Exception("The literal index disagrees with the scan")
+        print(
+            str(size) + " clauses: load and index " + str(round(loaded * 1000, 3)) + "ms, scan " +
+            str(round(lookups / scanned)) + " lookups/s, index " + str(round(lookups / indexed)) + " lookups/s"
+        )
+
+    # given clauses per second while the active set grows, picked by age so the loop runs on
+    clauses, negated_conclusion = build_chain_problem(40, 200)
+    sink = RecordSink()
+    ResolutionProver(clauses, negated_conclusion, sink).saturate(0, 400)
+    given = [record["timestamp"] for record in sink.get_records() if record["event"] == "given"]
+    resolutions = [record["timestamp"] for record in sink.get_records() if record["event"] == "resolution"]
+    for first in range(0, len(given) - 100, 100):
+        last = first + 100
+        elapsed = given[last] - given[first]
+        made = sum(1 for timestamp in resolutions if given[first] <= timestamp < given[last])
+        print(
+            "given " + str(first) + " to " + str(last) + ": " + str(round(100 / elapsed)) + " given/s, " +
+            str(round(made / elapsed)) + " resolvents/s"
+        )
+
+
+def benchmark_subsumption(sizes=((20, 60), (40, 200), (60, 400)), pick_ratio=5, max_given=400):
+    print("Subsumption in the given-clause loop, pick ratio " + str(pick_ratio))
+    for length, noise in sizes:
+        clauses, negated_conclusion = build_chain_problem(length, noise)
+        for subsumption in [False, True]:
+            sink = RecordSink()
+            prover = ResolutionProver(clauses, negated_conclusion, sink)
+            start = time.perf_counter()
+            proved = prover.saturate(pick_ratio, max_given, subsumption)
+            elapsed = time.perf_counter() - start
+            events = [record["event"] for record in sink.get_records()]
+            print(
+                "chain of " + str(length) + " among " + str(noise) + ", " +
+                ("with" if subsumption else "without") + " subsumption: " + ("proved" if proved else "gave up") +
+                ", " + str(events.count("given")) + " given, " + str(events.count("resolution")) + " resolvents kept, " +
+                ", ".join(str(count) + " " + rule for rule, count in prover.get_removed().items()) + ", " +
+                str(round(elapsed * 1000, 3)) + "ms"
+            )
+
+
+BENCHMARKS = {
+    "memory": benchmark_node_memory,
+    "rendering": benchmark_rendering,
+    "clause_arrays": benchmark_clause_arrays,
+    "transpiler": benchmark_transpiler,
+    "prenex": benchmark_prenex,
+    "standardize": benchmark_standardize,
+    "cnf": benchmark_cnf,
+    "biconditional": benchmark_biconditional,
+    "miniscope": benchmark_miniscope,
+    "events": benchmark_events,
+    "parallel": benchmark_parallel,
+    "cache": benchmark_cache,
+    "codec": benchmark_codec,
+    "simplify": benchmark_simplify,
+    "given_clause": benchmark_given_clause,
+    "literal_index": benchmark_literal_index,
+    "subsumption": benchmark_subsumption,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+        print("")
@@ -0,0 +1,165 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+from collections import OrderedDict
+from typing import Dict
+
+from enums import Quantifier, Type
+from formula import Formula
+from traversal import walk
+
+# part of every key, so entries written by an older format are never read
+CACHE_VERSION = 4
+# number of entries MemoryCache keeps by default
+MEMORY_CACHE_SIZE = 4096
+
+
+def get_canonical_name(index: int) -> str:
+    # letters only, so the subscripts added by standardization can be told apart from the name
+    return "v" + "".join(chr(ord("a") + int(digit)) for digit in str(index))
+
+
+def get_canonical_names(formula: Formula) -> Dict[str, str]:
+    """
+    Names the variables va, vb, ... in the order of var_count and then of
+    first occurrence, so formulas that only differ in the names of their
+    variables get the same canonical names.
+    """
+    names = {}
+    for var_name in formula.get_var_count():
+        names.setdefault(var_name, get_canonical_name(len(names)))
+    for node in walk(formula):
+        if node.get_formula_type() == Type.UNARY and node.get_quantifier() != Quantifier.NONE:
+            names.setdefault(node.get_quant_var(), get_canonical_name(len(names)))
+        elif node.get_formula_type() == Type.VARIABLE:
+            names.setdefault(node.get_var_name(), get_canonical_name(len(names)))
+    return names
+
+
+def get_cache_key(formula: Formula, names: Dict[str, str], options: tuple) -> str:
+    # the nodes in pre-order with the canonical names, the options change the clauses as well
+    tokens = [str(CACHE_VERSION), repr(options)]
+    tokens.extend(names[var_name] for var_name in formula.get_var_count())
+    tokens.append("|")
+    tokens.extend(str(quantifier.value) + names.get(var_name, var_name) for quantifier, var_name in formula.get_quant_list())
+    for node in walk(formula):
+        formula_type = node.get_formula_type()
+        if formula_type == Type.BINARY:
+            tokens.append("B" + str(node.get_connective().value))
+        elif formula_type == Type.UNARY:
+            tokens.append("U" + str(node.get_quantifier().value) + str(int(node.get_negation())))
+            if node.get_quantifier() != Quantifier.NONE:
+                tokens.append(names[node.get_quant_var()])
+        elif formula_type == Type.FUNCTION:
+            tokens.append("F" + str(int(node.get_negation())) + str(int(node.get_assigned())))
+            tokens.append(node.get_func_name())
+        else:
+            tokens.append("V" + names[node.get_var_name()])
+    return hashlib.sha256(" ".join(tokens).encode("utf-8")).hexdigest()
+
+
+def canonicalize(formula: Formula, names: Dict[str, str]) -> Formula:
+    # a copy of the formula with the variables renamed to their canonical names
+    canonical = formula.copy()
+    for node in walk(canonical):
+        if node.get_formula_type() == Type.UNARY and node.get_quantifier() != Quantifier.NONE:
+            node.set_quant_var(names[node.get_quant_var()])
+        elif node.get_formula_type() == Type.VARIABLE:
+            node.set_var(names[node.get_var_name()])
+
+    canonical.set_var_count({
+        names[var_name]: count for var_name, count in formula.get_var_count().items()
+    })
+    canonical.set_quant_list([
+        (quantifier, names.get(var_name, var_name)) for quantifier, var_name in formula.get_quant_list()
+    ])
+    return canonical
+
+
+class Cache:
+    """
+    Keeps the clauses of preprocessed formulas by their cache key. get
+    returns None for a key that isn't kept. Values are the tuples returned
+    by preprocessor.convert_formula. flush is called once the entries of an
+    argument are put, for backends that write them out together.
+    """
+
+    def get(self, key: str):
+        return None
+
+    def put(self, key: str, value):
+        pass
+
+    def flush(self):
+        pass
+
+
+class MemoryCache(Cache):
+    # keeps the most recently used entries of one run
+    def __init__(self, size=MEMORY_CACHE_SIZE):
+        self._size = size
+        self._entries = OrderedDict()
+
+    def get(self, key: str):
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._size:
+            self._entries.popitem(last=False)
+
+    def get_size(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(Cache):
+    # keeps entries across runs in one SQLite file, puts are committed by flush
+    def __init__(self, path: str):
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS clauses (key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+        )
+        self._connection.commit()
+
+    def get(self, key: str):
+        row = self._connection.execute("SELECT value FROM clauses WHERE key = ?", (key,)).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def put(self, key: str, value):
+        self._connection.execute(
+            "INSERT OR REPLACE INTO clauses (key, value) VALUES (?, ?)",
+            (key, pickle.dumps(value))
+        )
+
+    def flush(self):
+        self._connection.commit()
+
+    def close(self):
+        self._connection.commit()
+        self._connection.close()
+
+
+class FileCache(Cache):
+    # keeps entries across runs as one file per key in a directory
+    def __init__(self, directory: str):
+        self._directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str):
+        try:
+            with open(os.path.join(self._directory, key), "rb") as entry:
+                return pickle.load(entry)
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, value):
+        # written under another name first, so a reader never sees half an entry
+        path = os.path.join(self._directory, key)
+        with open(path + ".tmp", "wb") as entry:
+            pickle.dump(value, entry)
+        os.replace(path + ".tmp", path)
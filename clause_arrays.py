@@ -0,0 +1,233 @@
+from typing import Dict, Tuple
+
+from enums import Symbol, Type
+from formula import Formula, Function
+from symbols import SymbolTable
+from terms import build_term, get_term_chain
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# term kinds stored in ClauseArrays.term_kinds
+VARIABLE_TERM = 0
+FUNCTION_TERM = 1
+# term_arguments value of a term without an argument
+NO_ARGUMENT = -1
+
+
+class ClauseArrays:
+    """
+    Structure-of-arrays form of a clause set, for statistics over large sets
+    without touching Formula objects.
+    The literals of clause c are the slice offsets[c]:offsets[c + 1] of the
+    literal arrays (predicates, polarities, assigned, terms). Terms are
+    stored once each in the term arrays, a function term points at the term
+    id of its argument, so the arguments come before the terms using them.
+    """
+
+    def __init__(
+            self,
+            symbols: SymbolTable,
+            offsets,
+            predicates,
+            polarities,
+            assigned,
+            terms,
+            term_kinds,
+            term_symbols,
+            term_arguments
+    ):
+        self._symbols = symbols
+        self._offsets = offsets
+        self._predicates = predicates
+        self._polarities = polarities
+        self._assigned = assigned
+        self._terms = terms
+        self._term_kinds = term_kinds
+        self._term_symbols = term_symbols
+        self._term_arguments = term_arguments
+
+    @staticmethod
+    def from_clauses(clauses: [[Formula]], symbols=None) -> 'ClauseArrays':
+        """
+        Exports the output of PreProcessor.convert_to_clauses. The ids come
+        from symbols, a new SymbolTable is used if none is given.
+        """
+        if np is None:
+            raise Exception("NumPy is required for clause arrays")
+        if symbols is None:
+            symbols = SymbolTable()
+
+        term_ids: Dict[Tuple, int] = {}
+        term_kinds = []
+        term_symbols = []
+        term_arguments = []
+
+        def get_term(term: Formula) -> int:
+            # the chain of function terms down to the variable, outermost first
+            functions, variable = get_term_chain(term)
+            chain = functions + [variable]
+            if variable.get_formula_type() != Type.VARIABLE:
+                raise Exception("Literal arguments must be terms")
+
+            term_id = NO_ARGUMENT
+            for node in reversed(chain):
+                if node.get_formula_type() == Type.VARIABLE:
+                    key = (VARIABLE_TERM, symbols.get_id(Symbol.VARIABLE, node.get_var_name()), NO_ARGUMENT)
+                else:
+                    key = (FUNCTION_TERM, symbols.get_id(Symbol.FUNCTION, node.get_func_name()), term_id)
+                term_id = term_ids.get(key)
+                if term_id is None:
+                    term_id = len(term_kinds)
+                    term_ids[key] = term_id
+                    term_kinds.append(key[0])
+                    term_symbols.append(key[1])
+                    term_arguments.append(key[2])
+            return term_id
+
+        offsets = [0]
+        predicates = []
+        polarities = []
+        assigned = []
+        terms = []
+        for clause in clauses:
+            for literal in clause:
+                if literal.get_formula_type() != Type.FUNCTION:
+                    raise Exception("Clauses must only contain literals")
+                predicates.append(symbols.get_id(Symbol.PREDICATE, literal.get_func_name()))
+                polarities.append(not literal.get_negation())
+                assigned.append(literal.get_assigned())
+                terms.append(get_term(literal.get_inside()))
+            offsets.append(len(predicates))
+
+        return ClauseArrays(
+            symbols,
+            np.array(offsets, dtype=np.int64),
+            np.array(predicates, dtype=np.int32),
+            np.array(polarities, dtype=np.bool_),
+            np.array(assigned, dtype=np.bool_),
+            np.array(terms, dtype=np.int32),
+            np.array(term_kinds, dtype=np.int8),
+            np.array(term_symbols, dtype=np.int32),
+            np.array(term_arguments, dtype=np.int32)
+        )
+
+    def to_clauses(self) -> [[Formula]]:
+        """
+        Loads the clause set back into Formula objects. Every literal gets
+        its own term nodes, nothing is shared between literals.
+        """
+        symbols = self._symbols
+        kinds = self._term_kinds.tolist()
+        term_symbols = self._term_symbols.tolist()
+        arguments = self._term_arguments.tolist()
+        names = [
+            symbols.get_name(Symbol.VARIABLE if kind == VARIABLE_TERM else Symbol.FUNCTION, symbol)
+            for kind, symbol in zip(kinds, term_symbols)
+        ]
+
+        def load_term(term_id: int) -> Formula:
+            chain = [term_id]
+            while kinds[chain[-1]] == FUNCTION_TERM:
+                chain.append(arguments[chain[-1]])
+            return build_term([names[node] for node in chain], [term_symbols[node] for node in chain])
+
+        predicates = self._predicates.tolist()
+        polarities = self._polarities.tolist()
+        assigned = self._assigned.tolist()
+        terms = self._terms.tolist()
+        offsets = self._offsets.tolist()
+        clauses = []
+        for c in range(len(offsets) - 1):
+            clause = []
+            for i in range(offsets[c], offsets[c + 1]):
+                literal = Function(
+                    symbols.get_name(Symbol.PREDICATE, predicates[i]),
+                    load_term(terms[i]),
+                    not polarities[i],
+                    assigned[i]
+                )
+                literal.set_symbol(predicates[i])
+                clause.append(literal)
+            clauses.append(clause)
+        return clauses
+
+    def get_symbols(self) -> SymbolTable:
+        return self._symbols
+
+    def get_offsets(self):
+        return self._offsets
+
+    def get_predicates(self):
+        return self._predicates
+
+    def get_polarities(self):
+        return self._polarities
+
+    def get_assigned(self):
+        return self._assigned
+
+    def get_terms(self):
+        return self._terms
+
+    def get_term_kinds(self):
+        return self._term_kinds
+
+    def get_term_symbols(self):
+        return self._term_symbols
+
+    def get_term_arguments(self):
+        return self._term_arguments
+
+    def get_clause_count(self) -> int:
+        return len(self._offsets) - 1
+
+    def get_literal_count(self) -> int:
+        return len(self._predicates)
+
+    def get_clause_lengths(self):
+        return np.diff(self._offsets)
+
+    def get_clause_indices(self):
+        # the clause each literal belongs to
+        return np.repeat(
+            np.arange(self.get_clause_count(), dtype=np.int64),
+            self.get_clause_lengths()
+        )
+
+    def get_predicate_frequencies(self):
+        # occurrences of every predicate id, positive and negative
+        size = self._symbols.get_size(Symbol.PREDICATE)
+        return (
+            np.bincount(self._predicates[self._polarities], minlength=size),
+            np.bincount(self._predicates[~self._polarities], minlength=size)
+        )
+
+    def get_pure_predicates(self):
+        # predicates that occur with one polarity only, every clause holding one of them can be dropped
+        positive, negative = self.get_predicate_frequencies()
+        return np.flatnonzero((positive == 0) != (negative == 0))
+
+    def get_term_sizes(self):
+        # number of symbols in every term, arguments come before their terms
+        sizes = np.ones(len(self._term_kinds), dtype=np.int64)
+        # a function term is one bigger than its argument, walk down all chains together
+        functions = np.flatnonzero(self._term_kinds == FUNCTION_TERM)
+        current = self._term_arguments[functions]
+        while len(functions):
+            sizes[functions] += 1
+            nested = self._term_kinds[current] == FUNCTION_TERM
+            functions = functions[nested]
+            current = self._term_arguments[current[nested]]
+        return sizes
+
+    def get_clause_weights(self):
+        # symbol count of every clause: one per predicate plus the size of its term
+        literal_weights = 1 + self.get_term_sizes()[self._terms]
+        return np.bincount(
+            self.get_clause_indices(),
+            weights=literal_weights,
+            minlength=self.get_clause_count()
+        ).astype(np.int64)
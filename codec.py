@@ -0,0 +1,313 @@
+import json
+from typing import Dict, List
+
+from enums import Connective, Quantifier, Type
+from formula import Unary, Binary, Variable, Function, Formula
+
+# version of both formats, a payload of another version is refused
+CODEC_VERSION = 1
+# first bytes of the binary format
+BINARY_MAGIC = b"PFB" + bytes([CODEC_VERSION])
+
+# enum values looked up once, reading .value is slow in the loops below
+BINARY = Type.BINARY.value
+UNARY = Type.UNARY.value
+FUNCTION = Type.FUNCTION.value
+VARIABLE = Type.VARIABLE.value
+CONNECTIVE_VALUES = {connective: connective.value for connective in Connective}
+QUANTIFIER_VALUES = {quantifier: quantifier.value for quantifier in Quantifier}
+CONNECTIVES = {connective.value: connective for connective in Connective}
+QUANTIFIERS = {quantifier.value: quantifier for quantifier in Quantifier}
+
+
+def build_node_table(formulas: [Formula]) -> tuple:
+    """
+    Lists every node once, children before their parents, as
+    [type, fields..., child indices...]:
+    binary [2, connective, is_clause, left, right]
+    unary [1, quantifier, negation, quant_var, inside]
+    function [3, func_name, negation, assigned, inside]
+    variable [4, var_name]
+    A node reached more than once, like a literal the CNF shares between
+    clauses or any node of a FormulaTable, is listed once and decoded as
+    one node again. Returns the table and the index of every formula.
+    """
+    nodes = []
+    # id of every listed node to its index, with the node so its id isn't reused while encoding
+    indices = {}
+    roots = []
+    for formula in formulas:
+        # a node is pushed again under its children, and listed once they are
+        stack = [(formula, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in indices:
+                continue
+            formula_type = node.get_formula_type()
+            if formula_type is Type.VARIABLE:
+                indices[id(node)] = (node, len(nodes))
+                nodes.append([VARIABLE, node.get_var_name()])
+                continue
+            if formula_type is Type.FUNCTION and not expanded:
+                # terms are chains of functions down to a variable, list them without the stack
+                chain = [node]
+                inside = node.get_inside()
+                while inside.get_formula_type() is Type.FUNCTION and id(inside) not in indices:
+                    chain.append(inside)
+                    inside = inside.get_inside()
+                if id(inside) in indices:
+                    index = indices[id(inside)][1]
+                elif inside.get_formula_type() is Type.VARIABLE:
+                    index = len(nodes)
+                    indices[id(inside)] = (inside, index)
+                    nodes.append([VARIABLE, inside.get_var_name()])
+                else:
+                    # a function over a formula, listed through the stack like the connectives
+                    stack.append((node, True))
+                    stack.append((node.get_inside(), False))
+                    continue
+                for function in reversed(chain):
+                    nodes.append([FUNCTION, function.get_func_name(), function.get_negation(), function.get_assigned(), index])
+                    index = len(nodes) - 1
+                    indices[id(function)] = (function, index)
+                continue
+            if not expanded:
+                stack.append((node, True))
+                if formula_type is Type.BINARY:
+                    stack.append((node.get_right(), False))
+                    stack.append((node.get_left(), False))
+                else:
+                    stack.append((node.get_inside(), False))
+                continue
+            if formula_type is Type.BINARY:
+                entry = [
+                    BINARY, CONNECTIVE_VALUES[node.get_connective()], node.get_is_clause(),
+                    indices[id(node.get_left())][1], indices[id(node.get_right())][1]
+                ]
+            elif formula_type is Type.UNARY:
+                entry = [
+                    UNARY, QUANTIFIER_VALUES[node.get_quantifier()], node.get_negation(),
+                    node.get_quant_var(), indices[id(node.get_inside())][1]
+                ]
+            else:
+                entry = [
+                    FUNCTION, node.get_func_name(), node.get_negation(), node.get_assigned(),
+                    indices[id(node.get_inside())][1]
+                ]
+            indices[id(node)] = (node, len(nodes))
+            nodes.append(entry)
+        roots.append(indices[id(formula)][1])
+    return nodes, roots
+
+
+def build_formulas(nodes: List[list], roots: [int], var_counts: [Dict], quant_lists: [list]) -> [Formula]:
+    # the node table back into formulas, the metadata only goes on the roots
+    built = []
+    for entry in nodes:
+        formula_type = entry[0]
+        if formula_type == VARIABLE:
+            built.append(Variable(entry[1]))
+        elif formula_type == FUNCTION:
+            built.append(Function(entry[1], built[entry[4]], entry[2], entry[3]))
+        elif formula_type == BINARY:
+            built.append(Binary(built[entry[3]], built[entry[4]], CONNECTIVES[entry[1]], entry[2]))
+        else:
+            built.append(Unary(built[entry[4]], QUANTIFIERS[entry[1]], entry[2], entry[3]))
+
+    formulas = []
+    for r, root in enumerate(roots):
+        formula = built[root]
+        formula.set_var_count(dict(var_counts[r]))
+        formula.set_quant_list([(Quantifier(quantifier), var_name) for quantifier, var_name in quant_lists[r]])
+        formulas.append(formula)
+    return formulas
+
+
+def encode_formulas(formulas: [Formula]) -> dict:
+    """
+    Flat form of a list of formulas: one node table with child indices,
+    var_count and quant_list only for the formulas themselves.
+    """
+    nodes, roots = build_node_table(formulas)
+    return {
+        "version": CODEC_VERSION,
+        "nodes": nodes,
+        "roots": roots,
+        "var_counts": [formula.get_var_count() for formula in formulas],
+        "quant_lists": [
+            [[quantifier.value, var_name] for quantifier, var_name in formula.get_quant_list()]
+            for formula in formulas
+        ]
+    }
+
+
+def decode_formulas(data: dict) -> [Formula]:
+    if data.get("version") != CODEC_VERSION:
+        raise Exception("Unsupported formula encoding version " + str(data.get("version")))
+    return build_formulas(data["nodes"], data["roots"], data["var_counts"], data["quant_lists"])
+
+
+def encode_clauses(clauses: [[Formula]]) -> dict:
+    # the literals of all clauses as roots, with the length of every clause
+    data = encode_formulas([literal for clause in clauses for literal in clause])
+    data["clause_lengths"] = [len(clause) for clause in clauses]
+    return data
+
+
+def decode_clauses(data: dict) -> [[Formula]]:
+    literals = decode_formulas(data)
+    clauses = []
+    start = 0
+    for length in data["clause_lengths"]:
+        clauses.append(literals[start:start + length])
+        start += length
+    return clauses
+
+
+def to_flat_json(data: dict) -> str:
+    return json.dumps(data, separators=(",", ":"))
+
+
+def from_flat_json(text: str) -> dict:
+    return json.loads(text)
+
+
+def write_varints(output: bytearray, values: [int]):
+    # 7 bits per byte, lowest first, the high bit marks that more bytes follow
+    append = output.append
+    for value in values:
+        while value >= 0x80:
+            append((value & 0x7F) | 0x80)
+            value >>= 7
+        append(value)
+
+
+def read_varints(data: bytes, position: int, count=None) -> tuple:
+    # reads count varints, or all of them up to the end, returns them with the position after them
+    values = []
+    append = values.append
+    value = 0
+    shift = 0
+    end = len(data)
+    while position < end and (count is None or len(values) < count):
+        byte = data[position]
+        position += 1
+        if byte < 0x80:
+            append(value | (byte << shift))
+            value = 0
+            shift = 0
+        else:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+    return values, position
+
+
+def to_binary(data: dict) -> bytes:
+    """
+    Compact form of encode_formulas or encode_clauses: a string table with
+    every name once, then nothing but varints. Every node is a tag, with
+    the type in the low two bits and its enum value and flags above them,
+    followed by name indices and its children as the distance back from
+    the node.
+    """
+    strings = {}
+
+    def get_string(name: str) -> int:
+        return strings.setdefault(name, len(strings))
+
+    nodes = data["nodes"]
+    values = [len(nodes)]
+    for n, entry in enumerate(nodes):
+        formula_type = entry[0]
+        if formula_type == FUNCTION:
+            values += ((formula_type - 1) | (entry[2] << 2) | (entry[3] << 3), get_string(entry[1]), n - entry[4])
+        elif formula_type == VARIABLE:
+            values += (formula_type - 1, get_string(entry[1]))
+        elif formula_type == BINARY:
+            values += ((formula_type - 1) | (entry[1] << 2) | (entry[2] << 5), n - entry[3], n - entry[4])
+        else:
+            values += ((formula_type - 1) | (entry[1] << 2) | (entry[2] << 5), get_string(entry[3]), n - entry[4])
+
+    values.append(len(data["roots"]))
+    for r, root in enumerate(data["roots"]):
+        values.append(root)
+        var_count = data["var_counts"][r]
+        values.append(len(var_count))
+        for var_name, count in var_count.items():
+            values += (get_string(var_name), count)
+        quant_list = data["quant_lists"][r]
+        values.append(len(quant_list))
+        for quantifier, var_name in quant_list:
+            values += (quantifier, get_string(var_name))
+
+    # the number of clauses plus one, zero for a list of formulas
+    clause_lengths = data.get("clause_lengths")
+    if clause_lengths is None:
+        values.append(0)
+    else:
+        values.append(len(clause_lengths) + 1)
+        values += clause_lengths
+
+    output = bytearray(BINARY_MAGIC)
+    write_varints(output, [len(strings)])
+    for name in strings:
+        encoded = name.encode("utf-8")
+        write_varints(output, [len(encoded)])
+        output += encoded
+    write_varints(output, values)
+    return bytes(output)
+
+
+def from_binary(data: bytes) -> dict:
+    if data[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+        raise Exception("Not a binary formula encoding of version " + str(CODEC_VERSION))
+    (string_count,), position = read_varints(data, len(BINARY_MAGIC), 1)
+    strings = []
+    for _ in range(string_count):
+        (length,), position = read_varints(data, position, 1)
+        strings.append(data[position:position + length].decode("utf-8"))
+        position += length
+
+    values, _ = read_varints(data, position)
+    next_value = iter(values).__next__
+
+    nodes = []
+    for n in range(next_value()):
+        tag = next_value()
+        formula_type = (tag & 0x3) + 1
+        if formula_type == FUNCTION:
+            nodes.append([formula_type, strings[next_value()], bool(tag & 0x4), bool(tag & 0x8), n - next_value()])
+        elif formula_type == VARIABLE:
+            nodes.append([formula_type, strings[next_value()]])
+        elif formula_type == BINARY:
+            nodes.append([formula_type, (tag >> 2) & 0x7, bool(tag >> 5), n - next_value(), n - next_value()])
+        else:
+            nodes.append([formula_type, (tag >> 2) & 0x7, bool(tag >> 5), strings[next_value()], n - next_value()])
+
+    roots = []
+    var_counts = []
+    quant_lists = []
+    for _ in range(next_value()):
+        roots.append(next_value())
+        var_count = {}
+        for _ in range(next_value()):
+            var_name = strings[next_value()]
+            var_count[var_name] = next_value()
+        var_counts.append(var_count)
+        quant_list = []
+        for _ in range(next_value()):
+            quantifier = next_value()
+            quant_list.append([quantifier, strings[next_value()]])
+        quant_lists.append(quant_list)
+
+    decoded = {
+        "version": CODEC_VERSION,
+        "nodes": nodes,
+        "roots": roots,
+        "var_counts": var_counts,
+        "quant_lists": quant_lists
+    }
+    clause_count = next_value() - 1
+    if clause_count >= 0:
+        decoded["clause_lengths"] = [next_value() for _ in range(clause_count)]
+    return decoded
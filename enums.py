@@ -19,3 +19,9 @@ class Type(Enum):
     BINARY = 2
     FUNCTION = 3
     VARIABLE = 4
+
+
+class Symbol(Enum):
+    PREDICATE = 1
+    FUNCTION = 2
+    VARIABLE = 3
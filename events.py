@@ -0,0 +1,156 @@
+import time
+from typing import Dict, List
+
+from formula import Formula
+
+
+def print_literals(clause):
+    for literal in clause:
+        literal.print_formula()
+        print(" ", end="")
+    print("")
+
+
+class EventSink:
+    """
+    Receives the steps of preprocessing and resolution. This sink drops
+    everything, so nothing is rendered or printed, the other sinks override
+    the events they use.
+    """
+
+    def step(self, stage: str):
+        pass
+
+    def argument(self, preprocessor):
+        pass
+
+    def clauses(self, preprocessor):
+        pass
+
+    def simplified(self, removed: Dict[str, int]):
+        pass
+
+    def assignment(self, clause_id: int, assignment: Formula, to_assign: Formula):
+        pass
+
+    def resolution(self, clause_id: int, to_resolve: Formula, clause, resolvent_id: int, resolvent):
+        pass
+
+    def factoring(self, clause_id: int, factor_id: int, factor):
+        pass
+
+    def given(self, clause_id: int, clause):
+        pass
+
+    def resolved(self):
+        pass
+
+
+class NullSink(EventSink):
+    pass
+
+
+class PrintSink(EventSink):
+    # prints every step and the whole argument after it
+    def step(self, stage: str):
+        print(stage)
+
+    def argument(self, preprocessor):
+        preprocessor.print_argument()
+        print("")
+
+    def clauses(self, preprocessor):
+        preprocessor.print_clauses()
+        print("")
+
+    def simplified(self, removed: Dict[str, int]):
+        print("Removed " + ", ".join(str(count) + " " + rule for rule, count in removed.items()))
+        print("")
+
+    def assignment(self, clause_id: int, assignment: Formula, to_assign: Formula):
+        print("Assignment Step")
+        print("Assigned ", end="")
+        assignment.print_formula()
+        print(" to ", end="")
+        to_assign.print_formula()
+        print("")
+
+    def resolution(self, clause_id: int, to_resolve: Formula, clause, resolvent_id: int, resolvent):
+        print("Resolution Step")
+        print("Resolved ", end="")
+        to_resolve.print_formula()
+        print(" and ", end="")
+        print_literals(clause)
+        print("Resolvent ", end="")
+        print_literals(resolvent)
+
+    def factoring(self, clause_id: int, factor_id: int, factor):
+        print("Factoring Step")
+        print("Factor of Clause " + str(clause_id) + " ", end="")
+        print_literals(factor)
+
+    def given(self, clause_id: int, clause):
+        print("Given Clause " + str(clause_id))
+        print_literals(clause)
+
+    def resolved(self):
+        print("resolved")
+
+
+class RecordSink(EventSink):
+    """
+    Keeps a record of every event for tracing: the event, the stage it
+    happened in, a perf_counter timestamp and counts or clause ids instead
+    of the formulas themselves. Clause ids index the prover's clauses,
+    resolvent ids its set of support, or both the clauses kept by
+    ResolutionProver.saturate.
+    """
+
+    def __init__(self):
+        self._records: List[dict] = []
+        self._stage = ""
+
+    def get_records(self) -> List[dict]:
+        return self._records
+
+    def record(self, event: str, **fields):
+        record = {"event": event, "stage": self._stage, "timestamp": time.perf_counter()}
+        record.update(fields)
+        self._records.append(record)
+
+    def step(self, stage: str):
+        self._stage = stage
+        self.record("step")
+
+    def argument(self, preprocessor):
+        self.record("argument", formulas=len(preprocessor.get_arg()))
+
+    def clauses(self, preprocessor):
+        self.record(
+            "clauses",
+            premises=[len(premise) for premise in preprocessor.get_premises()],
+            negated_conclusion=len(preprocessor.get_negated_conclusion()[0])
+        )
+
+    def simplified(self, removed: Dict[str, int]):
+        self.record("simplified", removed=dict(removed))
+
+    def assignment(self, clause_id: int, assignment: Formula, to_assign: Formula):
+        self.record("assignment", clause=clause_id)
+
+    def resolution(self, clause_id: int, to_resolve: Formula, clause, resolvent_id: int, resolvent):
+        self.record(
+            "resolution",
+            clause=clause_id,
+            resolvent=resolvent_id,
+            resolvent_size=len(resolvent)
+        )
+
+    def factoring(self, clause_id: int, factor_id: int, factor):
+        self.record("factoring", clause=clause_id, factor=factor_id, factor_size=len(factor))
+
+    def given(self, clause_id: int, clause):
+        self.record("given", clause=clause_id, size=len(clause))
+
+    def resolved(self):
+        self.record("resolved")
@@ -1,23 +1,45 @@
 import json
+import weakref
 from abc import ABC, abstractmethod
 from typing import Dict, List, Tuple
 from enums import Connective, Type, Quantifier
+from traversal import fold, visit_children, walk
+
+CONNECTIVE_SYMBOLS = {
+    Connective.IMPLICATION: " ⇒ ",
+    Connective.BICONDITIONAL: " ⇔ ",
+    Connective.AND: " ∧ ",
+    Connective.OR: " ∨ "
+}
+
+# stored as the text of nodes that were rendered as part of a bigger formula
+# without keeping a string of their own, see Formula.to_string
+RENDERED_INSIDE = object()
+
+# subformulas rendering to at most this many characters keep their own text,
+# longer ones don't, so deep formulas don't keep a copy of their text on every level
+CACHED_TEXT_LENGTH = 80
 
 
 class Formula(ABC):
+    # var_count and quant_list only describe a whole formula, so they are
+    # only held by roots and left as None on every other node. The formula
+    # type is the same for every node of a class and is kept on the class
+    __slots__ = (
+        '_var_count', '_quant_list', '_frozen', '_text', '_parents', '__weakref__'
+    )
+    _formula_type: Type
+
     def __init__(
             self,
-            formula_type: Type,
             var_count=None,
             quant_list=None
     ):
-        if var_count is None:
-            var_count = {}
-        if quant_list is None:
-            quant_list = []
-        self._formula_type = formula_type
-        self._var_count = var_count
-        self._quant_list = quant_list
+        self._var_count = var_count or None
+        self._quant_list = quant_list or None
+        self._frozen = False
+        self._text = None
+        self._parents = None
 
     def print_json(self):
         print(self.to_json())
@@ -25,36 +47,170 @@ class Formula(ABC):
     def print_formula(self):
         print(self.to_string(), end="")
 
-    @abstractmethod
     def to_json(self) -> json:
-        pass
+        return fold(
+            self,
+            visit_children,
+            lambda node, _, parts: node.build_json(parts)
+        )
 
-    @abstractmethod
     def to_string(self) -> str:
+        """
+        Renders the formula into one list of tokens that is joined once, and
+        keeps the text until a setter changes this node or one below it.
+        Short subformulas keep their own text as well, and subformulas that
+        still hold their text are not rendered again.
+        """
+        if isinstance(self._text, str):
+            return self._text
+
+        tokens = []
+        length = 0
+        stack = [self]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                tokens.append(item)
+                length += len(item)
+            elif isinstance(item, tuple):
+                # every token of the node is in, keep its text if it is short
+                node, start, start_length = item
+                if length - start_length <= CACHED_TEXT_LENGTH:
+                    node._text = "".join(tokens[start:])
+                    tokens[start:] = [node._text]
+            elif isinstance(item._text, str):
+                tokens.append(item._text)
+                length += len(item._text)
+            else:
+                item._text = RENDERED_INSIDE
+                stack.append((item, len(tokens), length))
+                item_tokens = item.build_tokens()
+                for token in item_tokens:
+                    if not isinstance(token, str):
+                        token.add_parent(item)
+                stack.extend(reversed(item_tokens))
+
+        self._text = "".join(tokens)
+        return self._text
+
+    def copy(self) -> 'Formula':
+        return fold(
+            self,
+            visit_children,
+            lambda node, _, parts: node.build_copy(parts)
+        )
+
+    # the build methods make the result for a single node out of the
+    # results already built for its children
+
+    @abstractmethod
+    def build_json(self, parts: List[json]) -> json:
         pass
 
     @abstractmethod
-    def set_var(self, var: str):
+    def build_tokens(self) -> List:
+        # the strings and child formulas that make up the text of the node, in order
         pass
 
     @abstractmethod
-    def set_var_count(self, var_count: Dict):
+    def build_copy(self, parts: List['Formula']) -> 'Formula':
         pass
 
+    def set_var(self, var: str):
+        self.check_mutable()
+        for node in walk(self):
+            if node.get_formula_type() == Type.VARIABLE:
+                node.set_var(var)
+
+    def set_var_count(self, var_count: Dict):
+        self.check_mutable()
+        self._var_count = var_count
+
     def set_quant_list(self, quant_list: List[Tuple[Quantifier, str]]):
+        self.check_mutable()
         self._quant_list = quant_list
 
+    def freeze(self):
+        self._frozen = True
+
+    def add_parent(self, parent: 'Formula'):
+        """
+        Remembers a formula this node was rendered in, so changing the node
+        drops the text of the formula too. Parents are only added when they
+        are rendered and are held by weak references, so a parent that a
+        pass throws away is not kept alive by the children it shared.
+        """
+        # interned formulas never change, so they don't need to tell their parents
+        if self._frozen:
+            return
+        parents = self._parents
+        if parents.__class__ is weakref.ref and parents() is parent:
+            return
+        # weak references without a callback are made once per parent and shared
+        reference = weakref.ref(parent)
+        if parents is None:
+            self._parents = reference
+        elif isinstance(parents, list):
+            if all(kept is not reference for kept in parents):
+                parents[:] = [kept for kept in parents if kept() is not None]
+                parents.append(reference)
+        elif parents is not reference:
+            self._parents = [parents, reference] if parents() is not None else reference
+
+    def remove_parent(self, parent: 'Formula'):
+        reference = weakref.ref(parent)
+        if self._parents is reference:
+            self._parents = None
+        elif isinstance(self._parents, list):
+            self._parents = [kept for kept in self._parents if kept is not reference and kept() is not None]
+
+    def get_parents(self) -> List['Formula']:
+        # the parents that are still alive
+        if self._parents is None:
+            return []
+        if isinstance(self._parents, list):
+            parents = [reference() for reference in self._parents]
+            return [parent for parent in parents if parent is not None]
+        parent = self._parents()
+        return [] if parent is None else [parent]
+
+    def invalidate_string(self):
+        """
+        Drops the text kept by this node and by every formula it was rendered
+        in. Nodes that were never rendered have no text above them either, so
+        the walk up stops there.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node._text is not None:
+                node._text = None
+                stack.extend(node.get_parents())
+
+    def check_mutable(self):
+        if self._frozen:
+            raise Exception("Interned formulas are immutable, copy them first")
+
     def get_formula_type(self) -> Type:
         return self._formula_type
 
     def get_var_count(self) -> Dict:
+        if self._var_count is None:
+            return {}
         return self._var_count
 
     def get_quant_list(self) -> List[Tuple[Quantifier, str]]:
+        if self._quant_list is None:
+            return []
         return self._quant_list
 
+    def get_frozen(self) -> bool:
+        return self._frozen
+
 
 class Binary(Formula):
+    __slots__ = ('_left', '_connective', '_right', '_is_clause')
+    _formula_type = Type.BINARY
 
     def __init__(
             self,
@@ -66,7 +222,6 @@ class Binary(Formula):
             quant_list=None
     ):
         super().__init__(
-            Type.BINARY,
             var_count,
             quant_list
         )
@@ -75,30 +230,29 @@ class Binary(Formula):
         self._right = right
         self._is_clause = is_clause
 
-    def to_json(self) -> json:
+    def build_json(self, parts: List[json]) -> json:
         return {
             'formula_type': self._formula_type.value,
-            'left': self._left.to_json(),
-            'right': self._right.to_json(),
+            'left': parts[0],
+            'right': parts[1],
             'connective': self._connective.value,
             'is_clause': self._is_clause,
-            'var_count': self._var_count,
-            'quant_list': self._quant_list
+            'var_count': self.get_var_count(),
+            'quant_list': self.get_quant_list()
         }
 
-    def to_string(self) -> str:
-        result = "(" + self._left.to_string()
-        if self._connective == Connective.IMPLICATION:
-            result += " ⇒ "
-        if self._connective == Connective.BICONDITIONAL:
-            result += " ⇔ "
-        if self._connective == Connective.AND:
-            result += " ∧ "
-        if self._connective == Connective.OR:
-            result += " ∨ "
-        result += self._right.to_string()
-        result += ")"
-        return result
+    def build_tokens(self) -> List:
+        return ["(", self._left, CONNECTIVE_SYMBOLS[self._connective], self._right, ")"]
+
+    def build_copy(self, parts: List[Formula]) -> Formula:
+        return Binary(
+            parts[0],
+            parts[1],
+            self._connective,
+            self._is_clause,
+            self.get_var_count().copy(),
+            self.get_quant_list().copy()
+        )
 
     def get_left(self) -> Formula:
         return self._left
@@ -112,29 +266,34 @@ class Binary(Formula):
     def get_is_clause(self) -> bool:
         return self._is_clause
 
-    def set_var(self, var: str):
-        self._left.set_var(var)
-        self._right.set_var(var)
-
-    def set_var_count(self, var_count: Dict):
-        self._var_count = var_count
-        self._left.set_var_count(var_count)
-        self._right.set_var_count(var_count)
-
     def set_left(self, left: Formula):
-        self._left = left
+        self.check_mutable()
+        if left is not self._left:
+            self._left.remove_parent(self)
+            self._left = left
+            self.invalidate_string()
 
     def set_connective(self, connective: Connective):
+        self.check_mutable()
         self._connective = connective
+        self.invalidate_string()
 
     def set_right(self, right: Formula):
-        self._right = right
+        self.check_mutable()
+        if right is not self._right:
+            self._right.remove_parent(self)
+            self._right = right
+            self.invalidate_string()
 
     def set_is_clause(self, is_clause: bool):
+        self.check_mutable()
         self._is_clause = is_clause
 
 
 class Unary(Formula):
+    __slots__ = ('_inside', '_quantifier', '_negation', '_quant_var')
+    _formula_type = Type.UNARY
+
     def __init__(
             self,
             inside: Formula,
@@ -145,7 +304,6 @@ class Unary(Formula):
             quant_list=None
     ):
         super().__init__(
-            Type.UNARY,
             var_count,
             quant_list
         )
@@ -154,27 +312,37 @@ class Unary(Formula):
         self._negation = negation
         self._quant_var = quant_var
 
-    def to_json(self) -> json:
+    def build_json(self, parts: List[json]) -> json:
         return {
             'formula_type': self._formula_type.value,
-            'inside': self._inside.to_json(),
+            'inside': parts[0],
             'quantifier': self._quantifier.value,
             'negation': self._negation,
             'quant_var': self._quant_var,
-            'var_count': self._var_count,
-            'quant_list': self._quant_list
+            'var_count': self.get_var_count(),
+            'quant_list': self.get_quant_list()
         }
 
-    def to_string(self) -> str:
-        result = ""
+    def build_tokens(self) -> List:
+        tokens = []
         if self._negation:
-            result += "¬"
+            tokens.append("¬")
         if self._quantifier == Quantifier.EXISTENTIAL:
-            result += "∃" + self._quant_var
+            tokens.append("∃" + self._quant_var)
         if self._quantifier == Quantifier.UNIVERSAL:
-            result += "∀" + self._quant_var
-        result += self._inside.to_string()
-        return result
+            tokens.append("∀" + self._quant_var)
+        tokens.append(self._inside)
+        return tokens
+
+    def build_copy(self, parts: List[Formula]) -> Formula:
+        return Unary(
+            parts[0],
+            self._quantifier,
+            self._negation,
+            self._quant_var,
+            self.get_var_count().copy(),
+            self.get_quant_list().copy()
+        )
 
     def get_quantifier(self) -> Quantifier:
         return self._quantifier
@@ -188,27 +356,33 @@ class Unary(Formula):
     def get_negation(self):
         return self._negation
 
-    def set_var(self, var: str):
-        self._inside.set_var(var)
-
-    def set_var_count(self, var_count: Dict):
-        self._var_count = var_count
-        self._inside.set_var_count(var_count)
-
     def set_quantifier(self, quantifier: Quantifier):
+        self.check_mutable()
         self._quantifier = quantifier
+        self.invalidate_string()
 
     def set_inside(self, inside: Formula):
-        self._inside = inside
+        self.check_mutable()
+        if inside is not self._inside:
+            self._inside.remove_parent(self)
+            self._inside = inside
+            self.invalidate_string()
 
     def set_quant_var(self, quant_var: str):
+        self.check_mutable()
         self._quant_var = quant_var
+        self.invalidate_string()
 
     def set_negation(self, negation: bool):
+        self.check_mutable()
         self._negation = negation
+        self.invalidate_string()
 
 
 class Variable(Formula):
+    __slots__ = ('_var_name', '_symbol')
+    _formula_type = Type.VARIABLE
+
     def __init__(
             self,
             var_name,
@@ -216,34 +390,54 @@ class Variable(Formula):
             quant_list=None
     ):
         super().__init__(
-            Type.VARIABLE,
             var_count,
             quant_list
         )
         self._var_name = var_name
+        self._symbol = None
 
-    def to_json(self) -> json:
+    def build_json(self, parts: List[json]) -> json:
         return {
             'formula_type': self._formula_type.value,
             'var_name': self._var_name,
-            'var_count': self._var_count,
-            'quant_list': self._quant_list
+            'var_count': self.get_var_count(),
+            'quant_list': self.get_quant_list()
         }
 
-    def to_string(self) -> str:
-        return self._var_name
+    def build_tokens(self) -> List:
+        return [self._var_name]
+
+    def build_copy(self, parts: List[Formula]) -> Formula:
+        variable = Variable(
+            self._var_name,
+            self.get_var_count().copy(),
+            self.get_quant_list().copy()
+        )
+        variable._symbol = self._symbol
+        return variable
 
     def get_var_name(self) -> str:
         return self._var_name
 
+    def get_symbol(self) -> int:
+        return self._symbol
+
     def set_var(self, var_name):
+        self.check_mutable()
         self._var_name = var_name
+        # the id belonged to the old name
+        self._symbol = None
+        self.invalidate_string()
 
-    def set_var_count(self, var_count: Dict):
-        self._var_count = var_count
+    def set_symbol(self, symbol: int):
+        self.check_mutable()
+        self._symbol = symbol
 
 
 class Function(Formula):
+    __slots__ = ('_func_name', '_inside', '_negation', '_assigned', '_symbol')
+    _formula_type = Type.FUNCTION
+
     def __init__(
             self,
             func_name: str,
@@ -254,7 +448,6 @@ class Function(Formula):
             quant_list=None
     ):
         super().__init__(
-            Type.FUNCTION,
             var_count,
             quant_list
         )
@@ -262,27 +455,35 @@ class Function(Formula):
         self._inside = inside
         self._negation = negation
         self._assigned = assigned
+        self._symbol = None
 
-    def to_json(self) -> json:
+    def build_json(self, parts: List[json]) -> json:
         return {
             'formula_type': self._formula_type.value,
             'func_name': self._func_name,
-            'inside': self._inside.to_json(),
+            'inside': parts[0],
             'negation': self._negation,
             'assigned': self._assigned,
-            'var_count': self._var_count,
-            'quant_list': self._quant_list
+            'var_count': self.get_var_count(),
+            'quant_list': self.get_quant_list()
         }
 
-    def to_string(self) -> str:
-        result = ""
+    def build_tokens(self) -> List:
         if self._negation:
-            result += "¬"
-        result += self._func_name
-        result += "("
-        result += self._inside.to_string()
-        result += ")"
-        return result
+            return ["¬", self._func_name, "(", self._inside, ")"]
+        return [self._func_name, "(", self._inside, ")"]
+
+    def build_copy(self, parts: List[Formula]) -> Formula:
+        function = Function(
+            self._func_name,
+            parts[0],
+            self._negation,
+            self._assigned,
+            self.get_var_count().copy(),
+            self.get_quant_list().copy()
+        )
+        function._symbol = self._symbol
+        return function
 
     def get_func_name(self) -> str:
         return self._func_name
@@ -296,18 +497,25 @@ class Function(Formula):
     def get_assigned(self) -> bool:
         return self._assigned
 
-    def set_var_count(self, var_count: Dict):
-        self._var_count = var_count
-        self._inside.set_var_count(var_count)
-
-    def set_var(self, var):
-        self._inside.set_var(var)
+    def get_symbol(self) -> int:
+        return self._symbol
 
     def set_inside(self, inside: Formula):
-        self._inside = inside
+        self.check_mutable()
+        if inside is not self._inside:
+            self._inside.remove_parent(self)
+            self._inside = inside
+            self.invalidate_string()
 
     def set_negation(self, negation: bool):
+        self.check_mutable()
         self._negation = negation
+        self.invalidate_string()
 
     def set_assigned(self, assigned: bool):
+        self.check_mutable()
         self._assigned = assigned
+
+    def set_symbol(self, symbol: int):
+        self.check_mutable()
+        self._symbol = symbol
@@ -0,0 +1,129 @@
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from enums import Connective, Quantifier
+from formula import Unary, Binary, Variable, Function, Formula
+
+# connective, precedence and whether it groups to the right, lowest precedence first
+BINARY_OPERATORS = {
+    "<->": (Connective.BICONDITIONAL, 1, True),
+    "->": (Connective.IMPLICATION, 2, True),
+    "OR": (Connective.OR, 3, False),
+    "AND": (Connective.AND, 4, False)
+}
+
+QUANTIFIERS = {
+    "FORALL": Quantifier.UNIVERSAL,
+    "EXIST": Quantifier.EXISTENTIAL
+}
+
+# number of distinct inputs whose parse trees are kept
+PARSE_CACHE_SIZE = 1024
+
+
+def tokenize(text: str) -> List[str]:
+    return text.replace("(", " ( ").replace(")", " ) ").split()
+
+
+def parse_infix(text: str) -> Formula:
+    """
+    Parses a formula written in infix, like
+    FORALL x ( FORM F x -> NOT ( FORM G x ) )
+    NOT and the quantifiers bind tighter than the connectives, which are
+    AND, OR, -> and <-> from tightest to loosest. Trees are cached by the
+    raw text, every call gets its own copy since the passes modify them.
+    """
+    return parse_cached(text).copy()
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_cached(text: str) -> Formula:
+    return build_formula(tokenize(text))
+
+
+def apply_prefix(operands: List[Formula], operators: List[Tuple], var_count: Dict[str, int]):
+    # NOT and quantifiers apply to the operand that was just completed
+    while operators and operators[-1][0] in ("NOT", "FORALL", "EXIST"):
+        operator, var_name = operators.pop()
+        inside = operands.pop()
+        if operator == "NOT":
+            operands.append(Unary(inside, Quantifier.NONE, True, ""))
+        else:
+            if var_name not in var_count:
+                var_count[var_name] = 1
+            operands.append(Unary(inside, QUANTIFIERS[operator], False, var_name))
+
+
+def apply_binary(operands: List[Formula], operators: List[Tuple]):
+    operator, _ = operators.pop()
+    right = operands.pop()
+    left = operands.pop()
+    operands.append(Binary(left, right, BINARY_OPERATORS[operator][0]))
+
+
+def build_formula(tokens: List[str]) -> Formula:
+    """
+    Shunting-yard over the tokens, building the tree on the operand stack
+    instead of writing out postfix, so every token is handled once.
+    """
+    operands = []
+    operators = []
+    var_count = {}
+    expect_operand = True
+    t = 0
+    while t < len(tokens):
+        token = tokens[t]
+        if expect_operand:
+            if token == "FORM":
+                if t + 2 >= len(tokens):
+                    raise Exception("FORM needs a predicate and a variable")
+                var_name = tokens[t + 2]
+                var_count[var_name] = var_count.get(var_name, 0) + 1
+                operands.append(Function(tokens[t + 1], Variable(var_name)))
+                apply_prefix(operands, operators, var_count)
+                expect_operand = False
+                t += 3
+                continue
+            if token in QUANTIFIERS:
+                if t + 1 >= len(tokens):
+                    raise Exception(token + " needs a variable")
+                operators.append((token, tokens[t + 1]))
+                t += 2
+                continue
+            if token == "NOT" or token == "(":
+                operators.append((token, None))
+                t += 1
+                continue
+        else:
+            if token in BINARY_OPERATORS:
+                _, precedence, right_grouping = BINARY_OPERATORS[token]
+                while operators and operators[-1][0] in BINARY_OPERATORS:
+                    top_precedence = BINARY_OPERATORS[operators[-1][0]][1]
+                    if top_precedence < precedence or (top_precedence == precedence and right_grouping):
+                        break
+                    apply_binary(operands, operators)
+                operators.append((token, None))
+                expect_operand = True
+                t += 1
+                continue
+            if token == ")":
+                while operators and operators[-1][0] != "(":
+                    apply_binary(operands, operators)
+                if not operators:
+                    raise Exception("Unbalanced parentheses")
+                operators.pop()
+                apply_prefix(operands, operators, var_count)
+                t += 1
+                continue
+        raise Exception("Unexpected token " + token)
+
+    if expect_operand:
+        raise Exception("Incomplete formula")
+    while operators:
+        if operators[-1][0] == "(":
+            raise Exception("Unbalanced parentheses")
+        apply_binary(operands, operators)
+
+    formula = operands.pop()
+    formula.set_var_count(var_count)
+    return formula
@@ -0,0 +1,126 @@
+from typing import Dict, List, Tuple
+
+from enums import Connective, Quantifier, Type
+from formula import Unary, Binary, Variable, Function, Formula
+from traversal import fold, visit_children
+
+
+class FormulaTable:
+    """
+    Hash-consing factory for formulas. Every structurally distinct subterm is
+    stored once as a frozen node, so two interned formulas are equal exactly
+    when they are the same object and can be compared and hashed by identity.
+    """
+
+    def __init__(self):
+        self._nodes: Dict[Tuple, Formula] = {}
+        self._members: Dict[int, Formula] = {}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, formula: Formula) -> bool:
+        return id(formula) in self._members
+
+    def variable(self, var_name: str, symbol=None) -> Variable:
+        return self._lookup(
+            (Type.VARIABLE, var_name, symbol),
+            lambda: Variable(var_name),
+            symbol
+        )
+
+    def function(
+            self,
+            func_name: str,
+            inside: Formula,
+            negation=False,
+            assigned=True,
+            symbol=None
+    ) -> Function:
+        inside = self.intern(inside)
+        return self._lookup(
+            (Type.FUNCTION, func_name, negation, assigned, symbol, id(inside)),
+            lambda: Function(func_name, inside, negation, assigned),
+            symbol
+        )
+
+    def unary(
+            self,
+            inside: Formula,
+            quantifier: Quantifier,
+            negation: bool,
+            quant_var: str
+    ) -> Unary:
+        inside = self.intern(inside)
+        return self._lookup(
+            (Type.UNARY, quantifier, negation, quant_var, id(inside)),
+            lambda: Unary(inside, quantifier, negation, quant_var)
+        )
+
+    def binary(
+            self,
+            left: Formula,
+            right: Formula,
+            connective: Connective,
+            is_clause=False
+    ) -> Binary:
+        left = self.intern(left)
+        right = self.intern(right)
+        return self._lookup(
+            (Type.BINARY, connective, is_clause, id(left), id(right)),
+            lambda: Binary(left, right, connective, is_clause)
+        )
+
+    def intern(self, formula: Formula) -> Formula:
+        """
+        Returns the shared node that is structurally equal to the formula.
+        The tree is interned bottom up and the formula passed in is left
+        untouched. Root data (var_count, quant_list) is not carried over,
+        since interned nodes are shared between formulas, symbol ids are.
+        """
+        return fold(formula, self._descend, self._build)
+
+    def _descend(self, formula: Formula, state) -> List[Tuple]:
+        if id(formula) in self._members:
+            return []
+        return visit_children(formula, state)
+
+    def _build(self, formula: Formula, state, parts: List[Formula]) -> Formula:
+        if id(formula) in self._members:
+            return formula
+
+        formula_type = formula.get_formula_type()
+        if formula_type == Type.VARIABLE:
+            return self.variable(formula.get_var_name(), formula.get_symbol())
+        if formula_type == Type.FUNCTION:
+            return self.function(
+                formula.get_func_name(),
+                parts[0],
+                formula.get_negation(),
+                formula.get_assigned(),
+                formula.get_symbol()
+            )
+        if formula_type == Type.UNARY:
+            return self.unary(
+                parts[0],
+                formula.get_quantifier(),
+                formula.get_negation(),
+                formula.get_quant_var()
+            )
+        return self.binary(
+            parts[0],
+            parts[1],
+            formula.get_connective(),
+            formula.get_is_clause()
+        )
+
+    def _lookup(self, key: Tuple, create, symbol=None) -> Formula:
+        node = self._nodes.get(key)
+        if node is None:
+            node = create()
+            if symbol is not None:
+                node.set_symbol(symbol)
+            node.freeze()
+            self._nodes[key] = node
+            self._members[id(node)] = node
+        return node
@@ -0,0 +1,74 @@
+import fileinput
+from typing import Iterator, List, Tuple
+
+from enums import Connective, Quantifier
+from formula import Unary, Binary, Variable, Function, Formula
+from infix_parser import parse_infix
+from mvp.domain.services.transpiler import Transpiler
+
+transpiler = Transpiler(Unary, Binary, Function, Variable, Connective, Quantifier)
+
+# commands that hold a formula, every other command ends the problem being read
+INPUT_COMMANDS = ("input", "infix")
+
+
+def parse_input(command: str, tokens: List[str]) -> Formula:
+    if not tokens:
+        raise Exception("No input")
+    if command == "infix":
+        return parse_infix(" ".join(tokens))
+    return transpiler.transpile(tokens)
+
+
+def read_commands(source="-") -> Iterator[Tuple[str, List[str]]]:
+    """
+    Yields (command, tokens) for every non empty line of the file, or of
+    stdin when source is "-". Lines are read one at a time.
+    """
+    with fileinput.input(files=(source,)) as lines:
+        for line in lines:
+            tokens = line.split()
+            if tokens:
+                yield tokens[0], tokens[1:]
+
+
+class Problem:
+    """
+    The input lines of one argument, the last one is the conclusion.
+    Formulas are only parsed when they are asked for.
+    """
+
+    def __init__(self, inputs: [Tuple[str, List[str]]]):
+        self._inputs = inputs
+        self._arg = None
+
+    def get_inputs(self) -> [Tuple[str, List[str]]]:
+        return self._inputs
+
+    def get_arg(self) -> [Formula]:
+        if self._arg is None:
+            self._arg = [parse_input(command, tokens) for command, tokens in self._inputs]
+        return self._arg
+
+    def get_premises(self) -> [Formula]:
+        return self.get_arg()[:-1]
+
+    def get_conclusion(self) -> Formula:
+        return self.get_arg()[-1]
+
+
+def load_problems(source="-") -> Iterator[Problem]:
+    """
+    Streams the problems of a file (or stdin). A problem is a run of input
+    lines, ended by any other command or the end of the file, so only one
+    problem is held in memory at a time.
+    """
+    inputs = []
+    for command, tokens in read_commands(source):
+        if command in INPUT_COMMANDS:
+            inputs.append((command, tokens))
+        elif inputs:
+            yield Problem(inputs)
+            inputs = []
+    if inputs:
+        yield Problem(inputs)
@@ -1,10 +1,13 @@
-import fileinput
-from typing import List
+import json
+import sys
 
-from enums import Connective, Quantifier, Type
-from formula import Unary, Binary, Variable, Function, Formula
+from cache import Cache, FileCache, MemoryCache, SQLiteCache
+from events import EventSink, NullSink, PrintSink, RecordSink
+from formula import Formula
+from loader import load_problems, parse_input, read_commands
 from preprocessor import PreProcessor
 from prover import ResolutionProver
+from simplifier import ClauseSimplifier
 
 
 class Shared:
@@ -14,6 +17,9 @@ class Shared:
         self._premises = []
         self._negated_conclusion = []
         self._clauses = []
+        self._sink = PrintSink()
+        # clauses of the formulas preprocessed with the cached option
+        self._cache = MemoryCache()
 
     def print_arg(self):
         print("Printing ...")
@@ -37,6 +43,12 @@ class Shared:
     def set_clauses(self, clauses: [Formula]):
         self._clauses = clauses
 
+    def set_sink(self, sink: EventSink):
+        self._sink = sink
+
+    def set_cache(self, cache: Cache):
+        self._cache = cache
+
     def get_input_complete(self):
         return self._input_complete
 
@@ -52,189 +64,161 @@ class Shared:
     def get_clauses(self):
         return self._clauses
 
+    def get_sink(self) -> EventSink:
+        return self._sink
+
+    def get_cache(self) -> Cache:
+        return self._cache
+
+
+def resolve(prover: ResolutionProver, options: [str]):
+    prover.get_sink().step("Resolving ...")
+    if "given" in options:
+        prover.saturate()
+    else:
+        prover.apply_resolution()
 
-def input_formula(formula_input: [str]) -> Formula:
-    formula_holder = []
-    var_count = {}
-
-    for p, part in enumerate(formula_input):
-        if part == "->":
-            right = formula_holder.pop()
-            left = formula_holder.pop()
-
-            formula_holder.append(
-                Binary(left, right, Connective.IMPLICATION)
-            )
-        if part == "<->":
-            right = formula_holder.pop()
-            left = formula_holder.pop()
-
-            formula_holder.append(
-                Binary(left, right, Connective.BICONDITIONAL)
-            )
-        if part == "AND":
-            right = formula_holder.pop()
-            left = formula_holder.pop()
-
-            formula_holder.append(
-                Binary(left, right, Connective.AND)
-            )
-        if part == "OR":
-            right = formula_holder.pop()
-            left = formula_holder.pop()
-
-            formula_holder.append(
-                Binary(left, right, Connective.OR)
-            )
-        if part == "FORM":
-            func_name = formula_input[p + 1]
-            var_name = formula_input[p + 2]
-
-            if var_name not in var_count:
-                var_count[var_name] = 1
-            else:
-                var_count[var_name] += 1
-
-            formula_holder.append(
-                Function(func_name, Variable(var_name))
-            )
-        if part == "NOT":
-            inside = formula_holder.pop()
-
-            formula_holder.append(
-                Unary(inside, Quantifier.NONE, True, "")
-            )
-        if part == "FORALL":
-            inside = formula_holder.pop()
-            var_name = formula_input[p + 1]
-
-            if var_name not in var_count:
-                var_count[var_name] = 1
-
-            formula_holder.append(
-                Unary(inside, Quantifier.UNIVERSAL, False, var_name)
-            )
-        if part == "EXIST":
-            inside = formula_holder.pop()
-            var_name = formula_input[p + 1]
-
-            if var_name not in var_count:
-                var_count[var_name] = 1
-
-            formula_holder.append(
-                Unary(inside, Quantifier.EXISTENTIAL, False, var_name)
-            )
-        if part == "done":
-            break
-
-    formula = formula_holder.pop()
-    formula.set_var_count(var_count)
-    return formula
-
-
-def resolve(prover: ResolutionProver):
-    print("Resolving ...")
-    prover.apply_resolution()
-    pass
-
-
-def preprocess(preprocessor: PreProcessor) -> PreProcessor:
-    print("Preprocessing ...")
-    print("Executing Step 1. Negate conclusion")
+
+def preprocess(preprocessor: PreProcessor, options: [str]) -> PreProcessor:
+    sink = preprocessor.get_sink()
+    sink.step("Preprocessing ...")
+    sink.step("Executing Step 1. Negate conclusion")
     preprocessor.negate_conclusion()
-    print("Step 1 completed")
-    preprocessor.print_argument()
-    print("")
-
-    print("Executing Step 2. Turning arguments into ∃-free Prenex Normal Form")
-    preprocessor.normalize_to_prenex()
-    print("Step 2 completed")
-    preprocessor.print_argument()
-    print("")
-
-    print("Executing Step 3. Getting clauses from Prenex Normal Form")
-    clauses = preprocessor.convert_to_clauses()
-    print("Step 3 completed")
-    preprocessor.print_clauses()
-    print("")
+    sink.step("Step 1 completed")
+    sink.argument(preprocessor)
+
+    if "cached" in options:
+        sink.step("Executing Steps 2 and 3. Getting clauses from every formula, reusing cached ones")
+        clauses = preprocessor.preprocess_cached(
+            shared.get_cache(),
+            "fused" in options,
+            "scoped" in options,
+            "miniscoped" in options,
+            "definitional" in options
+        )
+        sink.step("Steps 2 and 3 completed, " + str(preprocessor.get_cache_hits()) + " formulas cached")
+        sink.clauses(preprocessor)
+        return finish_preprocessing(preprocessor, clauses)
+
+    if "parallel" in options:
+        sink.step("Executing Steps 2 and 3. Getting clauses from every formula in parallel")
+        clauses = preprocessor.preprocess_in_parallel(
+            "fused" in options,
+            "scoped" in options,
+            "miniscoped" in options,
+            "definitional" in options
+        )
+        sink.step("Steps 2 and 3 completed")
+        sink.clauses(preprocessor)
+        return finish_preprocessing(preprocessor, clauses)
+
+    sink.step("Executing Step 2. Turning arguments into ∃-free Prenex Normal Form")
+    preprocessor.normalize_to_prenex(
+        "fused" in options,
+        "scoped" in options,
+        "miniscoped" in options
+    )
+    sink.step("Step 2 completed")
+    sink.argument(preprocessor)
+
+    sink.step("Executing Step 3. Getting clauses from Prenex Normal Form")
+    clauses = preprocessor.convert_to_clauses("definitional" in options)
+    sink.step("Step 3 completed")
+    sink.clauses(preprocessor)
+    return finish_preprocessing(preprocessor, clauses)
+
+
+def finish_preprocessing(preprocessor: PreProcessor, clauses: [Formula]) -> PreProcessor:
+    # the clauses of the negated conclusion are the last ones, the prover starts from them
+    sink = preprocessor.get_sink()
+    negated_conclusion = preprocessor.get_negated_conclusion()[0]
+    sink.step("Executing Step 4. Simplifying clauses")
+    simplifier = ClauseSimplifier()
+    clauses = simplifier.simplify(clauses, len(negated_conclusion))
+    sink.simplified(simplifier.get_removed())
 
     shared.set_arg(preprocessor.get_arg())
     shared.set_premises(preprocessor.get_premises())
-    shared.set_negated_conclusion(preprocessor.get_negated_conclusion()[0])
+    shared.set_negated_conclusion(clauses[len(clauses) - len(negated_conclusion):])
     shared.set_clauses(clauses)
 
-    print("Preprocessing finished!")
+    preprocessor.get_sink().step("Preprocessing finished!")
 
     return preprocessor
 
 
 def process_commands(cmd: str, user_input: []):
-    if cmd == "input":
-        if len(user_input) > 0:
-            arg = shared.get_arg()
-            arg.append(
-                input_formula(input_list)
-            )
-            shared.set_arg(arg)
-        else:
-            raise Exception("No input")
+    if cmd == "input" or cmd == "infix":
+        arg = shared.get_arg()
+        arg.append(
+            parse_input(cmd, user_input)
+        )
+        shared.set_arg(arg)
     if cmd == "complete":
         shared.set_input_complete(True)
     if cmd == "print":
         shared.print_arg()
     if cmd == "preprocess":
         preprocess(
-            PreProcessor(shared.get_arg())
+            PreProcessor(shared.get_arg(), shared.get_sink()),
+            user_input
         )
     if cmd == "resolve":
         resolve(
             ResolutionProver(
                 shared.get_clauses(),
-                shared.get_negated_conclusion()[0]
-            )
+                shared.get_negated_conclusion(),
+                shared.get_sink()
+            ),
+            user_input
         )
 
 
-def execute_shunting_yard(tokens: List[str]):
-    postfix_queue = []
-    operator_stack = []
-
-    for t, token in enumerate(tokens):
-        if token == "FORM":
-            function = [token, tokens[t + 1], tokens[t + 2]]
-            postfix_queue.insert(0, function)
-        if token == "FORALL" or token == "EXIST":
-            quantifier = [token, tokens[t + 1]]
-            operator_stack.append(quantifier)
-        if token == "->" or token == "<->" or token == "AND" or token == "OR" or token == "NOT":
-            operator_stack.append(token)
-        if token == ")":
-            operator = operator_stack.pop()
-            postfix_queue.insert(0, operator)
-        print("stack", operator_stack)
-        print("queue", postfix_queue)
-
-    while operator_stack:
-        postfix_queue.insert(0, operator_stack.pop())
-    postfix_queue.reverse()
-
-    postfix_string = []
-    for item in postfix_queue:
-        if isinstance(item, list):
-            postfix_string.append(' '.join(item))
-        else:
-            postfix_string.append(item)
-    print(postfix_string)
-
-
 # x F(x) H(x) ¬ G(x) ∧ ⇒ ∀
 # FORM H x FORM F x NOT FORM G x AND -> FORALL x
 # FORM F x FORM H x FORM G x AND NOT -> FORALL x
+def run_commands(source: str):
+    for command, user_input in read_commands(source):
+        process_commands(command, user_input)
+
+
+def solve_problems(source: str, options: [str]):
+    # each problem is preprocessed and resolved on its own, only the cache is kept from the ones before
+    for problem in load_problems(source):
+        shared.set_arg(problem.get_arg())
+        process_commands("preprocess", options)
+        process_commands("resolve", [])
+
+
 shared = Shared()
-for line in fileinput.input(files='/Users/Kevin/Projects/proofster-prototype/test2.txt'):
-    input_list = line.split()
-    command = input_list.pop(0)
-    process_commands(command, input_list)
 
-infix = "( ( ( FORM A x AND FORM B x ) OR ( FORM C x AND FORM D x ) ) OR ( ( FORM E x AND FORM F x ) OR ( FORM G x AND FORM H x ) ) )".split()
-execute_shunting_yard(infix)
+if __name__ == "__main__":
+    # python main.py [--silent | --trace] [--cache path] [--problems] [file], stdin is read when no file is given
+    # --silent reports nothing, --trace prints one JSON record per event at the end
+    # --cache keeps the clauses of preprocessed formulas in an SQLite file (.db or .sqlite)
+    # or a directory across runs, --problems then preprocesses with the cache
+    args = sys.argv[1:]
+    if args and args[0] == "--silent":
+        shared.set_sink(NullSink())
+        args = args[1:]
+    elif args and args[0] == "--trace":
+        shared.set_sink(RecordSink())
+        args = args[1:]
+
+    problem_options = []
+    if len(args) > 1 and args[0] == "--cache":
+        if args[1].endswith((".db", ".sqlite")):
+            shared.set_cache(SQLiteCache(args[1]))
+        else:
+            shared.set_cache(FileCache(args[1]))
+        problem_options = ["cached"]
+        args = args[2:]
+
+    if args and args[0] == "--problems":
+        solve_problems(args[1] if len(args) > 1 else "-", problem_options)
+    else:
+        run_commands(args[0] if args else "-")
+
+    if isinstance(shared.get_sink(), RecordSink):
+        for record in shared.get_sink().get_records():
+            print(json.dumps(record))
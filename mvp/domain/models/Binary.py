@@ -1,9 +1,9 @@
 import json
-from typing import Dict
 from .Enums import Connective, Type
 from .Formula import Formula
 
 class Binary(Formula):
+    __slots__ = ('_left', '_connective', '_right', '_is_clause')
 
     def __init__(
             self,
@@ -30,8 +30,8 @@ class Binary(Formula):
             'right': self._right.to_json(),
             'connective': self._connective,
             'is_clause': self._is_clause,
-            'var_count': self._var_count,
-            'quant_list': self._quant_list
+            'var_count': self.get_var_count(),
+            'quant_list': self.get_quant_list()
         }
 
     def from_json(self, json_data) -> Formula:
@@ -81,11 +81,6 @@ class Binary(Formula):
         self._left.set_var(var)
         self._right.set_var(var)
 
-    def set_var_count(self, var_count: Dict):
-        self._var_count = var_count
-        self._left.set_var_count(var_count)
-        self._right.set_var_count(var_count)
-
     def set_left(self, left: Formula):
         self._left = left
 
@@ -5,19 +5,19 @@ from .Enums import Type, Quantifier
 
 
 class Formula(ABC):
+    # var_count and quant_list only describe a whole formula, so they are
+    # only held by roots and left as None on every other node
+    __slots__ = ('_formula_type', '_var_count', '_quant_list')
+
     def __init__(
             self,
             formula_type: Type,
             var_count=None,
             quant_list=None
     ):
-        if var_count is None:
-            var_count = {}
-        if quant_list is None:
-            quant_list = []
         self._formula_type = formula_type
-        self._var_count = var_count
-        self._quant_list = quant_list
+        self._var_count = var_count or None
+        self._quant_list = quant_list or None
 
     def print_json(self):
         print(self.to_json())
@@ -41,9 +41,8 @@ class Formula(ABC):
     def set_var(self, var: str):
         pass
 
-    @abstractmethod
     def set_var_count(self, var_count: Dict):
-        pass
+        self._var_count = var_count
 
     def set_quant_list(self, quant_list: List[Tuple[Quantifier, str]]):
         self._quant_list = quant_list
@@ -52,7 +51,11 @@ class Formula(ABC):
         return self._formula_type
 
     def get_var_count(self) -> Dict:
+        if self._var_count is None:
+            return {}
         return self._var_count
 
     def get_quant_list(self) -> List[Tuple[Quantifier, str]]:
+        if self._quant_list is None:
+            return []
         return self._quant_list
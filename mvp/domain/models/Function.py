@@ -1,10 +1,11 @@
 import json
-from typing import Dict
 from .Enums import Type
 from .Formula import Formula
 
 
 class Function(Formula):
+    __slots__ = ('_func_name', '_inside', '_negation', '_assigned')
+
     def __init__(
             self,
             func_name: str,
@@ -30,8 +31,8 @@ class Function(Formula):
             'inside': self._inside.to_json(),
             'negation': self._negation,
             'assigned': self._assigned,
-            'var_count': self._var_count,
-            'quant_list': self._quant_list
+            'var_count': self.get_var_count(),
+            'quant_list': self.get_quant_list()
         }
 
     def from_json(self, json_data) -> Formula:
@@ -73,10 +74,6 @@ class Function(Formula):
     def get_assigned(self) -> bool:
         return self._assigned
 
-    def set_var_count(self, var_count: Dict):
-        self._var_count = var_count
-        self._inside.set_var_count(var_count)
-
     def set_var(self, var):
         self._inside.set_var(var)
 
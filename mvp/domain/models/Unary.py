@@ -1,9 +1,10 @@
 import json
-from typing import Dict
 from .Formula import Formula
 from .Enums import Type, Quantifier
 
 class Unary(Formula):
+    __slots__ = ('_inside', '_quantifier', '_negation', '_quant_var')
+
     def __init__(
             self,
             inside: Formula,
@@ -29,8 +30,8 @@ class Unary(Formula):
             'quantifier': self._quantifier,
             'negation': self._negation,
             'quant_var': self._quant_var,
-            'var_count': self._var_count,
-            'quant_list': self._quant_list
+            'var_count': self.get_var_count(),
+            'quant_list': self.get_quant_list()
         }
 
     def from_json(self, json_data) -> Formula:
@@ -76,10 +77,6 @@ class Unary(Formula):
     def set_var(self, var: str):
         self._inside.set_var(var)
 
-    def set_var_count(self, var_count: Dict):
-        self._var_count = var_count
-        self._inside.set_var_count(var_count)
-
     def set_quantifier(self, quantifier: Quantifier):
         self._quantifier = quantifier
 
@@ -1,10 +1,11 @@
 import json
-from typing import Dict
 from .Enums import Type
 from .Formula import Formula
 
 
 class Variable(Formula):
+    __slots__ = ('_var_name',)
+
     def __init__(
             self,
             var_name,
@@ -21,8 +22,8 @@ class Variable(Formula):
     def to_json(self) -> json:
         return {
             'var_name': self._var_name,
-            'var_count': self._var_count,
-            'quant_list': self._quant_list
+            'var_count': self.get_var_count(),
+            'quant_list': self.get_quant_list()
         }
 
     def from_json(self, json_data) -> Formula:
@@ -44,6 +45,3 @@ class Variable(Formula):
 
     def set_var(self, var_name):
         self._var_name = var_name
-
-    def set_var_count(self, var_count: Dict):
-        self._var_count = var_count
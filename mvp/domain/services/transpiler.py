@@ -0,0 +1,85 @@
+from typing import Callable, Dict, List
+
+
+class Transpiler:
+    """
+    Turns postfix input like FORM F x FORM G x NOT -> FORALL x into a formula.
+    Every keyword is looked up once in a table of handlers, the names after
+    FORM, FORALL and EXIST are skipped over rather than checked as keywords.
+    The node classes and enums are passed in, so the prototype and the
+    models of the mvp domain build their own formulas with the same code.
+    """
+
+    def __init__(self, unary, binary, function, variable, connective, quantifier):
+        self._unary = unary
+        self._binary = binary
+        self._function = function
+        self._variable = variable
+        self._quantifier_none = quantifier.NONE
+        self._handlers: Dict[str, Callable] = {
+            "->": self.binary_handler(connective.IMPLICATION),
+            "<->": self.binary_handler(connective.BICONDITIONAL),
+            "AND": self.binary_handler(connective.AND),
+            "OR": self.binary_handler(connective.OR),
+            "FORM": self.push_function,
+            "NOT": self.push_negation,
+            "FORALL": self.quantifier_handler(quantifier.UNIVERSAL),
+            "EXIST": self.quantifier_handler(quantifier.EXISTENTIAL)
+        }
+
+    def transpile(self, formula_input: List[str]):
+        formula_holder = []
+        var_count = {}
+        handlers = self._handlers
+
+        p = 0
+        end = len(formula_input)
+        while p < end:
+            part = formula_input[p]
+            if part == "done":
+                break
+            handler = handlers.get(part)
+            # handlers return how many tokens they used, unknown tokens are skipped
+            p += handler(formula_input, p, formula_holder, var_count) if handler else 1
+
+        formula = formula_holder.pop()
+        formula.set_var_count(var_count)
+        return formula
+
+    def binary_handler(self, connective) -> Callable:
+        binary = self._binary
+
+        def push_binary(formula_input, p, formula_holder, var_count) -> int:
+            right = formula_holder.pop()
+            left = formula_holder.pop()
+            formula_holder.append(binary(left, right, connective))
+            return 1
+        return push_binary
+
+    def quantifier_handler(self, quantifier) -> Callable:
+        unary = self._unary
+
+        def push_quantifier(formula_input, p, formula_holder, var_count) -> int:
+            var_name = formula_input[p + 1]
+            if var_name not in var_count:
+                var_count[var_name] = 1
+            formula_holder.append(
+                unary(formula_holder.pop(), quantifier, False, var_name)
+            )
+            return 2
+        return push_quantifier
+
+    def push_function(self, formula_input, p, formula_holder, var_count) -> int:
+        func_name = formula_input[p + 1]
+        var_name = formula_input[p + 2]
+        var_count[var_name] = var_count.get(var_name, 0) + 1
+        formula_holder.append(
+            self._function(func_name, self._variable(var_name))
+        )
+        return 3
+
+    def push_negation(self, formula_input, p, formula_holder, var_count) -> int:
+        formula_holder.append(
+            self._unary(formula_holder.pop(), self._quantifier_none, True, "")
+        )
+        return 1
@@ -1,7 +1,19 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import List
 
 from enums import Connective, Type, Quantifier
+from cache import canonicalize, get_cache_key, get_canonical_names
+from codec import decode_formulas, encode_formulas, from_binary, to_binary
+from events import EventSink, NullSink, PrintSink
 from formula import Unary, Binary, Variable, Function, Formula
+from terms import (
+    SKOLEM_CONSTANT, SKOLEM_FUNCTION, build_term, get_skolem_base, get_skolem_name, get_term_chain, get_term_names,
+    is_skolem_constant
+)
+from traversal import fold, keep_node, visit_children, visit_connectives, visit_conjuncts, walk, walk_conjuncts
+# prefix of the predicates introduced by definitional CNF
+DEFINITION_PREFIX = "D"
 
 
 def print_clause(clause_group: [[Formula]]):
@@ -15,27 +27,33 @@ def print_clause(clause_group: [[Formula]]):
     print("")
 
 
-def create_formula_from_json(json_data) -> Formula:
+def get_json_children(json_data, state) -> List[tuple]:
+    formula_type = Type(json_data['formula_type'])
+    if formula_type == Type.BINARY:
+        return [(json_data['left'], state), (json_data['right'], state)]
+    if formula_type == Type.VARIABLE:
+        return []
+    return [(json_data['inside'], state)]
+
+
+def create_formula_node(json_data, state, parts: [Formula]) -> Formula:
     formula_type = json_data['formula_type']
 
     if Type(formula_type) == Type.BINARY:
-        left = create_formula_from_json(json_data['left'])
-        right = create_formula_from_json(json_data['right'])
         connective = Connective(json_data['connective'])
         is_clause = json_data['is_clause']
         var_count = json_data['var_count']
         quant_list = json_data['quant_list']
 
         return Binary(
-            left,
-            right,
+            parts[0],
+            parts[1],
             connective,
             is_clause,
             var_count,
             quant_list
         )
     if Type(formula_type) == Type.UNARY:
-        inside = create_formula_from_json(json_data['inside'])
         quantifier = Quantifier(json_data['quantifier'])
         negation = json_data['negation']
         quant_var = json_data['quant_var']
@@ -43,7 +61,7 @@ def create_formula_from_json(json_data) -> Formula:
         quant_list = json_data['quant_list']
 
         return Unary(
-            inside,
+            parts[0],
             quantifier,
             negation,
             quant_var,
@@ -62,7 +80,6 @@ def create_formula_from_json(json_data) -> Formula:
         )
     if Type(formula_type) == Type.FUNCTION:
         func_name = json_data['func_name']
-        inside = create_formula_from_json(json_data['inside'])
         negation = json_data['negation']
         assigned = json_data['assigned']
         var_count = json_data['var_count']
@@ -70,7 +87,7 @@ def create_formula_from_json(json_data) -> Formula:
 
         return Function(
             func_name,
-            inside,
+            parts[0],
             negation,
             assigned,
             var_count,
@@ -78,12 +95,65 @@ def create_formula_from_json(json_data) -> Formula:
         )
 
 
+def create_formula_from_json(json_data) -> Formula:
+    return fold(json_data, get_json_children, create_formula_node)
+
+
+def visit_operands(formula: Formula, state) -> [tuple]:
+    # enters binary formulas only, the rest of the formula are the operands
+    if formula.get_formula_type() == Type.BINARY:
+        return visit_children(formula, state)
+    return []
+
+
+def is_conjunction(formula: Formula) -> bool:
+    return (formula.get_formula_type() == Type.BINARY
+            and formula.get_connective() == Connective.AND)
+
+
+def count_conjuncts(formula: Formula) -> int:
+    return sum(1 for _ in walk_conjuncts(formula))
+
+
+def get_predicate_names(formula: Formula) -> set:
+    return {
+        node.get_func_name() for node in walk(formula, visit_connectives)
+        if node.get_formula_type() == Type.FUNCTION
+    }
+
+
+def get_variable_names_of(var_names) -> frozenset:
+    # the names that aren't Skolem constants, at most two are kept, enough to tell whether there's more than one
+    names = [var_name for var_name in var_names if not is_skolem_constant(var_name)]
+    return frozenset(names[:2]) if len(names) > 2 else frozenset(names)
+
+
+def map_conjuncts(formula: Formula, convert) -> Formula:
+    # rebuilds the conjunctions of a CNF formula with every conjunct replaced by convert(conjunct)
+    return fold(
+        formula,
+        visit_conjuncts,
+        lambda node, _, parts: Binary(parts[0], parts[1], Connective.AND)
+        if parts else convert(node)
+    )
+
+
 class PreProcessor:
-    def __init__(self, arg: [Formula]):
+    def __init__(self, arg: [Formula], sink: EventSink = None):
         self._arg = arg
+        # where the steps are reported, printed unless another sink is given
+        self._sink = sink if sink is not None else PrintSink()
         self._premises = []
         self._negated_conclusion = []
         self._subscript = 0
+        # predicate names in use, so definitions get fresh ones
+        self._predicate_names = set()
+        self._definition_count = 0
+        self._definition_names = []
+        # every existential gets its own Skolem symbol, numbered across the argument
+        self._skolem_count = 0
+        self._skolem_names = []
+        self._cache_hits = 0
 
     def get_arg(self):
         return self._arg
@@ -94,18 +164,33 @@ class PreProcessor:
     def get_negated_conclusion(self):
         return self._negated_conclusion
 
+    def get_sink(self) -> EventSink:
+        return self._sink
+
+    def get_cache_hits(self) -> int:
+        return self._cache_hits
+
+    def get_definition_names(self) -> List[str]:
+        return self._definition_names
+
+    def get_skolem_names(self) -> List[str]:
+        return self._skolem_names
+
+    def set_subscript(self, subscript: int):
+        self._subscript = subscript
+
     def to_string(self) -> List[str]:
         result = []
         for formula in self._arg:
-            formula_string = ""
+            tokens = []
             quant_list = formula.get_quant_list()
             for quant, var in quant_list:
                 if quant == Quantifier.EXISTENTIAL:
-                    formula_string += "∃" + var
+                    tokens.append("∃" + var)
                 if quant == Quantifier.UNIVERSAL:
-                    formula_string += "∀" + var
-            formula_string += formula.to_string()
-            result.append(formula_string)
+                    tokens.append("∀" + var)
+            tokens.append(formula.to_string())
+            result.append("".join(tokens))
         return result
 
     def print_argument(self):
@@ -127,97 +212,135 @@ class PreProcessor:
         self._arg.append(unary)
 
     def remove_arrows(self, formula: Formula) -> Formula:
+        """
+        Rebuilds the formula without arrows. A biconditional is expanded by
+        the polarity of its occurrence into the form that is already in CNF
+        once negations are moved inward: (¬A ∨ B) ∧ (A ∨ ¬B) when positive,
+        (A ∧ B) ∨ (¬A ∧ ¬B) when negative. Its sides are rebuilt for each
+        place they appear, so no subtree is shared.
+        """
+        removed = fold(formula, self.pass_polarity, self.remove_arrow, True)
+        removed.set_var_count(formula.get_var_count())
+        removed.set_quant_list(formula.get_quant_list())
+        return removed
+
+    def pass_polarity(self, formula: Formula, positive: bool) -> [tuple]:
         formula_type = formula.get_formula_type()
         if formula_type == Type.BINARY:
-            new_left = self.remove_arrows(formula.get_left())
-            new_right = self.remove_arrows(formula.get_right())
+            left = formula.get_left()
+            right = formula.get_right()
+            connective = formula.get_connective()
+            if connective == Connective.IMPLICATION:
+                return [(left, not positive), (right, positive)]
+            if connective == Connective.BICONDITIONAL:
+                if positive:
+                    # (¬A ∨ B) ∧ (A ∨ ¬B)
+                    return [(left, False), (right, True), (left, True), (right, False)]
+                # (A ∧ B) ∨ (¬A ∧ ¬B)
+                return [(left, False), (right, False), (left, True), (right, True)]
+            return [(left, positive), (right, positive)]
+        if formula_type == Type.UNARY:
+            return [(formula.get_inside(), positive != formula.get_negation())]
+        return []
 
-            if formula.get_connective() == Connective.IMPLICATION:
-                formula.set_left(
-                    Unary(new_left, Quantifier.NONE, True, "")
+    def remove_arrow(self, formula: Formula, positive: bool, parts: [Formula]) -> Formula:
+        formula_type = formula.get_formula_type()
+        if formula_type == Type.BINARY:
+            connective = formula.get_connective()
+            if connective == Connective.IMPLICATION:
+                return Binary(
+                    Unary(parts[0], Quantifier.NONE, True, ""),
+                    parts[1],
+                    Connective.OR
                 )
-                formula.set_right(new_right)
-                formula.set_connective(Connective.OR)
-
-            if formula.get_connective() == Connective.BICONDITIONAL:
-                formula.set_left(
-                    Binary(
-                        new_left,
-                        new_right,
+            if connective == Connective.BICONDITIONAL:
+                if positive:
+                    return Binary(
+                        Binary(Unary(parts[0], Quantifier.NONE, True, ""), parts[1], Connective.OR),
+                        Binary(parts[2], Unary(parts[3], Quantifier.NONE, True, ""), Connective.OR),
                         Connective.AND
                     )
-                )
-                formula.set_right(
+                return Binary(
+                    Binary(parts[0], parts[1], Connective.AND),
                     Binary(
-                        Unary(new_left, Quantifier.NONE, True, ""),
-                        Unary(new_right, Quantifier.NONE, True, ""),
+                        Unary(parts[2], Quantifier.NONE, True, ""),
+                        Unary(parts[3], Quantifier.NONE, True, ""),
                         Connective.AND
-                    )
+                    ),
+                    Connective.OR
                 )
-                formula.set_connective(Connective.OR)
-
+            return Binary(parts[0], parts[1], connective, formula.get_is_clause())
         if formula_type == Type.UNARY:
-            formula.set_inside(
-                self.remove_arrows(formula.get_inside())
+            return Unary(
+                parts[0],
+                formula.get_quantifier(),
+                formula.get_negation(),
+                formula.get_quant_var()
             )
-        return formula
+        return formula.copy()
 
     def move_negation_inward(self, formula: Formula, negation_outside: bool) -> Formula:
+        return fold(
+            formula,
+            self.pass_negation,
+            self.apply_negation,
+            negation_outside
+        )
+
+    def pass_negation(self, formula: Formula, negation_outside: bool) -> [tuple]:
         formula_type = formula.get_formula_type()
         if formula_type == Type.BINARY:
             # recursively moving negation inwards for all parts of the formula
-            formula.set_left(
-                self.move_negation_inward(
-                    formula.get_left(),
-                    negation_outside
-                )
-            )
-            formula.set_right(
-                self.move_negation_inward(
-                    formula.get_right(),
-                    negation_outside
-                )
-            )
-            # Perform procedure for De Morgan's Law
-            if negation_outside and formula.get_connective() == Connective.AND:
-                formula.set_connective(Connective.OR)
-            elif negation_outside and formula.get_connective() == Connective.OR:
-                formula.set_connective(Connective.AND)
-
+            return [
+                (formula.get_left(), negation_outside),
+                (formula.get_right(), negation_outside)
+            ]
         if formula_type == Type.UNARY:
             if negation_outside and formula.get_negation():
                 # if previous negation cancels out, we don't reverse quantifiers no negation passed
-                formula.set_inside(
-                    self.move_negation_inward(formula.get_inside(), False)
-                )
+                return [(formula.get_inside(), False)]
             elif negation_outside or formula.get_negation():
                 # if previous negates results in a negation, we need to reverse quantifiers and pass the negation
                 if formula.get_quantifier() == Quantifier.UNIVERSAL:
                     formula.set_quantifier(Quantifier.EXISTENTIAL)
                 elif formula.get_quantifier() == Quantifier.EXISTENTIAL:
                     formula.set_quantifier(Quantifier.UNIVERSAL)
-
-                formula.set_inside(
-                    self.move_negation_inward(formula.get_inside(), True)
-                )
+                return [(formula.get_inside(), True)]
             else:
                 # if no negation, we don't reverse quantifiers no negation passed
-                formula.set_inside(
-                    self.move_negation_inward(formula.get_inside(), False)
-                )
+                return [(formula.get_inside(), False)]
+        return []
+
+    def apply_negation(self, formula: Formula, negation_outside: bool, parts: [Formula]) -> Formula:
+        formula_type = formula.get_formula_type()
+        if formula_type == Type.BINARY:
+            formula.set_left(parts[0])
+            formula.set_right(parts[1])
+            # Perform procedure for De Morgan's Law
+            if negation_outside and formula.get_connective() == Connective.AND:
+                formula.set_connective(Connective.OR)
+            elif negation_outside and formula.get_connective() == Connective.OR:
+                formula.set_connective(Connective.AND)
 
-        if (negation_outside
-                and formula_type != Type.BINARY
-                and formula_type != Type.UNARY):
-            # if formula is function, and there's a negation, wraps it in a unary with negation
-            formula = Unary(formula, Quantifier.NONE, True, "")
         if formula_type == Type.UNARY:
+            formula.set_inside(parts[0])
             # if formula is unary, then we are returning to previous, don't add negation
             formula.set_negation(False)
+        elif negation_outside and formula_type != Type.BINARY:
+            # if formula is function, and there's a negation, wraps it in a unary with negation
+            formula = Unary(formula, Quantifier.NONE, True, "")
 
         return formula
 
     def standardize_variables(self, formula: Formula, var_name: str) -> Formula:
+        return fold(
+            formula,
+            self.standardize_variable,
+            keep_node,
+            var_name
+        )
+
+    def standardize_variable(self, formula: Formula, var_name: str) -> [tuple]:
         formula_type = formula.get_formula_type()
         if formula_type == Type.UNARY:
             if (formula.get_quant_var() == var_name
@@ -226,96 +349,363 @@ class PreProcessor:
                 formula.set_quant_var(
                     var_name + str(self._subscript)
                 )
-            formula.set_inside(
-                self.standardize_variables(formula.get_inside(), var_name)
-            )
+            return [(formula.get_inside(), var_name)]
         elif formula_type == Type.BINARY:
-            formula.set_left(
-                self.standardize_variables(
-                    formula.get_left(),
-                    var_name
-                )
-            )
-            formula.set_right(
-                self.standardize_variables(
-                    formula.get_right(),
-                    var_name
-                )
-            )
+            return [
+                (formula.get_left(), var_name),
+                (formula.get_right(), var_name)
+            ]
         elif formula_type == Type.FUNCTION:
             if formula.get_inside().get_var_name() == var_name and self._subscript != 0:
                 formula.set_var(var_name + str(self._subscript))
         else:
             if formula.get_var_name() == var_name:
                 formula.set_var(var_name + str(self._subscript))
+        return []
+
+    def standardize_all_variables(self, formula: Formula) -> Formula:
+        """
+        Renames every bound variable in one traversal instead of one per
+        variable. The new names in scope are kept on a stack per variable,
+        pushed when a quantifier is entered and popped when it is left.
+        """
+        scopes = {}
+        subscripts = {}
+        originals = {}
+        fold(
+            formula,
+            lambda node, _: self.enter_scope(node, scopes, subscripts, originals),
+            lambda node, _, parts: self.leave_scope(node, scopes, originals)
+        )
         return formula
 
-    def move_quantifiers_to_front(self, formula: Formula, quant_list: List[tuple]) -> List[tuple]:
+    def enter_scope(self, formula: Formula, scopes: dict, subscripts: dict, originals: dict) -> [tuple]:
         formula_type = formula.get_formula_type()
+        if formula_type == Type.UNARY:
+            var_name = formula.get_quant_var()
+            if formula.get_quantifier() != Quantifier.NONE:
+                subscripts[var_name] = subscripts.get(var_name, 0) + 1
+                new_name = var_name + str(subscripts[var_name])
+                scopes.setdefault(var_name, []).append(new_name)
+                originals[new_name] = var_name
+                formula.set_quant_var(new_name)
+            return [(formula.get_inside(), None)]
         if formula_type == Type.BINARY:
-            quant_list = self.move_quantifiers_to_front(
-                formula.get_left(),
-                quant_list
-            )
-            quant_list = self.move_quantifiers_to_front(
-                formula.get_right(),
-                quant_list
+            return visit_children(formula, None)
+
+        variable = formula.get_inside() if formula_type == Type.FUNCTION else formula
+        if variable.get_formula_type() == Type.VARIABLE and scopes.get(variable.get_var_name()):
+            variable.set_var(scopes[variable.get_var_name()][-1])
+        return []
+
+    def leave_scope(self, formula: Formula, scopes: dict, originals: dict) -> Formula:
+        if (formula.get_formula_type() == Type.UNARY
+                and formula.get_quantifier() != Quantifier.NONE):
+            scopes[originals[formula.get_quant_var()]].pop()
+        return formula
+
+    def miniscope(self, formula: Formula, free: dict) -> Formula:
+        """
+        Pushes every quantifier down as far as it goes, bottom up, so it
+        only covers the part of the formula that uses its variable. Qx is
+        moved past the side of ∧ or ∨ without x, ∀ is split over ∧ and ∃
+        over ∨, and quantifiers over unused variables are dropped. free is
+        filled with the free variables of every node of the result, by id.
+        """
+        miniscoped = fold(
+            formula,
+            visit_children,
+            lambda node, _, parts: self.miniscope_node(node, parts, free)
+        )
+        miniscoped.set_var_count(formula.get_var_count())
+        return miniscoped
+
+    def miniscope_node(self, formula: Formula, parts: [Formula], free: dict) -> Formula:
+        formula_type = formula.get_formula_type()
+        if formula_type == Type.VARIABLE:
+            var_name = formula.get_var_name()
+            return self.record_free(formula, set() if is_skolem_constant(var_name) else {var_name}, free)
+        if formula_type == Type.FUNCTION:
+            return self.record_free(formula, free[id(parts[0])][1], free)
+        if formula_type == Type.BINARY:
+            return self.record_free(
+                Binary(parts[0], parts[1], formula.get_connective()),
+                free[id(parts[0])][1] | free[id(parts[1])][1],
+                free
             )
-        elif formula_type == Type.UNARY:
-            if formula.get_quantifier() != Quantifier.NONE:
-                quant_list.append(
-                    (formula.get_quantifier(), formula.get_quant_var())
-                )
-                formula.set_quantifier(Quantifier.NONE)
-            quant_list = self.move_quantifiers_to_front(
-                formula.get_inside(),
-                quant_list
+
+        inside = parts[0]
+        quantifier = formula.get_quantifier()
+        if quantifier == Quantifier.NONE:
+            return self.record_free(
+                Unary(inside, quantifier, formula.get_negation(), ""),
+                free[id(inside)][1],
+                free
             )
-        return quant_list
+        var_name = formula.get_quant_var()
+        if var_name not in free[id(inside)][1]:
+            return inside
+        return fold(
+            inside,
+            lambda node, moved: self.pass_quantifier(node, quantifier, var_name, free) if moved else [],
+            lambda node, moved, results: self.place_quantifier(node, moved, results, quantifier, var_name, free),
+            True
+        )
 
-    def skolemize(self, formula: Formula, data: tuple[str, str]) -> Formula:
+    def record_free(self, formula: Formula, var_names, free: dict) -> Formula:
+        # the node is kept with its entry, so its id can't be reused by another node
+        free[id(formula)] = (formula, frozenset(var_names))
+        return formula
+
+    def pass_quantifier(self, formula: Formula, quantifier: Quantifier, var_name: str, free: dict) -> [tuple]:
+        # only the subformulas using the variable take the quantifier
         formula_type = formula.get_formula_type()
         if formula_type == Type.BINARY:
-            formula.set_left(
-                self.skolemize(formula.get_left(), data)
-            )
-            formula.set_right(
-                self.skolemize(formula.get_right(), data)
+            left = formula.get_left()
+            right = formula.get_right()
+            in_left = var_name in free[id(left)][1]
+            in_right = var_name in free[id(right)][1]
+            connective = formula.get_connective()
+            splits = ((quantifier == Quantifier.UNIVERSAL and connective == Connective.AND)
+                      or (quantifier == Quantifier.EXISTENTIAL and connective == Connective.OR))
+            if (in_left and in_right) and not splits:
+                return []
+            return [(left, in_left), (right, in_right)]
+        if (formula_type == Type.UNARY
+                and formula.get_quantifier() == Quantifier.NONE
+                and not formula.get_negation()):
+            return [(formula.get_inside(), True)]
+        return []
+
+    def place_quantifier(
+            self,
+            formula: Formula,
+            moved: bool,
+            results: [Formula],
+            quantifier: Quantifier,
+            var_name: str,
+            free: dict
+    ) -> Formula:
+        if not moved:
+            return formula
+        if not results:
+            return self.record_free(
+                Unary(formula, quantifier, False, var_name),
+                free[id(formula)][1] - {var_name},
+                free
             )
-        elif formula_type == Type.UNARY:
-            formula.set_inside(
-                self.skolemize(formula.get_inside(), data)
+        if formula.get_formula_type() == Type.UNARY:
+            return self.record_free(
+                Unary(results[0], Quantifier.NONE, False, ""),
+                free[id(results[0])][1],
+                free
             )
-        elif formula_type == Type.FUNCTION:
+        return self.record_free(
+            Binary(results[0], results[1], formula.get_connective()),
+            free[id(results[0])][1] | free[id(results[1])][1],
+            free
+        )
+
+    def skolemize_in_scope(self, formula: Formula, free: dict) -> Formula:
+        """
+        Replaces every existential variable by a Skolem term over the
+        universals around it that its subformula uses, a constant when there
+        are none. Terms take one argument, so with several the innermost
+        universal is used, like skolemize_argument does.
+        """
+        skolemized = fold(
+            formula,
+            lambda node, scope: self.pass_skolem_scope(node, scope, free),
+            self.replace_existential,
+            ((), {})
+        )
+        skolemized.set_var_count(formula.get_var_count())
+        return skolemized
+
+    def pass_skolem_scope(self, formula: Formula, scope: tuple, free: dict) -> [tuple]:
+        universals, terms = scope
+        if (formula.get_formula_type() == Type.UNARY
+                and formula.get_quantifier() != Quantifier.NONE):
+            var_name = formula.get_quant_var()
+            if formula.get_quantifier() == Quantifier.UNIVERSAL:
+                return [(formula.get_inside(), (universals + (var_name,), terms))]
+            used = [universal for universal in universals if universal in free[id(formula)][1]]
+            term = self.new_skolem_term(used[-1] if used else "")
+            return [(formula.get_inside(), (universals, {**terms, var_name: term}))]
+        if formula.get_formula_type() == Type.FUNCTION:
+            return []
+        return visit_children(formula, scope)
+
+    def replace_existential(self, formula: Formula, scope: tuple, parts: [Formula]) -> Formula:
+        universals, terms = scope
+        formula_type = formula.get_formula_type()
+        if formula_type == Type.FUNCTION:
             inside = formula.get_inside()
-            if inside.get_formula_type() != Type.VARIABLE:
-                formula.set_inside(
-                    self.skolemize(formula.get_inside(), data)
+            if inside.get_formula_type() == Type.VARIABLE and inside.get_var_name() in terms:
+                formula.set_inside(terms[inside.get_var_name()].copy())
+            return formula
+        if formula_type == Type.UNARY:
+            if formula.get_quantifier() == Quantifier.EXISTENTIAL:
+                return parts[0]
+            formula.set_inside(parts[0])
+        elif formula_type == Type.BINARY:
+            formula.set_left(parts[0])
+            formula.set_right(parts[1])
+        return formula
+
+    def move_quantifiers_to_front(self, formula: Formula, quant_list: List[tuple]) -> List[tuple]:
+        for node in walk(formula):
+            if (node.get_formula_type() == Type.UNARY
+                    and node.get_quantifier() != Quantifier.NONE):
+                quant_list.append(
+                    (node.get_quantifier(), node.get_quant_var())
                 )
+                node.set_quantifier(Quantifier.NONE)
+        return quant_list
+
+    def new_skolem_name(self, base: str) -> str:
+        self._skolem_count += 1
+        name = get_skolem_name(base, self._skolem_count)
+        self._skolem_names.append(name)
+        return name
+
+    def new_skolem_term(self, prev_var: str) -> Formula:
+        # a fresh constant if there's no universal outside, a fresh function of it otherwise
+        if prev_var == "":
+            return Variable(self.new_skolem_name(SKOLEM_CONSTANT))
+        return Function(self.new_skolem_name(SKOLEM_FUNCTION), Variable(prev_var))
+
+    def skolemize(self, formula: Formula, data: tuple[str, Formula]) -> Formula:
+        return fold(formula, self.skolemize_function, keep_node, data)
+
+    def skolemize_function(self, formula: Formula, data: tuple[str, Formula]) -> [tuple]:
+        formula_type = formula.get_formula_type()
+        if formula_type == Type.FUNCTION:
+            inside = formula.get_inside()
+            if inside.get_formula_type() != Type.VARIABLE:
+                return [(inside, data)]
             elif inside.get_var_name() == data[0]:
-                prev_var = data[1]
-                if prev_var == "":
-                    # if there's no quantifiers
-                    formula.set_inside(
-                        Variable("u")
-                    )
+                formula.set_inside(data[1].copy())
+            return []
+        return visit_children(formula, data)
+
+    def normalize_formula(self, formula: Formula) -> Formula:
+        """
+        Sub steps 1 to 4 of normalize_to_prenex in one traversal. Whether the
+        node is under a negation and the new names of the variables bound
+        above it are carried down the stack, quantifiers are collected in
+        pre-order, and the formula is rebuilt without arrows, quantifiers or
+        negations other than on atoms.
+        """
+        quant_list = []
+        subscripts = {}
+        normalized = fold(
+            formula,
+            lambda node, scope: self.pass_scope(node, scope, quant_list, subscripts),
+            self.build_normalized,
+            (False, {})
+        )
+        normalized.set_var_count(formula.get_var_count())
+        normalized.set_quant_list(quant_list)
+        return normalized
+
+    def pass_scope(self, formula: Formula, scope: tuple, quant_list: List[tuple], subscripts: dict) -> [tuple]:
+        negated, renaming = scope
+        formula_type = formula.get_formula_type()
+        if formula_type == Type.BINARY:
+            left = formula.get_left()
+            right = formula.get_right()
+            connective = formula.get_connective()
+            if connective == Connective.IMPLICATION:
+                # A ⇒ B is ¬A ∨ B
+                return [(left, (not negated, renaming)), (right, scope)]
+            if connective == Connective.BICONDITIONAL:
+                # expanded by polarity like remove_arrows, both sides are visited twice
+                flipped = (not negated, renaming)
+                if negated:
+                    # ¬((A ∧ B) ∨ (¬A ∧ ¬B))
+                    return [(left, scope), (right, scope), (left, flipped), (right, flipped)]
+                # (¬A ∨ B) ∧ (A ∨ ¬B)
+                return [(left, flipped), (right, scope), (left, scope), (right, flipped)]
+            return [(left, scope), (right, scope)]
+        if formula_type == Type.UNARY:
+            inside_negated = negated != formula.get_negation()
+            quantifier = formula.get_quantifier()
+            if quantifier == Quantifier.NONE:
+                return [(formula.get_inside(), (inside_negated, renaming))]
+
+            # a negation passing through the quantifier reverses it
+            if inside_negated:
+                if quantifier == Quantifier.UNIVERSAL:
+                    quantifier = Quantifier.EXISTENTIAL
                 else:
-                    # if there's quantifiers outside
-                    if inside.get_var_name() != prev_var:
-                        formula.set_inside(
-                            Function("f", Variable(prev_var))
-                        )
-        return formula
+                    quantifier = Quantifier.UNIVERSAL
+            var_name = formula.get_quant_var()
+            subscripts[var_name] = subscripts.get(var_name, 0) + 1
+            new_name = var_name + str(subscripts[var_name])
+            quant_list.append((quantifier, new_name))
+            return [(formula.get_inside(), (inside_negated, {**renaming, var_name: new_name}))]
+        return []
 
-    def normalize_to_prenex(self):
-        print("Sub step 1. removing arrows")
+    def build_normalized(self, formula: Formula, scope: tuple, parts: [Formula]) -> Formula:
+        negated, renaming = scope
+        formula_type = formula.get_formula_type()
+        if formula_type == Type.BINARY:
+            connective = formula.get_connective()
+            # De Morgan's Law swaps the connective under a negation
+            if connective == Connective.BICONDITIONAL:
+                # either polarity ends up as a conjunction of two disjunctions
+                return Binary(
+                    Binary(parts[0], parts[1], Connective.OR),
+                    Binary(parts[2], parts[3], Connective.OR),
+                    Connective.AND
+                )
+            if connective == Connective.AND:
+                connective = Connective.OR if negated else Connective.AND
+            else:
+                connective = Connective.AND if negated else Connective.OR
+            return Binary(parts[0], parts[1], connective)
+        if formula_type == Type.UNARY:
+            return parts[0]
+        if formula_type == Type.FUNCTION:
+            inside = formula.get_inside()
+            if inside.get_formula_type() == Type.VARIABLE:
+                var_name = inside.get_var_name()
+                inside = Variable(renaming.get(var_name, var_name))
+            else:
+                inside = inside.copy()
+            return Function(
+                formula.get_func_name(),
+                inside,
+                negated != formula.get_negation(),
+                formula.get_assigned()
+            )
+        var_name = formula.get_var_name()
+        return Variable(renaming.get(var_name, var_name))
+
+    def normalize_to_prenex(self, fused=False, scoped=False, miniscoped=False):
+        if fused and miniscoped:
+            raise Exception("Miniscoping needs the separate passes")
+        if fused:
+            self._sink.step("Sub steps 1 to 4. removing arrows, moving negation inward, "
+                  "standardizing variables and moving quantifiers to front in one pass")
+            for f, formula in enumerate(self._arg):
+                self._arg[f] = self.normalize_formula(formula)
+
+            self._sink.argument(self)
+        else:
+            self.normalize_in_steps(scoped, miniscoped)
+
+        self.skolemize_argument()
+
+    def normalize_in_steps(self, scoped=False, miniscoped=False):
+        self._sink.step("Sub step 1. removing arrows")
         for f, formula in enumerate(self._arg):
             self._arg[f] = self.remove_arrows(formula)
 
-        self.print_argument()
-        print("")
+        self._sink.argument(self)
 
-        print("Sub step 2. moving negation inward")
+        self._sink.step("Sub step 2. moving negation inward")
         for f, formula in enumerate(self._arg):
             formula_type = formula.get_formula_type()
             var_count = formula.get_var_count()
@@ -330,198 +720,407 @@ class PreProcessor:
                 self._arg[f] = self.move_negation_inward(formula, False)
                 self._arg[f].set_var_count(var_count)
 
-        self.print_argument()
-        print("")
+        self._sink.argument(self)
 
-        print("Sub step 3. standardize variables")
+        self._sink.step("Sub step 3. standardize variables")
         for f, formula in enumerate(self._arg):
-            var_count = formula.get_var_count()
+            if scoped:
+                self._arg[f] = self.standardize_all_variables(formula)
+                continue
 
+            var_count = formula.get_var_count()
             for var in var_count:
                 self._subscript = 0
                 self._arg[f] = self.standardize_variables(formula, var)
 
-        self.print_argument()
-        print("")
+        self._sink.argument(self)
 
-        print("Sub step 4. moving all quantifiers to front")
+        if miniscoped:
+            self._sink.step("Sub step 3b. miniscoping and skolemizing in scope")
+            for f, formula in enumerate(self._arg):
+                free = {}
+                self._arg[f] = self.skolemize_in_scope(
+                    self.miniscope(formula, free),
+                    free
+                )
+
+            self._sink.argument(self)
+
+        self._sink.step("Sub step 4. moving all quantifiers to front")
         for f, formula in enumerate(self._arg):
             self._arg[f].set_quant_list(
                 self.move_quantifiers_to_front(formula, [])
             )
 
-        self.print_argument()
-        print("")
+        self._sink.argument(self)
 
-        print("Sub step 5. skolemize the formula")
+    def skolemize_argument(self):
+        self._sink.step("Sub step 5. skolemize the formula")
         for f, formula in enumerate(self._arg):
             drop_list = []
 
             # dropping the existentials in the quantifier list
             quant_list = formula.get_quant_list()
-            for q, quant_holder in enumerate(quant_list.copy()):
-                quantifier = quant_holder[0]
-                quant_var = quant_holder[1]
-                if len(quant_list) > 1:
-                    prev_var = quant_list[q - 1][1]
+            kept_list = []
+            for quantifier, quant_var in quant_list:
+                if quantifier == Quantifier.EXISTENTIAL:
+                    # the Skolem term depends on the last universal before, existentials are skipped
+                    prev_var = kept_list[-1][1] if kept_list else ""
+                    drop_list.append((quant_var, self.new_skolem_term(prev_var)))
                 else:
-                    prev_var = ""
-                if (quantifier == Quantifier.EXISTENTIAL
-                        and quant_var not in quant_list):
-                    drop_list.append((quant_var, prev_var))
-                    quant_list.pop(q)
-                    self._arg[f].set_quant_list(quant_list)
+                    kept_list.append((quantifier, quant_var))
+            self._arg[f].set_quant_list(kept_list)
 
             # skolemize each variable in the formula
             for to_drop in drop_list:
                 self._arg[f] = self.skolemize(formula, to_drop)
 
-        self.print_argument()
-        print("")
-
-    def convert_binary_formula_to_cnf(self, formula: Formula, self_check: bool) -> Formula:
-        left = formula.get_left()
-        right = formula.get_right()
-        left_type = left.get_formula_type()
-        right_type = right.get_formula_type()
-
-        if (left_type == Type.BINARY
-                and formula.get_connective() == Connective.OR
-                and left.get_connective() == Connective.AND):
-            if self_check:
-                # convert the current binary formula to cnf
-                formula = self.convert_to_cnf(formula)
-            else:
-                # perform basic conversion procedure, but won't result a cnf
-                formula.set_left(
-                    Binary(
-                        self.convert_to_cnf(left.get_left()),
-                        self.convert_to_cnf(right),
-                        Connective.OR
-                    )
-                )
-                formula.set_right(
-                    Binary(
-                        self.convert_to_cnf(left.get_right()),
-                        self.convert_to_cnf(right),
-                        Connective.OR
-                    )
-                )
-                formula.set_connective(Connective.AND)
-        if (right_type == Type.BINARY
-                and formula.get_connective() == Connective.OR
-                and right.get_connective() == Connective.AND):
-            if self_check:
-                # convert the current binary formula to cnf
-                formula = self.convert_to_cnf(formula)
-            else:
-                # perform basic conversion procedure, but won't result a cnf
-                formula.set_left(
-                    Binary(
-                        self.convert_to_cnf(left),
-                        self.convert_to_cnf(right.get_left()),
-                        Connective.OR
-                    )
-                )
-                formula.set_right(
-                    Binary(
-                        self.convert_to_cnf(left),
-                        self.convert_to_cnf(right.get_right()),
-                        Connective.OR
-                    )
+        self._sink.argument(self)
+
+    def convert_binary_formula_to_cnf(self, formula: Formula, parts: [Formula]) -> Formula:
+        # both sides are already in CNF, only a disjunction over conjunctions is left to distribute
+        left, right = parts
+        if (formula.get_connective() == Connective.OR
+                and (is_conjunction(left) or is_conjunction(right))):
+            # (A ∧ B) ∨ C becomes (A ∨ C) ∧ (B ∨ C), and A ∨ (B ∧ C) becomes (A ∨ B) ∧ (A ∨ C)
+            return map_conjuncts(
+                left,
+                lambda left_clause: map_conjuncts(
+                    right,
+                    lambda right_clause: Binary(left_clause, right_clause, Connective.OR)
                 )
-                formula.set_connective(Connective.AND)
+            )
+        formula.set_left(left)
+        formula.set_right(right)
+        return formula
+
+    def convert_to_cnf(self, formula: Formula, definitional=False) -> Formula:
+        """
+        Distributes disjunctions over conjunctions. With definitional, a
+        conjunction that would be multiplied out against another one is
+        replaced by a fresh predicate D over its variable instead, and the
+        clauses ¬D ∨ C for its conjuncts C are added, so the number of
+        clauses stays linear. Only the direction D ⇒ C is needed, since the
+        formula is in negation normal form and D only occurs positively.
+        """
+        if not definitional:
+            return fold(formula, visit_connectives, self.convert_formula_to_cnf)
 
-        if not self_check:
-            # make another recursive call to ensure both sides are in CNF
-            formula.set_left(self.convert_to_cnf(formula.get_left()))
-            formula.set_right(self.convert_to_cnf(formula.get_right()))
+        self._predicate_names |= get_predicate_names(formula)
+        definitions = []
+        formula, _, _ = fold(
+            formula,
+            visit_connectives,
+            lambda node, _, parts: self.convert_formula_to_definitional_cnf(node, parts, definitions)
+        )
+        for definition in definitions:
+            formula = Binary(formula, definition, Connective.AND)
         return formula
 
-    def convert_to_cnf(self, formula: Formula) -> Formula:
+    def convert_formula_to_definitional_cnf(self, formula: Formula, parts: [tuple], definitions: [Formula]) -> tuple:
+        """
+        Converts one node with its converted children, which come with the
+        number of their conjuncts and the names of their variables. Returns
+        the converted node with its own, so the counts are folded up with
+        the conversion instead of walking every side again.
+        """
+        if formula.get_formula_type() == Type.FUNCTION:
+            var_name = get_term_chain(formula.get_inside())[1].get_var_name()
+            return formula, 1, get_variable_names_of([var_name])
+        converted = [part[0] for part in parts]
+        if formula.get_formula_type() == Type.UNARY:
+            return self.convert_formula_to_cnf(formula, None, converted), parts[0][1], parts[0][2]
+
+        (left, left_count, left_names), (right, right_count, right_names) = parts
+        var_names = get_variable_names_of(left_names | right_names)
+        if formula.get_connective() != Connective.OR:
+            return self.convert_formula_to_cnf(formula, None, converted), left_count + right_count, var_names
+        if left_count == 1 or right_count == 1 or left_count * right_count <= left_count + right_count:
+            # multiplying out gives no more clauses than a definition would
+            return self.convert_binary_formula_to_cnf(formula, converted), left_count * right_count, var_names
+
+        # naming the bigger side leaves the fewest clauses, terms only take one variable
+        sides = [(1, right_names), (0, left_names)] if right_count >= left_count else [(0, left_names), (1, right_names)]
+        for side, side_names in sides:
+            if len(side_names) <= 1:
+                break
+        else:
+            return self.convert_binary_formula_to_cnf(formula, converted), left_count * right_count, var_names
+
+        # without a variable the definition is over a fresh constant
+        var_name = next(iter(side_names)) if side_names else self.new_skolem_name(SKOLEM_CONSTANT)
+        name = self.new_definition_name()
+        for conjunct in walk_conjuncts(converted[side]):
+            definitions.append(
+                Binary(Function(name, Variable(var_name), True), conjunct, Connective.OR)
+            )
+        if side == 1:
+            return map_conjuncts(
+                left,
+                lambda clause: Binary(clause, Function(name, Variable(var_name)), Connective.OR)
+            ), left_count, get_variable_names_of(left_names | {var_name})
+        return map_conjuncts(
+            right,
+            lambda clause: Binary(Function(name, Variable(var_name)), clause, Connective.OR)
+        ), right_count, get_variable_names_of(right_names | {var_name})
+
+    def new_definition_name(self) -> str:
+        while True:
+            self._definition_count += 1
+            name = DEFINITION_PREFIX + str(self._definition_count)
+            if name not in self._predicate_names:
+                self._predicate_names.add(name)
+                self._definition_names.append(name)
+                return name
+
+    def convert_formula_to_cnf(self, formula: Formula, state, parts: [Formula]) -> Formula:
         if formula.get_formula_type() == Type.UNARY:
             if formula.get_inside().get_formula_type() == Type.FUNCTION:
                 formula.get_inside().set_negation(formula.get_negation())
-            # recursively search the inside of unary to perform the conversion procedure
-            formula = self.convert_to_cnf(formula.get_inside())
+            # the inside of the unary is already converted, so the unary itself is dropped
+            return parts[0]
         if formula.get_formula_type() == Type.BINARY:
-            # convert the two sides of binary into CNF and change connective
-            formula = self.convert_binary_formula_to_cnf(formula, False)
-            # convert the newly formed binary to CNF
-            formula = self.convert_binary_formula_to_cnf(formula, True)
+            return self.convert_binary_formula_to_cnf(formula, parts)
         return formula
 
     def populate_clause(self, formula: Formula, clause: [Formula]) -> [Formula]:
-        if formula.get_formula_type() == Type.BINARY:
-            clause = self.populate_clause(formula.get_left(), clause)
-            clause = self.populate_clause(formula.get_right(), clause)
-            return clause
-        else:
-            clause.append(formula)
-            return clause
+        for node in walk(formula, visit_operands):
+            if node.get_formula_type() != Type.BINARY:
+                clause.append(node)
+        return clause
 
-    def populate_clause_group(self, formula: Formula, clause_group: [[Formula]]) -> bool:
-        if formula.get_formula_type() != Type.BINARY:
-            return True
-        else:
-            if (formula.get_connective() == Connective.OR
-                    and self.populate_clause_group(formula.get_left(), clause_group)
-                    and self.populate_clause_group(formula.get_right(), clause_group)):
-                return True
-            elif formula.get_connective() == Connective.AND:
-                if self.populate_clause_group(formula.get_left(), clause_group):
-                    new_clause = []
-                    new_clause = self.populate_clause(
-                        formula.get_left(), new_clause
-                    )
-                    clause_group.append(new_clause)
-                if self.populate_clause_group(formula.get_right(), clause_group):
-                    new_clause = []
-                    new_clause = self.populate_clause(
-                        formula.get_right(), new_clause
-                    )
-                    clause_group.append(new_clause)
-                return False
+    def populate_clause_group(self, formula: Formula, clause_group: [[Formula]]) -> [[Formula]]:
+        # every conjunct of the CNF becomes one clause, in order from left to right
+        for node in walk_conjuncts(formula):
+            clause_group.append(
+                self.populate_clause(node, [])
+            )
+        return clause_group
 
-    def convert_to_clauses(self) -> [Formula]:
-        print("Sub step 1. dropping all quantifiers")
+    def convert_to_clauses(self, definitional=False) -> [Formula]:
+        self._sink.step("Sub step 1. dropping all quantifiers")
         for f, formula in enumerate(self._arg):
             self._arg[f].set_quant_list([])
 
-        self.print_argument()
-        print("")
+        self._sink.argument(self)
 
-        print("Sub step 2. converting to Conjunctive Normal Form")
+        self._sink.step("Sub step 2. converting to Conjunctive Normal Form")
+        if definitional:
+            for formula in self._arg:
+                self._predicate_names |= get_predicate_names(formula)
         for f, formula in enumerate(self._arg):
-            self._arg[f] = self.convert_to_cnf(formula)
+            self._arg[f] = self.convert_to_cnf(formula, definitional)
 
-        self.print_argument()
-        print("")
+        self._sink.argument(self)
 
-        print("Sub step 3. converting to clauses")
+        self._sink.step("Sub step 3. converting to clauses")
         for f, formula in enumerate(self._arg):
-            clause_group = []
-            if self.populate_clause_group(formula, clause_group):
-                new_clause = []
-                new_clause = self.populate_clause(formula, new_clause)
-                clause_group.append(new_clause)
+            clause_group = self.populate_clause_group(formula, [])
 
             if f < len(self._arg) - 1:
                 self._premises.append(clause_group)
             elif f == len(self._arg) - 1:
                 self._negated_conclusion.append(clause_group)
 
-        self.print_clauses()
-        print("")
+        self._sink.clauses(self)
 
         clauses = []
         for premise in self._premises:
             for clause in premise:
                 clauses.append(clause)
-        clauses.append(self._negated_conclusion[0])
+        clauses.extend(self._negated_conclusion[0])
 
         return clauses
 
+    def preprocess_in_parallel(
+            self,
+            fused=False,
+            scoped=False,
+            miniscoped=False,
+            definitional=False,
+            workers=None
+    ) -> [Formula]:
+        """
+        Does what normalize_to_prenex and convert_to_clauses do, with every
+        formula of the argument converted on its own in a process pool.
+        Formulas go to the workers in the binary encoding of codec.py and
+        their clauses come back as tuples, in the order of the argument, so
+        premises and the negated conclusion end up the same as with the
+        serial steps. Definitions and Skolem symbols
+        are named by each worker on its own and renamed here in that order
+        to the names the serial steps would give them.
+        """
+        if definitional:
+            for formula in self._arg:
+                self._predicate_names |= get_predicate_names(formula)
+        options = (fused, scoped, miniscoped, definitional)
+
+        workers = workers or os.cpu_count() or 1
+        # a few chunks per worker, so thousands of small formulas don't go one by one
+        chunk_size = max(1, len(self._arg) // (4 * workers))
+        with ProcessPoolExecutor(workers, initializer=start_worker, initargs=(options,)) as executor:
+            results = list(executor.map(
+                preprocess_formula,
+                [to_binary(encode_formulas([formula])) for formula in self._arg],
+                chunksize=chunk_size
+            ))
+
+        return self.add_clause_groups(results, [None] * len(results))
+
+    def preprocess_cached(self, cache, fused=False, scoped=False, miniscoped=False, definitional=False) -> [Formula]:
+        """
+        Does what normalize_to_prenex and convert_to_clauses do, taking the
+        clauses of every formula from the cache when an alpha equivalent
+        formula was converted before with the same options. Formulas are
+        converted with their variables renamed to canonical names, which
+        are renamed back with the subscripts standardization gave them, so
+        the clauses are the same as with the serial steps.
+        """
+        if definitional:
+            for formula in self._arg:
+                self._predicate_names |= get_predicate_names(formula)
+        options = (fused, scoped, miniscoped, definitional)
+
+        results = []
+        variable_names = []
+        for formula in self._arg:
+            names = get_canonical_names(formula)
+            key = get_cache_key(formula, names, options)
+            result = cache.get(key)
+            if result is None:
+                result = convert_formula(canonicalize(formula, names), *options)
+                cache.put(key, result)
+            else:
+                self._cache_hits += 1
+            results.append(result)
+            variable_names.append({canonical_name: var_name for var_name, canonical_name in names.items()})
+        cache.flush()
+
+        return self.add_clause_groups(results, variable_names)
+
+    def add_clause_groups(self, results: [tuple], variable_names: [dict]) -> [Formula]:
+        # the results of convert_formula, one per formula of the argument in order
+        for f, (encoded_group, definition_names, skolem_names) in enumerate(results):
+            renaming = {name: self.new_definition_name() for name in definition_names}
+            skolem_renaming = {name: self.new_skolem_name(get_skolem_base(name)) for name in skolem_names}
+
+            clause_group = decode_clause_group(encoded_group, renaming, variable_names[f], skolem_renaming)
+            # the formula is rebuilt from its clauses, as a conjunction of disjunctions
+            self._arg[f] = fold_clauses(clause_group)
+            if f < len(self._arg) - 1:
+                self._premises.append(clause_group)
+            else:
+                self._negated_conclusion.append(clause_group)
+
+        self._sink.clauses(self)
+
+        clauses = []
+        for premise in self._premises:
+            clauses.extend(premise)
+        clauses.extend(self._negated_conclusion[0])
+
+        return clauses
+
+
+def encode_clause_group(clause_group: [[Formula]]) -> list:
+    """
+    Clauses as lists of (predicate, negation, assigned, term) tuples, the
+    term being the names from the outermost function down to the variable.
+    A literal shared by several clauses is encoded once, so it is pickled
+    once and still shared when decoded.
+    """
+    memo = {}
+    encoded_group = []
+    for clause in clause_group:
+        encoded_clause = []
+        for literal in clause:
+            encoded = memo.get(id(literal))
+            if encoded is None:
+                if literal.get_formula_type() != Type.FUNCTION:
+                    raise Exception("Clauses must only contain literals")
+                term = get_term_names(literal.get_inside())
+                encoded = (literal.get_func_name(), literal.get_negation(), literal.get_assigned(), term)
+                memo[id(literal)] = encoded
+            encoded_clause.append(encoded)
+        encoded_group.append(encoded_clause)
+    return encoded_group
+
+
+def restore_variable_name(var_name: str, originals: dict) -> str:
+    # a canonical name with the subscript standardization gave it, back to the original name
+    base = var_name.rstrip("0123456789")
+    if base in originals:
+        return originals[base] + var_name[len(base):]
+    return var_name
+
+
+def decode_clause_group(encoded_group: list, renaming: dict, originals=None, skolem_renaming=None) -> [[Formula]]:
+    # renaming maps predicate names to the names the literals are created with,
+    # originals the canonical variable names to the names of the formula and
+    # skolem_renaming the Skolem symbols in the terms to their new names
+    memo = {}
+    clause_group = []
+    for encoded_clause in encoded_group:
+        clause = []
+        for encoded in encoded_clause:
+            literal = memo.get(id(encoded))
+            if literal is None:
+                func_name, negation, assigned, term = encoded
+                if skolem_renaming:
+                    term = tuple(skolem_renaming.get(name, name) for name in term)
+                if originals:
+                    term = term[:-1] + (restore_variable_name(term[-1], originals),)
+                inside = build_term(term)
+                literal = Function(renaming.get(func_name, func_name), inside, negation, assigned)
+                memo[id(encoded)] = literal
+            clause.append(literal)
+        clause_group.append(clause)
+    return clause_group
+
+
+def fold_clauses(clause_group: [[Formula]]) -> Formula:
+    conjunction = None
+    for clause in clause_group:
+        disjunction = clause[0]
+        for literal in clause[1:]:
+            disjunction = Binary(disjunction, literal, Connective.OR)
+        conjunction = disjunction if conjunction is None else Binary(conjunction, disjunction, Connective.AND)
+    return conjunction
+
+
+# options of preprocess_formula, set once in every worker process
+worker_options = None
+
+
+def start_worker(options: tuple):
+    global worker_options
+    worker_options = options
+
+
+def preprocess_formula(data: bytes) -> tuple:
+    # runs in a worker
+    return convert_formula(decode_formulas(from_binary(data))[0], *worker_options)
+
+
+def convert_formula(formula: Formula, fused, scoped, miniscoped, definitional) -> tuple:
+    """
+    Takes one formula through prenex normal form and CNF on its own.
+    Returns its encoded clauses and the names of the definitions and
+    Skolem symbols it introduced. Both are numbered from 1 for the formula
+    on its own, they are renamed when the clauses are added.
+    """
+    preprocessor = PreProcessor([formula], NullSink())
+    preprocessor.normalize_to_prenex(fused, scoped, miniscoped)
+
+    formula = preprocessor.get_arg()[0]
+    formula.set_quant_list([])
+    formula = preprocessor.convert_to_cnf(formula, definitional)
+    return (
+        encode_clause_group(preprocessor.populate_clause_group(formula, [])),
+        preprocessor.get_definition_names(),
+        preprocessor.get_skolem_names()
+    )
+
 
 # DEBUG = False
 #
@@ -1,65 +1,124 @@
-from enums import Type
-from formula import Formula, Function, Variable
-
-
-def is_assignable(target: Formula, assignment: Formula):
-    inside_type = target.get_inside().get_formula_type()
-    if ((not target.get_assigned()) or
-            (inside_type == Type.FUNCTION and
-             assignment.get_formula_type() == Type.FUNCTION)):
-        return False
-    return True
-
-
-def assign_var(clause: [Formula], to_assign: Formula, assignment: Formula) -> [Formula]:
-    # need to make copy ctor
-    to_assign_var = to_assign.get_inside().get_var_name()
-    for atom in clause:
-        inside = atom.get_inside()
-        if inside.get_formula_type() != Type.VARIABLE:
-            if inside.get_inside().get_var_name() == to_assign_var:
-                inside.set_inside(
-                    Variable(assignment.get_inside().get_var_name())
-                )
-        else:
-            # atom and to assign are pointing at the same thing
-            if inside.get_var_name() == to_assign_var:
-                atom.set_inside(
-                    Variable(assignment.get_inside().get_var_name())
-                )
-    return clause
-
-
-def assign_func(clause: [Formula], to_assign: Formula, assignment: Formula):
-    for atom in clause:
-        inside = atom.get_inside()
-        if inside.get_var_name() == to_assign.get_var_name():
-            atom.set_inside(
-                Variable(assignment.get_inside().get_var_name())
-            )
-    return clause
-
-
-def assign(clause: [Formula], to_assign: Formula, assignment: Formula):
-    # need copy ctor
-    inside_type = assignment.get_inside().get_formula_type()
-    origin = to_assign
-    if inside_type == Type.VARIABLE:
-        assign_var(
-            clause, to_assign,
-            assignment
-        )
-    else:
-        assign_func(
-            clause, to_assign,
-            assignment
+import heapq
+from itertools import combinations
+from typing import Dict, List, Tuple
+
+from enums import Symbol, Type
+from events import EventSink, PrintSink
+from formula import Formula
+from interner import FormulaTable
+from simplifier import DUPLICATE_CLAUSES, TAUTOLOGIES, get_clause_key, get_literal_key, is_tautology, subsumes
+from symbols import SymbolTable
+from terms import get_term_chain, is_variable_term
+
+
+# a term together with the clause it comes from, see unify
+BoundTerm = Tuple[Formula, int]
+
+
+def resolve_binding(term: Formula, bank: int, bindings: Dict[BoundTerm, BoundTerm]) -> BoundTerm:
+    # follows the bindings from a variable until a term that isn't a bound variable
+    while is_variable_term(term):
+        bound = bindings.get((term, bank))
+        if bound is None:
+            break
+        term, bank = bound
+    return term, bank
+
+
+def occurs(variable: Formula, variable_bank: int, term: Formula, bank: int, bindings: Dict[BoundTerm, BoundTerm]) -> bool:
+    # whether the variable is in the term once the bindings are followed, functions have one argument
+    while True:
+        term, bank = resolve_binding(term, bank, bindings)
+        if term.get_formula_type() != Type.FUNCTION:
+            return term is variable and bank == variable_bank
+        term = term.get_inside()
+
+
+def unify(left: Formula, left_bank: int, right: Formula, right_bank: int, bindings=None):
+    """
+    The most general unifier of two terms, as triangular bindings from
+    (variable, bank) to (term, bank), a bound term may hold variables that
+    are bound themselves. The bank tells which clause a term comes from,
+    so the variables of two clauses are kept apart without renaming
+    either. The bindings passed in are extended in a copy, None is
+    returned when the terms don't unify.
+    """
+    bindings = dict(bindings) if bindings else {}
+    pairs = [(left, left_bank, right, right_bank)]
+    while pairs:
+        left, left_bank, right, right_bank = pairs.pop()
+        left, left_bank = resolve_binding(left, left_bank, bindings)
+        right, right_bank = resolve_binding(right, right_bank, bindings)
+        if left is right and left_bank == right_bank:
+            continue
+        if is_variable_term(left):
+            if occurs(left, left_bank, right, right_bank, bindings):
+                return None
+            bindings[(left, left_bank)] = (right, right_bank)
+        elif is_variable_term(right):
+            if occurs(right, right_bank, left, left_bank, bindings):
+                return None
+            bindings[(right, right_bank)] = (left, left_bank)
+        elif left.get_formula_type() == Type.FUNCTION and right.get_formula_type() == Type.FUNCTION:
+            if left.get_symbol() != right.get_symbol():
+                return None
+            pairs.append((left.get_inside(), left_bank, right.get_inside(), right_bank))
+        elif left is not right:
+            # a Skolem constant against another term
+            return None
+    return bindings
+
+
+def apply_bindings(
+        table: FormulaTable,
+        term: Formula,
+        bank: int,
+        bindings: Dict[BoundTerm, BoundTerm],
+        renaming: Dict[BoundTerm, Formula]
+) -> Formula:
+    # the term with the bound variables replaced and the renamed ones renamed, built
+    # from interned nodes so the parts that don't change are shared with the original
+    functions = []
+    while True:
+        term, bank = resolve_binding(term, bank, bindings)
+        if term.get_formula_type() != Type.FUNCTION:
+            break
+        functions.append(term)
+        term = term.get_inside()
+    term = renaming.get((term, bank), term)
+    for function in reversed(functions):
+        term = table.function(
+            function.get_func_name(),
+            term,
+            function.get_negation(),
+            function.get_assigned(),
+            function.get_symbol()
         )
-    print("Assignment Step")
-    print("Assigned ", end="")
-    assignment.print_formula()
-    print(" to ", end="")
-    origin.print_formula()
-    print("")
+    return term
+
+
+def get_free_variables(literals: [BoundTerm], bindings: Dict[BoundTerm, BoundTerm]) -> Dict[BoundTerm, None]:
+    # the variables left unbound in the literals once the bindings are applied, in the order they are met
+    free = {}
+    for literal, bank in literals:
+        term = literal.get_inside()
+        while True:
+            term, bank = resolve_binding(term, bank, bindings)
+            if term.get_formula_type() != Type.FUNCTION:
+                break
+            term = term.get_inside()
+        if is_variable_term(term):
+            free[(term, bank)] = None
+    return free
+
+
+def get_clause_weight(clause: Tuple) -> int:
+    # one per predicate, function and variable symbol
+    weight = 0
+    for literal in clause:
+        functions, _ = get_term_chain(literal.get_inside())
+        weight += 2 + len(functions)
+    return weight
 
 
 def print_clauses(clauses):
@@ -72,65 +131,475 @@ def print_clauses(clauses):
             print(", ", end="")
 
 
+# counts kept by ResolutionProver.saturate besides those of the simplifier rules, of resolvents
+# dropped and of clauses retired
+FORWARD_SUBSUMED = "forward subsumed"
+BACKWARD_SUBSUMED = "backward subsumed"
+# clauses picked by weight for every clause picked by age
+PICK_RATIO = 5
+# given clauses after which saturate gives up
+MAX_GIVEN_CLAUSES = 10000
+
+
+class PassiveQueue:
+    """
+    The clauses waiting to be given, picked lightest first except that
+    every pick_ratio + 1st pick is the oldest one, so heavy clauses are
+    not put off forever. Clauses are kept in a heap by weight and one by
+    age, an entry for a clause that was picked from the other heap or
+    removed is dropped when it comes up.
+    """
+
+    def __init__(self, pick_ratio=PICK_RATIO):
+        self._pick_ratio = pick_ratio
+        self._by_weight: List[Tuple[int, int]] = []
+        self._by_age: List[int] = []
+        # the number of entries of a clause that are left in the heaps but no longer count
+        self._stale: Dict[int, int] = {}
+        self._size = 0
+        self._picks = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, clause_id: int, weight: int):
+        # ids are handed out in order, so a smaller id is an older clause
+        heapq.heappush(self._by_weight, (weight, clause_id))
+        heapq.heappush(self._by_age, clause_id)
+        self._size += 1
+
+    def remove(self, clause_id: int):
+        self._stale[clause_id] = 2
+        self._size -= 1
+
+    def pop(self) -> int:
+        self._picks += 1
+        if self._pick_ratio <= 0 or self._picks % (self._pick_ratio + 1) == 0:
+            clause_id = heapq.heappop(self._by_age)
+            while self.drop_stale(clause_id):
+                clause_id = heapq.heappop(self._by_age)
+        else:
+            clause_id = heapq.heappop(self._by_weight)[1]
+            while self.drop_stale(clause_id):
+                clause_id = heapq.heappop(self._by_weight)[1]
+        # still in the other heap, dropped when it comes up there
+        self._stale[clause_id] = 1
+        self._size -= 1
+        return clause_id
+
+    def drop_stale(self, clause_id: int) -> bool:
+        count = self._stale.get(clause_id)
+        if count is None:
+            return False
+        if count == 1:
+            del self._stale[clause_id]
+        else:
+            self._stale[clause_id] = count - 1
+        return True
+
+
+class LiteralIndex:
+    """
+    The literals of a set of clauses by (predicate symbol, negation), so the
+    literals a literal resolves with are looked up instead of scanned for.
+    Clauses are added and removed under their id, the index is kept up to
+    date as the set changes.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[int, bool], Dict[int, List[int]]] = {}
+
+    def add(self, clause_id: int, clause: Tuple):
+        for position, literal in enumerate(clause):
+            key = (literal.get_symbol(), literal.get_negation())
+            self._entries.setdefault(key, {}).setdefault(clause_id, []).append(position)
+
+    def remove(self, clause_id: int, clause: Tuple):
+        for literal in clause:
+            key = (literal.get_symbol(), literal.get_negation())
+            clauses = self._entries.get(key)
+            if clauses is not None and clauses.pop(clause_id, None) is not None and not clauses:
+                del self._entries[key]
+
+    def copy(self) -> "LiteralIndex":
+        index = LiteralIndex()
+        index._entries = {
+            key: {clause_id: list(positions) for clause_id, positions in clauses.items()}
+            for key, clauses in self._entries.items()
+        }
+        return index
+
+    def get_complements(self, literal: Formula) -> Dict[int, List[int]]:
+        # the positions of the literals with the same predicate and the other sign, by clause id in the order added
+        return self._entries.get((literal.get_symbol(), not literal.get_negation()), {})
+
+
+def get_feature_vector(clause: Tuple) -> Dict[Tuple[int, bool], int]:
+    # the number of literals of every (predicate symbol, negation) in the clause
+    vector = {}
+    for literal in clause:
+        key = (literal.get_symbol(), literal.get_negation())
+        vector[key] = vector.get(key, 0) + 1
+    return vector
+
+
+class FeatureIndex:
+    """
+    The feature vectors of a set of clauses for subsumption. A clause is
+    only tried as subsuming another when none of its counts is higher than
+    the other's, so most pairs are ruled out by comparing counts before the
+    literals are matched with simplifier.subsumes. Clauses are grouped by
+    the features they have, and only the groups with a subset of the
+    features of a clause can hold clauses that subsume it.
+    """
+
+    def __init__(self):
+        self._vectors: Dict[int, Dict[Tuple[int, bool], int]] = {}
+        self._signatures: Dict[frozenset, Dict[int, None]] = {}
+        # the clauses that have every feature
+        self._holding: Dict[Tuple[int, bool], Dict[int, None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def add(self, clause_id: int, vector: Dict[Tuple[int, bool], int]):
+        self._vectors[clause_id] = vector
+        self._signatures.setdefault(frozenset(vector), {})[clause_id] = None
+        for feature in vector:
+            self._holding.setdefault(feature, {})[clause_id] = None
+
+    def remove(self, clause_id: int):
+        vector = self._vectors.pop(clause_id)
+        signature = frozenset(vector)
+        del self._signatures[signature][clause_id]
+        if not self._signatures[signature]:
+            del self._signatures[signature]
+        for feature in vector:
+            del self._holding[feature][clause_id]
+            if not self._holding[feature]:
+                del self._holding[feature]
+
+    def get_subsuming(self, vector: Dict[Tuple[int, bool], int]) -> [int]:
+        # the clauses with no count higher than those of vector, the ones that may subsume it,
+        # the subsets of the features are looked up while there are fewer of them than groups
+        features = list(vector)
+        if 2 ** len(features) <= len(self._signatures):
+            signatures = [
+                frozenset(subset)
+                for size in range(1, len(features) + 1)
+                for subset in combinations(features, size)
+            ]
+        else:
+            signatures = [signature for signature in self._signatures if signature and signature <= vector.keys()]
+
+        candidates = []
+        for signature in signatures:
+            for clause_id in self._signatures.get(signature, ()):
+                held = self._vectors[clause_id]
+                if all(count <= vector[feature] for feature, count in held.items()):
+                    candidates.append(clause_id)
+        return sorted(candidates)
+
+    def get_subsumed(self, vector: Dict[Tuple[int, bool], int]) -> [int]:
+        # the clauses with no count lower than those of vector, the ones it may subsume
+        if not vector:
+            return sorted(self._vectors)
+        # only the clauses with the rarest feature are compared
+        rarest = min(vector, key=lambda feature: len(self._holding.get(feature, ())))
+        candidates = []
+        for clause_id in self._holding.get(rarest, ()):
+            held = self._vectors[clause_id]
+            if all(held.get(feature, 0) >= count for feature, count in vector.items()):
+                candidates.append(clause_id)
+        return sorted(candidates)
+
+
 class ResolutionProver:
-    def __init__(self, clauses: [Formula], negated_conclusion: [Formula]):
-        self._clauses = clauses
-        self._support = [negated_conclusion]
-
-    def is_in_support(self, to_check: Formula):
-        for clause in self._support:
-            if to_check in clause:
-                return True
-        return False
-
-    # bug
-    # Resolved
-    # F(u) and G(f(x1)) ¬F(u) G(u)
-    # Resolvent
-    # G(f(x1))
-
-    def resolve(self, to_resolve: Formula):
+    """
+    Clauses are tuples of interned literals. Inference steps build new
+    clauses that share their unchanged literals and terms with the old ones,
+    nothing is modified in place, so the clauses passed in can be reused.
+    """
+
+    def __init__(self, clauses: [[Formula]], negated_conclusion: [[Formula]], sink: EventSink = None):
+        self._sink = sink if sink is not None else PrintSink()
+        self._symbols = SymbolTable()
+        self._table = FormulaTable()
+        self._clauses = [self.load_clause(clause) for clause in clauses]
+        self._support = [self.load_clause(clause) for clause in negated_conclusion]
+        self._index = LiteralIndex()
+        self._removed = {DUPLICATE_CLAUSES: 0, TAUTOLOGIES: 0, FORWARD_SUBSUMED: 0, BACKWARD_SUBSUMED: 0}
         for c, clause in enumerate(self._clauses):
-            for a, atom in enumerate(clause):
-                if (to_resolve.get_func_name() == atom.get_func_name() and
-                        to_resolve.get_negation() != atom.get_negation() and
-                        is_assignable(atom, to_resolve)):
-                    # perform assignment and resolve
-                    unresolved = self._clauses[c].copy()
-                    assign(self._clauses[c], atom, to_resolve)
-                    self._clauses[c].pop(a)
+            self._index.add(c, clause)
+
+    def load_clause(self, clause: [Formula]) -> Tuple:
+        return tuple(
+            self._table.intern(self._symbols.encode(atom.copy()))
+            for atom in clause
+        )
+
+    def get_symbols(self) -> SymbolTable:
+        return self._symbols
+
+    def get_table(self) -> FormulaTable:
+        return self._table
+
+    def get_sink(self) -> EventSink:
+        return self._sink
+
+    def get_clauses(self) -> [Tuple]:
+        return self._clauses
+
+    def get_index(self) -> LiteralIndex:
+        return self._index
+
+    def get_removed(self) -> Dict[str, int]:
+        return self._removed
+
+    def resolve(self, to_resolve: Formula, clauses: [Tuple], index: LiteralIndex, support: [Tuple]):
+        """
+        Resolves the literal with every clause of clauses holding a
+        complementary literal, in order. The rest of such a clause with the
+        unifier applied takes its place in clauses and index, which are the
+        working copies of one proof, and its literals that are not in
+        support are added to support as the resolvent.
+        """
+        for c in sorted(index.get_complements(to_resolve)):
+            a = 0
+            while a < len(clauses[c]):
+                clause = clauses[c]
+                atom = clause[a]
+                bindings = None
+                if (to_resolve.get_symbol() == atom.get_symbol() and
+                        to_resolve.get_negation() != atom.get_negation()):
+                    bindings = unify(to_resolve.get_inside(), 0, atom.get_inside(), 1)
+                if bindings is not None:
+                    self._sink.assignment(c, to_resolve, atom)
+                    clauses[c] = self.apply_unifier([(literal, 1) for literal in clause[:a] + clause[a + 1:]], bindings)
+                    index.remove(c, clause)
+                    index.add(c, clauses[c])
 
                     # adding resolvent to set of support
-                    resolvent = self._clauses[c].copy()
-                    for t, to_check in enumerate(resolvent):
-                        if self.is_in_support(to_check):
-                            resolvent.pop(t)
-                    self._support.append(resolvent)
-
-                    # print something
-                    print("Resolution Step")
-                    print("Resolved ", end="")
-                    to_resolve.print_formula()
-                    print(" and ", end="")
-                    for f, final in enumerate(unresolved):
-                        final.print_formula()
-                        print(" ", end="")
-                    print("")
-
-                    print("Resolvent ", end="")
-                    for f, final in enumerate(resolvent):
-                        final.print_formula()
-                        print(" ", end="")
-                    print("")
-
-        #             return True
-        # return False
+                    resolvent = tuple(
+                        to_check for to_check in clauses[c]
+                        if not any(to_check in kept for kept in support)
+                    )
+                    support.append(resolvent)
+
+                    self._sink.resolution(c, to_resolve, clause, len(support) - 1, resolvent)
+                a += 1
+
+    def apply_unifier(self, literals: [BoundTerm], bindings: Dict[BoundTerm, BoundTerm]) -> Tuple:
+        """
+        The literals, each with the bank of the clause it comes from, with
+        the bindings applied. Only the literals of the new clause are
+        built, the clauses they come from are left as they are. Variables
+        of bank 1 that are left free and named like a free variable of
+        bank 0 are renamed with primes, so the two stay apart.
+        """
+        free = get_free_variables(literals, bindings)
+        used = {variable.get_var_name() for variable, _ in free}
+        renaming = {}
+        for variable, bank in free:
+            if bank == 1 and (variable, 0) in free:
+                var_name = variable.get_var_name() + "'"
+                while var_name in used:
+                    var_name += "'"
+                used.add(var_name)
+                renaming[(variable, bank)] = self._table.variable(
+                    var_name,
+                    self._symbols.get_id(Symbol.VARIABLE, var_name)
+                )
+
+        applied = []
+        for literal, bank in literals:
+            inside = apply_bindings(self._table, literal.get_inside(), bank, bindings, renaming)
+            if inside is not literal.get_inside():
+                literal = self._table.function(
+                    literal.get_func_name(),
+                    inside,
+                    literal.get_negation(),
+                    literal.get_assigned(),
+                    literal.get_symbol()
+                )
+            applied.append(literal)
+        return tuple(applied)
+
+    def get_resolvent(self, given: Tuple, g: int, partner: Tuple, p: int):
+        # the binary resolvent on literal g of given and the complementary literal p of partner, None when they don't unify
+        bindings = unify(given[g].get_inside(), 0, partner[p].get_inside(), 1)
+        if bindings is None:
+            return None
+        literals = [(literal, 0) for literal in given[:g] + given[g + 1:]]
+        literals += [(literal, 1) for literal in partner[:p] + partner[p + 1:]]
+        # interned literals are equal when they are the same node, duplicates are dropped by identity
+        return tuple(dict.fromkeys(self.apply_unifier(literals, bindings)))
+
+    def get_factors(self, clause: Tuple) -> [Tuple]:
+        # the clause with two literals of the same predicate and sign unified, one factor for each pair that unifies
+        factors = []
+        for i, j in combinations(range(len(clause)), 2):
+            if (clause[i].get_symbol() != clause[j].get_symbol() or
+                    clause[i].get_negation() != clause[j].get_negation()):
+                continue
+            bindings = unify(clause[i].get_inside(), 0, clause[j].get_inside(), 0)
+            if bindings is not None:
+                literals = [(literal, 0) for literal in clause[:j] + clause[j + 1:]]
+                factors.append(tuple(dict.fromkeys(self.apply_unifier(literals, bindings))))
+        return factors
+
+    def saturate(self, pick_ratio=PICK_RATIO, max_given=MAX_GIVEN_CLAUSES, subsumption=True) -> bool:
+        """
+        Given-clause loop. The premises start out active and the negated
+        conclusion passive, the factors of the premises are passive too.
+        Each round the next clause from the passive queue is given: it is
+        resolved with every active clause and with itself and factored,
+        then becomes active, and the new resolvents and factors go into the
+        passive queue. Tautologies and resolvents that only differ from a
+        clause kept before in the order of their literals or the names of
+        their variables are dropped. With subsumption, a resolvent subsumed
+        by an active or passive clause is dropped too, and the clauses a
+        kept resolvent subsumes are retired. Clause ids index the clauses in the order they
+        were kept. Returns True as soon as the empty clause is derived, False
+        when the passive queue runs out or max_given clauses were given.
+        """
+        clauses: List[Tuple] = []
+        # the keys of every clause kept, as ClauseSimplifier makes them
+        seen = set()
+        active = LiteralIndex()
+        passive = PassiveQueue(pick_ratio)
+        # the feature vectors of the active and passive clauses
+        features = FeatureIndex()
+        is_active = set()
+        self._removed = {DUPLICATE_CLAUSES: 0, TAUTOLOGIES: 0, FORWARD_SUBSUMED: 0, BACKWARD_SUBSUMED: 0}
+
+        # interned literals are shared between clauses, their keys are made once
+        literal_keys: Dict[Formula, tuple] = {}
+
+        def get_keys(clause: Tuple) -> List[tuple]:
+            clause_keys = []
+            for literal in clause:
+                key = literal_keys.get(literal)
+                if key is None:
+                    key = literal_keys[literal] = get_literal_key(literal)
+                clause_keys.append(key)
+            return clause_keys
+
+        for clause in self._clauses:
+            clause_key = get_clause_key(get_keys(clause))
+            if clause_key not in seen and clause not in self._support:
+                seen.add(clause_key)
+                clauses.append(clause)
+                active.add(len(clauses) - 1, clause)
+                features.add(len(clauses) - 1, get_feature_vector(clause))
+                is_active.add(len(clauses) - 1)
+        # premises are never given, so they are factored here
+        factors = [factor for clause in clauses for factor in self.get_factors(clause)]
+        for clause in self._support + factors:
+            clause_key = get_clause_key(get_keys(clause))
+            if clause_key not in seen:
+                seen.add(clause_key)
+                clauses.append(clause)
+                passive.add(len(clauses) - 1, get_clause_weight(clause))
+                features.add(len(clauses) - 1, get_feature_vector(clause))
+
+        given_count = 0
+        proved = False
+        while passive and given_count < max_given:
+            given_id = passive.pop()
+            given = clauses[given_id]
+            self._sink.given(given_id, given)
+            # only an empty clause of the negated conclusion is found when given
+            if not given:
+                proved = True
+                break
+            given_count += 1
+            active.add(given_id, given)
+            is_active.add(given_id)
+
+            # resolvents are made before any is kept, backward subsumption may retire active clauses,
+            # a factor is kept with no partner literal
+            inferred = [
+                (partner_id, literal, clauses[partner_id], self.get_resolvent(given, g, clauses[partner_id], p))
+                for g, literal in enumerate(given)
+                for partner_id, positions in active.get_complements(literal).items()
+                for p in positions
+            ]
+            inferred += [(given_id, None, given, factor) for factor in self.get_factors(given)]
+
+            resolvents = []
+            for partner_id, literal, partner, resolvent in inferred:
+                if resolvent is None:
+                    continue
+                resolvent_keys = get_keys(resolvent)
+                if is_tautology(resolvent_keys):
+                    self._removed[TAUTOLOGIES] += 1
+                    continue
+                clause_key = get_clause_key(resolvent_keys)
+                if clause_key in seen:
+                    self._removed[DUPLICATE_CLAUSES] += 1
+                    continue
+                seen.add(clause_key)
+                resolvents.append((partner_id, literal, partner, resolvent, resolvent_keys))
+
+            for partner_id, literal, partner, resolvent, resolvent_keys in resolvents:
+                vector = get_feature_vector(resolvent)
+                # the empty clause ends the loop as soon as it is derived, it isn't compared
+                if subsumption and resolvent:
+                    if any(
+                            subsumes(get_keys(clauses[other]), resolvent_keys)
+                            for other in features.get_subsuming(vector)
+                    ):
+                        self._removed[FORWARD_SUBSUMED] += 1
+                        continue
+                    for other in features.get_subsumed(vector):
+                        if subsumes(resolvent_keys, get_keys(clauses[other])):
+                            self.retire(other, clauses[other], active, passive, features, is_active)
+                            self._removed[BACKWARD_SUBSUMED] += 1
+                clauses.append(resolvent)
+                features.add(len(clauses) - 1, vector)
+                passive.add(len(clauses) - 1, get_clause_weight(resolvent))
+                if literal is None:
+                    self._sink.factoring(partner_id, len(clauses) - 1, resolvent)
+                else:
+                    self._sink.resolution(partner_id, literal, partner, len(clauses) - 1, resolvent)
+                if not resolvent:
+                    proved = True
+                    break
+            if proved:
+                break
+
+        self._sink.simplified(self._removed)
+        if proved:
+            self._sink.resolved()
+        return proved
+
+    def retire(
+            self,
+            clause_id: int,
+            clause: Tuple,
+            active: LiteralIndex,
+            passive: PassiveQueue,
+            features: FeatureIndex,
+            is_active: set
+    ):
+        # takes a clause out of the active or passive set for good
+        features.remove(clause_id)
+        if clause_id in is_active:
+            active.remove(clause_id, clause)
+            is_active.discard(clause_id)
+        else:
+            passive.remove(clause_id)
 
     def apply_resolution(self):
-        while self._support:
-            clause = self._support.pop()
+        # the clauses, their index and the set of support are copied, so the prover can run again
+        clauses = list(self._clauses)
+        index = self._index.copy()
+        support = list(self._support)
+        while support:
+            clause = support.pop()
             if not clause:
-                print("resolved")
+                self._sink.resolved()
                 break
             for atom in clause:
-                self.resolve(atom)
+                self.resolve(atom, clauses, index, support)
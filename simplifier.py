@@ -0,0 +1,188 @@
+from typing import Dict, List, Optional
+
+from enums import Type
+from formula import Formula
+from terms import get_term_names, is_skolem_constant
+
+# rules counted by ClauseSimplifier, in the order they are applied
+DUPLICATE_LITERALS = "duplicate literals"
+TAUTOLOGIES = "tautologies"
+DUPLICATE_CLAUSES = "duplicate clauses"
+SUBSUMED_CLAUSES = "subsumed clauses"
+
+
+def get_literal_key(literal: Formula) -> tuple:
+    if literal.get_formula_type() != Type.FUNCTION:
+        raise Exception("Clauses must only contain literals")
+    return (
+        literal.get_func_name(),
+        literal.get_negation(),
+        literal.get_assigned(),
+        get_term_names(literal.get_inside())
+    )
+
+
+def is_tautology(keys: List[tuple]) -> bool:
+    # a literal and its complement, the same key but for the negation
+    return any((key[0], not key[1], key[2], key[3]) in keys for key in keys)
+
+
+def get_sort_key(key: tuple) -> tuple:
+    # a literal key without its variable
+    return key[0], key[1], key[2], key[3][:-1]
+
+
+def get_clause_key(keys: List[tuple]) -> tuple:
+    """
+    The same for clauses that only differ in the order of their literals
+    and the names of their variables. Every literal has one variable, so a
+    variable is told apart only by the literals it occurs in. Variables are
+    numbered in the order of the sorted keys of those literals, variables
+    with the same ones can be swapped without changing the clause, then
+    the literals are sorted with their numbers.
+    """
+    occurrences = {}
+    for key in keys:
+        if not is_skolem_constant(key[3][-1]):
+            occurrences.setdefault(key[3][-1], []).append(get_sort_key(key))
+    ordered = sorted(occurrences, key=lambda var_name: sorted(occurrences[var_name]))
+    numbers = {var_name: n for n, var_name in enumerate(ordered)}
+
+    canonical = []
+    for func_name, negation, assigned, term in keys:
+        var_name = term[-1]
+        # variables are numbered, Skolem constants keep their name and sort after them
+        var_name = (1, var_name) if var_name not in numbers else (0, numbers[var_name])
+        canonical.append((func_name, negation, assigned, term[:-1], var_name))
+    return tuple(sorted(canonical))
+
+
+def match_literal(pattern: tuple, target: tuple, bindings: Dict[str, tuple]) -> Optional[Dict[str, tuple]]:
+    # extends bindings so that pattern becomes target, None when it can't
+    if pattern[:3] != target[:3]:
+        return None
+    pattern_term, target_term = pattern[3], target[3]
+    var_name = pattern_term[-1]
+    if is_skolem_constant(var_name):
+        return bindings if pattern_term == target_term else None
+
+    # the functions above the variable have to match, the variable takes the rest of the target
+    depth = len(pattern_term) - 1
+    if len(target_term) <= depth or pattern_term[:depth] != target_term[:depth]:
+        return None
+    value = target_term[depth:]
+    bound = bindings.get(var_name)
+    if bound is None:
+        extended = dict(bindings)
+        extended[var_name] = value
+        return extended
+    return bindings if bound == value else None
+
+
+def subsumes(subsuming: List[tuple], subsumed: List[tuple]) -> bool:
+    """
+    Whether one substitution of the variables of subsuming turns every one
+    of its literals into a literal of subsumed. Both are lists of literal
+    keys without duplicates, the literals are matched with backtracking.
+    Two literals may match the same one, but a longer clause never
+    subsumes a shorter one, so a clause doesn't subsume its own factors.
+    """
+    if len(subsuming) > len(subsumed):
+        return False
+    # literals with the fewest candidates are matched first
+    candidates = []
+    for pattern in subsuming:
+        matching = [target for target in subsumed if target[:3] == pattern[:3]]
+        if not matching:
+            return False
+        candidates.append((len(matching), pattern, matching))
+    candidates.sort(key=lambda candidate: candidate[0])
+
+    stack = [(0, {})]
+    while stack:
+        depth, bindings = stack.pop()
+        if depth == len(candidates):
+            return True
+        _, pattern, matching = candidates[depth]
+        for target in matching:
+            extended = match_literal(pattern, target, bindings)
+            if extended is not None:
+                stack.append((depth + 1, extended))
+    return False
+
+
+class ClauseSimplifier:
+    """
+    Simplifies the clauses from PreProcessor.convert_to_clauses before the
+    prover gets them: merges duplicate literals, removes tautologies,
+    duplicate clauses up to renaming of variables and clauses subsumed by
+    another clause. The number of literals or clauses each rule removed is
+    kept in get_removed.
+    """
+
+    def __init__(self):
+        self._removed = {
+            DUPLICATE_LITERALS: 0,
+            TAUTOLOGIES: 0,
+            DUPLICATE_CLAUSES: 0,
+            SUBSUMED_CLAUSES: 0
+        }
+
+    def get_removed(self) -> Dict[str, int]:
+        return self._removed
+
+    def simplify(self, clauses: [[Formula]], protected_count=0) -> [[Formula]]:
+        """
+        Returns the simplified clauses in their order. The last
+        protected_count clauses, the negated conclusion the prover starts
+        from, only have their duplicate literals merged and stay where they
+        are at the end.
+        """
+        first_protected = len(clauses) - protected_count
+        kept = []
+        seen = set()
+        for c, clause in enumerate(clauses):
+            protected = c >= first_protected
+            literals = []
+            keys = []
+            for literal in clause:
+                key = get_literal_key(literal)
+                if key in keys:
+                    self._removed[DUPLICATE_LITERALS] += 1
+                    continue
+                literals.append(literal)
+                keys.append(key)
+
+            if not protected:
+                if is_tautology(keys):
+                    self._removed[TAUTOLOGIES] += 1
+                    continue
+                clause_key = get_clause_key(keys)
+                if clause_key in seen:
+                    self._removed[DUPLICATE_CLAUSES] += 1
+                    continue
+                seen.add(clause_key)
+            kept.append((literals, keys, protected))
+
+        # the clauses holding each (predicate, negation, assigned), only clauses
+        # holding all of those of a clause can be subsumed by it
+        holding = {}
+        for k, (_, keys, _) in enumerate(kept):
+            for key in keys:
+                holding.setdefault(key[:3], set()).add(k)
+
+        # shorter clauses are tried first, they subsume the most
+        removed = set()
+        for k in sorted(range(len(kept)), key=lambda k: len(kept[k][1])):
+            if k in removed:
+                continue
+            keys = kept[k][1]
+            candidates = set.intersection(*(holding[key[:3]] for key in keys)) if keys else set(range(len(kept)))
+            for other in sorted(candidates):
+                if other == k or other in removed or kept[other][2]:
+                    continue
+                if subsumes(keys, kept[other][1]):
+                    removed.add(other)
+                    self._removed[SUBSUMED_CLAUSES] += 1
+
+        return [literals for k, (literals, _, _) in enumerate(kept) if k not in removed]
@@ -0,0 +1,55 @@
+from typing import Dict, List, Tuple
+
+from enums import Symbol, Type
+from formula import Formula
+from traversal import fold, get_children, keep_node
+
+
+class SymbolTable:
+    """
+    Per-problem mapping from names to small integers. Predicates, functions
+    (the Skolem function f) and variables (including the Skolem constant u)
+    are numbered separately from 0, so the ids can be used to index arrays.
+    Names are only looked up again when something is printed.
+    """
+
+    def __init__(self):
+        self._ids: Dict[Symbol, Dict[str, int]] = {kind: {} for kind in Symbol}
+        self._names: Dict[Symbol, List[str]] = {kind: [] for kind in Symbol}
+
+    def get_id(self, kind: Symbol, name: str) -> int:
+        ids = self._ids[kind]
+        symbol = ids.get(name)
+        if symbol is None:
+            symbol = len(ids)
+            ids[name] = symbol
+            self._names[kind].append(name)
+        return symbol
+
+    def get_name(self, kind: Symbol, symbol: int) -> str:
+        return self._names[kind][symbol]
+
+    def get_size(self, kind: Symbol) -> int:
+        return len(self._names[kind])
+
+    def encode(self, formula: Formula) -> Formula:
+        """
+        Stores the id of every name in the formula on its node. A function
+        is a predicate unless it appears inside another function.
+        """
+        return fold(formula, self.encode_node, keep_node, Symbol.PREDICATE)
+
+    def encode_clauses(self, clauses: [[Formula]]) -> [[Formula]]:
+        for clause in clauses:
+            for atom in clause:
+                self.encode(atom)
+        return clauses
+
+    def encode_node(self, formula: Formula, kind: Symbol) -> List[Tuple]:
+        formula_type = formula.get_formula_type()
+        if formula_type == Type.VARIABLE:
+            formula.set_symbol(self.get_id(Symbol.VARIABLE, formula.get_var_name()))
+        elif formula_type == Type.FUNCTION:
+            formula.set_symbol(self.get_id(kind, formula.get_func_name()))
+            return [(formula.get_inside(), Symbol.FUNCTION)]
+        return [(child, kind) for child in get_children(formula)]
@@ -0,0 +1,67 @@
+from typing import List, Sequence, Tuple
+
+from enums import Type
+from formula import Variable, Function, Formula
+
+# names introduced by skolemization, u for a constant and f for a function, numbered
+# with subscripts (u₁, f₂, ...) so they can't be confused with standardized variables
+SKOLEM_CONSTANT = "u"
+SKOLEM_FUNCTION = "f"
+SKOLEM_SUBSCRIPTS = "₀₁₂₃₄₅₆₇₈₉"
+
+
+def get_skolem_name(base: str, number: int) -> str:
+    return base + str(number).translate(str.maketrans("0123456789", SKOLEM_SUBSCRIPTS))
+
+
+def get_skolem_base(name: str) -> str:
+    return name.rstrip(SKOLEM_SUBSCRIPTS)
+
+
+def is_skolem_name(name: str, base: str) -> bool:
+    # only numbered, a plain u or f can be a variable or function of the input
+    return get_skolem_base(name) == base and name != base
+
+
+def is_skolem_constant(var_name: str) -> bool:
+    # a Skolem constant is a Variable node, but it stands for one object
+    return is_skolem_name(var_name, SKOLEM_CONSTANT)
+
+
+def is_skolem_function(func_name: str) -> bool:
+    return is_skolem_name(func_name, SKOLEM_FUNCTION)
+
+
+def is_variable_term(term: Formula) -> bool:
+    return term.get_formula_type() == Type.VARIABLE and not is_skolem_constant(term.get_var_name())
+
+
+def get_term_chain(term: Formula) -> Tuple[List[Formula], Formula]:
+    """
+    Functions have one argument, so a term is a chain of functions down to
+    a variable. Returns the functions from the outermost one down and the
+    node the chain ends in.
+    """
+    functions = []
+    while term.get_formula_type() == Type.FUNCTION:
+        functions.append(term)
+        term = term.get_inside()
+    return functions, term
+
+
+def get_term_names(term: Formula) -> Tuple[str, ...]:
+    # the names from the outermost function down to the variable
+    functions, variable = get_term_chain(term)
+    return tuple(function.get_func_name() for function in functions) + (variable.get_var_name(),)
+
+
+def build_term(names: Sequence[str], symbols=None) -> Formula:
+    # the term get_term_names returns the names of, with the symbol ids in the same order if given
+    term = Variable(names[-1])
+    if symbols is not None:
+        term.set_symbol(symbols[-1])
+    for n in range(len(names) - 2, -1, -1):
+        term = Function(names[n], term)
+        if symbols is not None:
+            term.set_symbol(symbols[n])
+    return term
@@ -0,0 +1,80 @@
+import unittest
+
+from clause_arrays import ClauseArrays, np
+from enums import Symbol
+from events import NullSink
+from formula import Function, Variable
+from loader import parse_input
+from preprocessor import PreProcessor
+
+EXAMPLES = ["test1.txt", "test2.txt", "test3.txt"]
+
+
+def get_example_clauses(path: str) -> [[Function]]:
+    # the clauses main builds for the example, the last input is the conclusion
+    with open(path) as file:
+        lines = [line.split()[1:] for line in file if line.startswith("input ")]
+    preprocessor = PreProcessor([parse_input("input", tokens) for tokens in lines], NullSink())
+    preprocessor.negate_conclusion()
+    preprocessor.normalize_to_prenex()
+    return preprocessor.convert_to_clauses()
+
+
+def get_weight(literal: Function) -> int:
+    # the predicate, then one per function and the variable
+    weight = 2
+    term = literal.get_inside()
+    while term.get_formula_type() == literal.get_formula_type():
+        weight += 1
+        term = term.get_inside()
+    return weight
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class ClauseArraysTest(unittest.TestCase):
+    def get_cases(self) -> [[[Function]]]:
+        nested = [
+            [Function("P", Function("f", Function("g", Variable("x")))), Function("Q", Variable("x"), True)],
+            [Function("P", Function("g", Variable("x")), True)],
+            [Function("Q", Function("f", Function("g", Variable("y"))))],
+            [],
+        ]
+        return [get_example_clauses(path) for path in EXAMPLES] + [nested]
+
+    def test_clauses_load_back(self):
+        for clauses in self.get_cases():
+            loaded = ClauseArrays.from_clauses(clauses).to_clauses()
+            self.assertEqual(
+                [[literal.to_string() for literal in clause] for clause in loaded],
+                [[literal.to_string() for literal in clause] for clause in clauses]
+            )
+
+    def test_statistics_agree_with_the_clauses(self):
+        for clauses in self.get_cases():
+            arrays = ClauseArrays.from_clauses(clauses)
+            symbols = arrays.get_symbols()
+            self.assertEqual(arrays.get_clause_lengths().tolist(), [len(clause) for clause in clauses])
+            self.assertEqual(
+                arrays.get_clause_weights().tolist(),
+                [sum(get_weight(literal) for literal in clause) for clause in clauses]
+            )
+
+            positive, negative = arrays.get_predicate_frequencies()
+            counts = {}
+            for clause in clauses:
+                for literal in clause:
+                    key = (literal.get_func_name(), literal.get_negation())
+                    counts[key] = counts.get(key, 0) + 1
+            for predicate in range(len(positive)):
+                name = symbols.get_name(Symbol.PREDICATE, predicate)
+                self.assertEqual(positive[predicate], counts.get((name, False), 0), name)
+                self.assertEqual(negative[predicate], counts.get((name, True), 0), name)
+
+            pure = {symbols.get_name(Symbol.PREDICATE, predicate) for predicate in arrays.get_pure_predicates()}
+            self.assertEqual(pure, {
+                name for name, negation in counts if (name, not negation) not in counts
+            })
+
+
+if __name__ == "__main__":
+    unittest.main()
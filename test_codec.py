@@ -0,0 +1,148 @@
+import unittest
+
+from codec import (CODEC_VERSION, build_node_table, decode_clauses, decode_formulas, encode_clauses,
+                   encode_formulas, from_binary, from_flat_json, to_binary, to_flat_json)
+from enums import Connective, Quantifier
+from formula import Unary, Binary, Variable, Function, Formula
+from interner import FormulaTable
+from loader import parse_input
+from terms import get_term_names
+
+# the two ways a payload leaves the process, each with its way back
+FORMATS = {
+    "json": (to_flat_json, from_flat_json),
+    "binary": (to_binary, from_binary),
+}
+
+
+def round_trip(data: dict, name: str) -> dict:
+    write, read = FORMATS[name]
+    return read(write(data))
+
+
+def build_chain(depth: int) -> Formula:
+    # P(f₁(f₁(...f₁(x)...))) with depth functions under the predicate
+    term = Variable("x")
+    for _ in range(depth):
+        term = Function("f₁", term)
+    return Function("P", term)
+
+
+class FormulaCodecTest(unittest.TestCase):
+    def assert_same_formula(self, decoded: Formula, formula: Formula):
+        self.assertEqual(decoded.to_string(), formula.to_string())
+        self.assertEqual(decoded.get_var_count(), formula.get_var_count())
+        self.assertEqual(decoded.get_quant_list(), formula.get_quant_list())
+        self.assertEqual(build_node_table([decoded]), build_node_table([formula]))
+
+    def test_parsed_formulas(self):
+        formulas = [
+            parse_input("input", "FORM F y FORM G y AND FORM F x FORM G x -> OR EXIST y FORALL x".split()),
+            parse_input("input", "FORM F x FORM H x NOT -> FORALL x".split()),
+            parse_input("infix", "FORALL x ( FORM F x <-> NOT ( FORM G x ) )".split()),
+        ]
+        formulas[0].set_quant_list([(Quantifier.UNIVERSAL, "x1"), (Quantifier.EXISTENTIAL, "y1")])
+        for name in FORMATS:
+            decoded = decode_formulas(round_trip(encode_formulas(formulas), name))
+            self.assertEqual(len(decoded), len(formulas))
+            for d, formula in enumerate(formulas):
+                self.assert_same_formula(decoded[d], formula)
+
+    def test_flags_and_names(self):
+        literal = Function("Q", Function("f₂", Variable("u₁")), True, True)
+        formula = Binary(
+            Unary(literal, Quantifier.NONE, True, ""),
+            Unary(Function("R", Variable("z")), Quantifier.EXISTENTIAL, False, "z"),
+            Connective.BICONDITIONAL,
+            True
+        )
+        for name in FORMATS:
+            decoded = decode_formulas(round_trip(encode_formulas([formula]), name))[0]
+            self.assert_same_formula(decoded, formula)
+            self.assertTrue(decoded.get_is_clause())
+            decoded_literal = decoded.get_left().get_inside()
+            self.assertTrue(decoded_literal.get_negation())
+            self.assertTrue(decoded_literal.get_assigned())
+
+    def test_shared_nodes_stay_shared(self):
+        shared = Function("P", Function("f₁", Variable("x")))
+        formula = Binary(
+            Binary(shared, Function("Q", Variable("x")), Connective.OR),
+            Binary(shared, Function("R", Variable("y")), Connective.OR),
+            Connective.AND
+        )
+        nodes, _ = build_node_table([formula])
+        # P, f₁, x, Q, x, R, y and the three connectives, P(f₁(x)) only once
+        self.assertEqual(len(nodes), 10)
+        for name in FORMATS:
+            decoded = decode_formulas(round_trip(encode_formulas([formula]), name))[0]
+            self.assert_same_formula(decoded, formula)
+            self.assertIs(decoded.get_left().get_left(), decoded.get_right().get_left())
+
+    def test_interned_formulas(self):
+        table = FormulaTable()
+        formulas = [
+            table.intern(parse_input("input", line.split()))
+            for line in ("FORM F x FORM G x AND", "FORM F x FORM G x OR", "FORM F x NOT")
+        ]
+        nodes, _ = build_node_table(formulas)
+        # every node of the table once, F(x) and G(x) are shared between the formulas
+        self.assertEqual(len(nodes), len(table))
+        for name in FORMATS:
+            decoded = decode_formulas(round_trip(encode_formulas(formulas), name))
+            for d, formula in enumerate(formulas):
+                self.assert_same_formula(decoded[d], formula)
+            self.assertIs(decoded[0].get_left(), decoded[1].get_left())
+
+    def test_deeply_nested_terms(self):
+        depth = 20000
+        formula = build_chain(depth)
+        for name in FORMATS:
+            decoded = decode_formulas(round_trip(encode_formulas([formula]), name))[0]
+            names = get_term_names(decoded.get_inside())
+            self.assertEqual(len(names), depth + 1)
+            self.assertEqual(names[0], "f₁")
+            self.assertEqual(names[-1], "x")
+            self.assertEqual(build_node_table([decoded]), build_node_table([formula]))
+
+    def test_deeply_nested_connectives(self):
+        formula = Function("F0", Variable("x"))
+        for i in range(1, 20000):
+            formula = Binary(formula, Function("F" + str(i % 26), Variable("x")), Connective.OR)
+        formula = Unary(formula, Quantifier.UNIVERSAL, False, "x")
+        for name in FORMATS:
+            decoded = decode_formulas(round_trip(encode_formulas([formula]), name))[0]
+            self.assertEqual(build_node_table([decoded]), build_node_table([formula]))
+
+    def test_other_version_is_refused(self):
+        data = encode_formulas([Function("P", Variable("x"))])
+        data["version"] += 1
+        with self.assertRaises(Exception):
+            decode_formulas(data)
+        with self.assertRaises(Exception):
+            from_binary(b"PFB" + bytes([CODEC_VERSION + 1]))
+
+
+class ClauseCodecTest(unittest.TestCase):
+    def test_clauses_with_a_shared_literal(self):
+        shared = Function("P", Function("f₁", Variable("x1")), True)
+        clauses = [
+            [shared, Function("Q", Variable("x1"))],
+            [shared],
+            [Function("R", Variable("u₂")), Function("S", build_chain(50).get_inside(), True)],
+        ]
+        for name in FORMATS:
+            decoded = decode_clauses(round_trip(encode_clauses(clauses), name))
+            self.assertEqual(
+                [[literal.to_string() for literal in clause] for clause in decoded],
+                [[literal.to_string() for literal in clause] for clause in clauses]
+            )
+            self.assertIs(decoded[0][0], decoded[1][0])
+
+    def test_no_clauses(self):
+        for name in FORMATS:
+            self.assertEqual(decode_clauses(round_trip(encode_clauses([]), name)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
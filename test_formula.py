@@ -0,0 +1,83 @@
+import gc
+import unittest
+import weakref
+
+from enums import Connective, Quantifier
+from formula import Unary, Binary, Variable, Function
+
+
+def build_shared():
+    # b is the left side of one formula and the inside of another, both under root
+    x = Variable("x")
+    g = Function("g", x)
+    f = Function("F", g)
+    u = Unary(f, Quantifier.UNIVERSAL, False, "x")
+    b = Binary(u, Function("G", Variable("y")), Connective.AND)
+    left = Binary(b, Function("H", Variable("z")), Connective.OR)
+    right = Unary(b, Quantifier.NONE, True, "")
+    root = Binary(left, right, Connective.IMPLICATION)
+    return {"x": x, "g": g, "f": f, "u": u, "b": b, "left": left, "right": right, "root": root}
+
+
+# every setter that changes the text, with the nodes above the one it is called on
+CHANGES = {
+    "set_left": (lambda nodes: nodes["b"].set_left(Function("K", Variable("w"))), ["b", "left", "right", "root"]),
+    "set_right": (lambda nodes: nodes["b"].set_right(Function("K", Variable("w"))), ["b", "left", "right", "root"]),
+    "set_connective": (lambda nodes: nodes["b"].set_connective(Connective.OR), ["b", "left", "right", "root"]),
+    "set_quantifier": (
+        lambda nodes: nodes["u"].set_quantifier(Quantifier.EXISTENTIAL),
+        ["u", "b", "left", "right", "root"]
+    ),
+    "set_quant_var": (lambda nodes: nodes["u"].set_quant_var("w"), ["u", "b", "left", "right", "root"]),
+    "Unary.set_negation": (lambda nodes: nodes["u"].set_negation(True), ["u", "b", "left", "right", "root"]),
+    "Unary.set_inside": (
+        lambda nodes: nodes["u"].set_inside(Function("K", Variable("w"))),
+        ["u", "b", "left", "right", "root"]
+    ),
+    "Function.set_inside": (
+        lambda nodes: nodes["g"].set_inside(Variable("w")),
+        ["g", "f", "u", "b", "left", "right", "root"]
+    ),
+    "Function.set_negation": (lambda nodes: nodes["f"].set_negation(True), ["f", "u", "b", "left", "right", "root"]),
+    "set_var": (lambda nodes: nodes["x"].set_var("w"), ["x", "g", "f", "u", "b", "left", "right", "root"]),
+}
+
+
+class RenderingTest(unittest.TestCase):
+    def test_every_ancestor_renders_again(self):
+        for name, (change, ancestors) in CHANGES.items():
+            nodes = build_shared()
+            before = {key: node.to_string() for key, node in nodes.items()}
+            change(nodes)
+            for key in ancestors:
+                # a copy has never been rendered, so its text is built from scratch
+                self.assertEqual(nodes[key].to_string(), nodes[key].copy().to_string(), (name, key))
+                self.assertNotEqual(nodes[key].to_string(), before[key], (name, key))
+
+    def test_changes_after_a_parent_is_replaced(self):
+        nodes = build_shared()
+        nodes["root"].to_string()
+        # the new parent was never rendered, the old one still has its text
+        replacement = Binary(nodes["left"], Function("K", Variable("w")), Connective.AND)
+        nodes["root"].set_left(replacement)
+        self.assertEqual(nodes["root"].to_string(), nodes["root"].copy().to_string())
+        nodes["x"].set_var("v")
+        self.assertEqual(nodes["root"].to_string(), nodes["root"].copy().to_string())
+        self.assertIn("F(g(v))", nodes["root"].to_string())
+
+    def test_children_dont_keep_their_parents_alive(self):
+        child = Function("F", Variable("x"))
+        parent = Binary(child, Function("G", Variable("y")), Connective.OR)
+        parent.to_string()
+        self.assertEqual(child.get_parents(), [parent])
+        reference = weakref.ref(parent)
+        del parent
+        gc.collect()
+        self.assertIsNone(reference())
+        self.assertEqual(child.get_parents(), [])
+        child.set_negation(True)
+        self.assertEqual(child.to_string(), "¬F(x)")
+
+
+if __name__ == "__main__":
+    unittest.main()
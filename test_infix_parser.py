@@ -0,0 +1,69 @@
+import re
+import unittest
+
+from enums import Connective
+from infix_parser import parse_infix
+from loader import parse_input
+
+# infix text and the same formula in postfix
+PAIRS = [
+    ("FORALL x ( FORM F x -> NOT ( FORM H x ) )", "FORM F x FORM H x NOT -> FORALL x"),
+    ("FORALL x ( NOT ( FORM F x ) )", "FORM F x NOT FORALL x"),
+    (
+        "FORALL x EXIST y ( ( FORM F y AND FORM G y ) OR NOT ( FORM F x -> FORM G x ) )",
+        "FORM F y FORM G y AND FORM F x FORM G x -> NOT OR EXIST y FORALL x"
+    ),
+    ("FORM A x OR FORM B x AND FORM C x", "FORM A x FORM B x FORM C x AND OR"),
+    ("FORM A x -> FORM B x -> FORM C x", "FORM A x FORM B x FORM C x -> ->"),
+    ("FORM A x <-> FORM B x -> FORM C x", "FORM A x FORM B x FORM C x -> <->"),
+    ("FORM A x AND FORM B x AND FORM C x", "FORM A x FORM B x AND FORM C x AND"),
+    ("NOT FORALL x FORM A x AND FORM B x", "FORM A x FORALL x NOT FORM B x AND"),
+]
+
+# printed symbols and the infix tokens they are read back as
+SYMBOLS = {"∀": "FORALL", "∃": "EXIST", "¬": "NOT", "∧": "AND", "∨": "OR", "⇒": "->", "⇔": "<->", "(": "(", ")": ")"}
+
+PRINTED_TOKEN = re.compile(r"([A-Z]\w*)\(([a-z]\w*'*)\)|([∀∃])([a-z]\d*'*)|([¬∧∨⇒⇔()])")
+
+
+def to_infix(text: str) -> str:
+    # the printed formula written back in the input syntax
+    tokens = []
+    for atom, var_name, quantifier, quant_var, symbol in PRINTED_TOKEN.findall(text):
+        if atom:
+            tokens += ["FORM", atom, var_name]
+        elif quantifier:
+            tokens += [SYMBOLS[quantifier], quant_var]
+        else:
+            tokens.append(SYMBOLS[symbol])
+    return " ".join(tokens)
+
+
+class InfixParserTest(unittest.TestCase):
+    def test_same_tree_as_postfix(self):
+        for infix, postfix in PAIRS:
+            formula = parse_infix(infix)
+            expected = parse_input("input", postfix.split())
+            self.assertEqual(formula.to_string(), expected.to_string(), infix)
+            self.assertEqual(formula.get_var_count(), expected.get_var_count(), infix)
+
+    def test_printed_formulas_parse_back(self):
+        for infix, _ in PAIRS:
+            text = parse_infix(infix).to_string()
+            self.assertEqual(parse_infix(to_infix(text)).to_string(), text, infix)
+
+    def test_cached_trees_are_copied(self):
+        text = PAIRS[0][0]
+        formula = parse_infix(text)
+        formula.get_inside().set_connective(Connective.OR)
+        self.assertNotEqual(formula.to_string(), parse_infix(text).to_string())
+        self.assertEqual(parse_infix(text).to_string(), "∀x(F(x) ⇒ ¬H(x))")
+
+    def test_malformed_input(self):
+        for text in ["( FORM A x", "FORM A x )", "FORM A x AND", "FORALL", "FORM A", "AND FORM A x"]:
+            with self.assertRaises(Exception, msg=text):
+                parse_infix(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+from loader import load_problems, read_commands
+
+PROBLEMS = """input FORM F x FORM G x -> FORALL x
+infix FORALL x ( FORM F x )
+
+input FORM G x FORALL x
+resolve
+print
+input FORM A x NOT
+input FORM A x OR
+"""
+
+
+class LoaderTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(handle, "w") as file:
+            file.write(PROBLEMS)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_commands(self):
+        commands = list(read_commands(self.path))
+        # the blank line is skipped
+        self.assertEqual(len(commands), 7)
+        self.assertEqual(commands[0], ("input", "FORM F x FORM G x -> FORALL x".split()))
+        self.assertEqual([command for command, _ in commands[3:5]], ["resolve", "print"])
+
+    def test_problems_end_at_other_commands(self):
+        problems = load_problems(self.path)
+        first = next(problems)
+        self.assertEqual([command for command, _ in first.get_inputs()], ["input", "infix", "input"])
+        self.assertEqual([formula.to_string() for formula in first.get_premises()], ["∀x(F(x) ⇒ G(x))", "∀xF(x)"])
+        self.assertEqual(first.get_conclusion().to_string(), "∀xG(x)")
+
+        # the last problem ends with the file, and its formulas are only parsed when asked for
+        last = next(problems)
+        self.assertEqual(len(last.get_inputs()), 2)
+        self.assertEqual(next(problems, None), None)
+        with self.assertRaises(IndexError):
+            last.get_arg()
+
+    def test_example_files(self):
+        for path in ["test1.txt", "test2.txt", "test3.txt"]:
+            problems = list(load_problems(path))
+            self.assertEqual(len(problems), 1, path)
+            inputs = [tokens for command, tokens in read_commands(path) if command == "input"]
+            self.assertEqual(problems[0].get_inputs(), [("input", tokens) for tokens in inputs], path)
+            self.assertEqual(len(problems[0].get_arg()), len(inputs), path)
+
+
+if __name__ == "__main__":
+    unittest.main()
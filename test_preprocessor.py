@@ -0,0 +1,134 @@
+import re
+import unittest
+
+from cache import MemoryCache
+from enums import Type
+from events import NullSink
+from loader import parse_input
+from preprocessor import PreProcessor
+from terms import SKOLEM_CONSTANT, is_skolem_constant
+from traversal import walk
+
+# the ways normalize_to_prenex can run, as (fused, scoped, miniscoped)
+MODES = [(False, False, False), (True, False, False), (False, True, False), (False, True, True)]
+
+
+def skolemize(line: str, mode: tuple) -> PreProcessor:
+    preprocessor = PreProcessor([parse_input("input", line.split())], NullSink())
+    preprocessor.normalize_to_prenex(*mode)
+    return preprocessor
+
+
+def get_free_names(preprocessor: PreProcessor) -> set:
+    # the variables left that are neither universals of the quantifier list nor Skolem constants
+    formula = preprocessor.get_arg()[0]
+    bound = {var_name for _, var_name in formula.get_quant_list()}
+    return {
+        node.get_var_name() for node in walk(formula)
+        if node.get_formula_type() == Type.VARIABLE
+        and node.get_var_name() not in bound
+        and not is_skolem_constant(node.get_var_name())
+    }
+
+
+def get_clauses(lines: [str], steps: str, options: tuple) -> [str]:
+    # every clause as a string, the last formula is the conclusion and is negated first
+    preprocessor = PreProcessor([parse_input("input", line.split()) for line in lines], NullSink())
+    preprocessor.negate_conclusion()
+    if steps == "parallel":
+        clauses = preprocessor.preprocess_in_parallel(*options, workers=2)
+    elif steps == "cached":
+        clauses = preprocessor.preprocess_cached(MemoryCache(), *options)
+    else:
+        preprocessor.normalize_to_prenex(*options[:3])
+        clauses = preprocessor.convert_to_clauses(options[3])
+    return [" ∨ ".join(literal.to_string() for literal in clause) for clause in clauses]
+
+
+class SkolemizationTest(unittest.TestCase):
+    def test_existentials_in_a_row_depend_on_the_universal(self):
+        line = "FORM P y FORM Q z AND EXIST z EXIST y FORALL x"
+        self.assertEqual(skolemize(line, MODES[0]).to_string(), ["∀x1(P(f₁(x1)) ∧ Q(f₂(x1)))"])
+        for mode in MODES:
+            self.assertEqual(get_free_names(skolemize(line, mode)), set(), mode)
+
+    def test_existentials_between_universals(self):
+        line = "FORM P y FORM Q z AND FORM R w AND EXIST z EXIST y FORALL w EXIST v FORALL x"
+        self.assertEqual(
+            skolemize(line, MODES[0]).to_string(),
+            ["∀x1∀w1((P(f₂(w1)) ∧ Q(f₃(w1))) ∧ R(w1))"]
+        )
+        for mode in MODES:
+            self.assertEqual(get_free_names(skolemize(line, mode)), set(), mode)
+
+    def test_existentials_get_their_own_witness(self):
+        # satisfiable, so the two constants must not be the same
+        lines = ["FORM P y EXIST y FORM P z NOT EXIST z AND", "FORM Q x FORALL x"]
+        for steps in ("serial", "parallel", "cached"):
+            for mode in MODES:
+                self.assertEqual(
+                    get_clauses(lines, steps, mode + (False,)),
+                    ["P(u₁)", "¬P(u₂)", "¬Q(u₃)"],
+                    (steps, mode)
+                )
+
+    def test_skolem_functions_are_renamed_across_formulas(self):
+        lines = ["FORM P y EXIST y FORALL x", "FORM Q y EXIST y FORALL x", "FORM R x FORALL x"]
+        expected = ["P(f₁(x1))", "Q(f₂(x1))", "¬R(u₃)"]
+        for steps in ("serial", "parallel", "cached"):
+            self.assertEqual(get_clauses(lines, steps, (False, False, False, False)), expected, steps)
+
+    def test_definitions_without_a_variable_use_a_numbered_constant(self):
+        # the named side only holds the Skolem constant of y, the definition gets a constant of its own
+        lines = ["FORM P y FORM Q y AND FORM R y AND FORM S y FORM T y AND FORM V y AND OR EXIST y", "FORM Z x FORALL x"]
+        for steps in ("serial", "parallel", "cached"):
+            clauses = get_clauses(lines, steps, (False, False, False, True))
+            self.assertEqual(len(clauses), 7, steps)
+            terms = {term for clause in clauses for term in re.findall(r"D1\((\w+)\)", clause)}
+            self.assertEqual(len(terms), 1, steps)
+            term = terms.pop()
+            self.assertNotEqual(term, SKOLEM_CONSTANT, steps)
+            self.assertTrue(is_skolem_constant(term), steps)
+
+
+
+def get_example_lines(path: str) -> [str]:
+    with open(path) as file:
+        return [line.split(None, 1)[1] for line in file if line.startswith("input ")]
+
+
+class PrenexTest(unittest.TestCase):
+    def test_fused_pass_matches_the_steps(self):
+        for path in ["test1.txt", "test2.txt", "test3.txt"]:
+            lines = get_example_lines(path)
+            for definitional in (False, True):
+                self.assertEqual(
+                    get_clauses(lines, "serial", MODES[1] + (definitional,)),
+                    get_clauses(lines, "serial", MODES[0] + (definitional,)),
+                    (path, definitional)
+                )
+
+    def test_scoped_standardization_matches_the_steps(self):
+        for path in ["test1.txt", "test2.txt", "test3.txt"]:
+            lines = get_example_lines(path)
+            for definitional in (False, True):
+                self.assertEqual(
+                    get_clauses(lines, "serial", MODES[2] + (definitional,)),
+                    get_clauses(lines, "serial", MODES[0] + (definitional,)),
+                    (path, definitional)
+                )
+
+    def test_reused_variables_are_renamed_apart(self):
+        # side by side and nested quantifiers over the same name
+        lines = {
+            "FORM P x FORALL x FORM Q x FORALL x AND": "∀x1∀x2(P(x1) ∧ Q(x2))",
+            "FORM P x FORM Q x FORALL x AND FORALL x": "∀x1∀x2(P(x1) ∧ Q(x2))",
+            "FORM P x FORALL x FORM Q x EXIST x OR FORM R x FORALL x AND": "∀x1∀x3((P(x1) ∨ Q(f₁(x1))) ∧ R(x3))",
+        }
+        for line, expected in lines.items():
+            for mode in MODES[:3]:
+                self.assertEqual(skolemize(line, mode).to_string(), [expected], (line, mode))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+import random
+import unittest
+
+from events import NullSink, RecordSink
+from formula import Variable, Function
+from prover import (BACKWARD_SUBSUMED, FORWARD_SUBSUMED, FeatureIndex, PassiveQueue, ResolutionProver,
+                    get_feature_vector, unify)
+
+
+def literal(name: str, var_name: str, negation=False) -> Function:
+    return Function(name, Variable(var_name), negation)
+
+
+def resolve(given: [Function], partner: [Function]) -> [str]:
+    # the resolvent on the first literal of each clause
+    prover = ResolutionProver([], [], NullSink())
+    resolvent = prover.get_resolvent(prover.load_clause(given), 0, prover.load_clause(partner), 0)
+    return None if resolvent is None else [literal.to_string() for literal in resolvent]
+
+
+def saturate(premises: [[Function]], negated_conclusion: [[Function]], **options) -> bool:
+    # the clauses are passed as main does, the negated conclusion last
+    prover = ResolutionProver(premises + negated_conclusion, negated_conclusion, NullSink())
+    return prover.saturate(**options)
+
+
+class ReuseTest(unittest.TestCase):
+    def test_proofs_leave_the_clauses_as_they_are(self):
+        premises = [[literal("F", "x", True), literal("G", "x")], [literal("G", "x", True)]]
+        negated_conclusion = [[literal("F", "u₁")]]
+        prover = ResolutionProver(premises + negated_conclusion, negated_conclusion, RecordSink())
+        clauses = list(prover.get_clauses())
+        prover.apply_resolution()
+        self.assertEqual(prover.get_clauses(), clauses)
+        first = [record["event"] for record in prover.get_sink().get_records()]
+        self.assertEqual(first.count("resolved"), 1)
+
+        # the same proof again, then the given-clause loop on the same clauses
+        prover.apply_resolution()
+        second = [record["event"] for record in prover.get_sink().get_records()][len(first):]
+        self.assertEqual(second, first)
+        self.assertTrue(prover.saturate())
+        self.assertEqual(prover.get_clauses(), clauses)
+
+
+class PassiveQueueTest(unittest.TestCase):
+    def test_picks_by_weight_and_age(self):
+        queue = PassiveQueue(2)
+        for clause_id, weight in enumerate([5, 1, 3, 2]):
+            queue.add(clause_id, weight)
+        # two lightest, then the oldest, then the one left
+        self.assertEqual([queue.pop() for _ in range(4)], [1, 3, 0, 2])
+        self.assertEqual(len(queue), 0)
+
+    def test_removed_and_picked_clauses_never_come_back(self):
+        for pick_ratio in (0, 1, 2, 5):
+            generator = random.Random(pick_ratio)
+            queue = PassiveQueue(pick_ratio)
+            waiting = set()
+            for clause_id in range(500):
+                queue.add(clause_id, generator.randint(1, 10))
+                waiting.add(clause_id)
+                if generator.random() < 0.3:
+                    removed = generator.choice(sorted(waiting))
+                    queue.remove(removed)
+                    waiting.discard(removed)
+                if generator.random() < 0.4:
+                    picked = queue.pop()
+                    self.assertIn(picked, waiting, pick_ratio)
+                    waiting.discard(picked)
+                self.assertEqual(len(queue), len(waiting))
+            while queue:
+                picked = queue.pop()
+                self.assertIn(picked, waiting, pick_ratio)
+                waiting.discard(picked)
+            self.assertEqual(waiting, set())
+
+
+class SaturationTest(unittest.TestCase):
+    def test_every_clause_of_the_negated_conclusion_is_given(self):
+        premises = [[literal("B", "x", True)]]
+        negated_conclusion = [[literal("A", "u₁")], [literal("B", "u₁")]]
+        self.assertTrue(saturate(premises, negated_conclusion))
+
+    def test_factoring(self):
+        # P(x) ∨ P(y) and ¬P(x) ∨ ¬P(y) only resolve to the empty clause once factored
+        premises = [[literal("P", "x"), literal("P", "y")]]
+        negated_conclusion = [[literal("P", "x", True), literal("P", "y", True)]]
+        self.assertTrue(saturate(premises, negated_conclusion))
+        self.assertTrue(saturate(premises, negated_conclusion, subsumption=False))
+
+    def test_empty_clause_on_the_last_given_clause(self):
+        # A(u₁) is the only clause given, its resolvent with ¬A(x) is the empty clause
+        premises = [[literal("A", "x", True)], [literal("B", "x", True), literal("C", "x")]]
+        negated_conclusion = [[literal("A", "u₁")], [literal("B", "u₁")]]
+        sink = RecordSink()
+        prover = ResolutionProver(premises + negated_conclusion, negated_conclusion, sink)
+        self.assertTrue(prover.saturate(max_given=1))
+        events = [record["event"] for record in sink.get_records()]
+        self.assertEqual(events.count("given"), 1)
+        self.assertEqual(events[-1], "resolved")
+
+
+class SubsumptionTest(unittest.TestCase):
+    def test_feature_index(self):
+        prover = ResolutionProver([], [], NullSink())
+        clauses = [
+            prover.load_clause([literal("P", "x")]),
+            prover.load_clause([literal("P", "x"), literal("P", "y")]),
+            prover.load_clause([literal("P", "x"), literal("Q", "x", True)]),
+        ]
+        index = FeatureIndex()
+        for c, clause in enumerate(clauses):
+            index.add(c, get_feature_vector(clause))
+        self.assertEqual(index.get_subsuming(get_feature_vector(clauses[2])), [0, 2])
+        self.assertEqual(index.get_subsumed(get_feature_vector(clauses[0])), [0, 1, 2])
+        index.remove(0)
+        self.assertEqual(index.get_subsuming(get_feature_vector(clauses[1])), [1])
+        self.assertEqual(len(index), 2)
+
+    def test_resolvent_subsumed_by_an_active_clause(self):
+        # B(u₁) is subsumed by the premise B(x) and dropped
+        premises = [[literal("A", "x", True), literal("B", "x")], [literal("B", "x")]]
+        negated_conclusion = [[literal("A", "u₁")]]
+        prover = ResolutionProver(premises + negated_conclusion, negated_conclusion, NullSink())
+        self.assertFalse(prover.saturate())
+        self.assertEqual(prover.get_removed()[FORWARD_SUBSUMED], 1)
+
+    def test_passive_clause_retired_by_a_resolvent(self):
+        # A(u₁) is given first and resolves to B(u₁), which subsumes the passive B(u₁) ∨ D(u₁)
+        premises = [[literal("A", "x", True), literal("B", "x")]]
+        negated_conclusion = [[literal("A", "u₁")], [literal("B", "u₁"), literal("D", "u₁")]]
+        sink = RecordSink()
+        prover = ResolutionProver(premises + negated_conclusion, negated_conclusion, sink)
+        self.assertFalse(prover.saturate())
+        self.assertEqual(prover.get_removed()[BACKWARD_SUBSUMED], 1)
+        given = [record["clause"] for record in sink.get_records() if record["event"] == "given"]
+        # the premise is clause 0 and the negated conclusion clauses 1 and 2
+        self.assertEqual(given, [1, 3])
+
+
+class UnificationTest(unittest.TestCase):
+    def test_occurs_check(self):
+        prover = ResolutionProver([], [], NullSink())
+        clause = prover.load_clause([literal("P", "x"), Function("P", Function("g", Variable("x")), True)])
+        # x against g(x) in the same clause fails, in two clauses the x are not the same variable
+        self.assertIsNone(unify(clause[0].get_inside(), 0, clause[1].get_inside(), 0))
+        self.assertIsNotNone(unify(clause[0].get_inside(), 0, clause[1].get_inside(), 1))
+
+    def test_clauses_sharing_a_variable_name(self):
+        given = [literal("P", "x"), literal("Q", "x")]
+        partner = [Function("P", Function("g", Variable("x")), True), literal("R", "x")]
+        self.assertEqual(resolve(given, partner), ["Q(g(x))", "R(x)"])
+
+    def test_bindings_are_followed(self):
+        # x is bound to g(y), which is only applied when the resolvent is built
+        given = [Function("P", Function("g", Variable("x"))), literal("Q", "x")]
+        partner = [Function("P", Function("g", Function("g", Variable("y"))), True), literal("R", "y")]
+        self.assertEqual(resolve(given, partner), ["Q(g(y))", "R(y)"])
+
+    def test_clashing_free_variables_are_renamed(self):
+        given = [literal("P", "x"), literal("Q", "y")]
+        partner = [literal("P", "x", True), literal("R", "y")]
+        self.assertEqual(resolve(given, partner), ["Q(y)", "R(y')"])
+
+    def test_skolem_constants(self):
+        # distinct constants never unify, a variable takes a constant
+        self.assertIsNone(resolve([literal("P", "u₁")], [literal("P", "u₂", True)]))
+        self.assertEqual(resolve([literal("P", "u₁"), literal("Q", "x")], [literal("P", "x", True)]), ["Q(x)"])
+        self.assertEqual(resolve([literal("P", "x"), literal("Q", "x")], [literal("P", "u₁", True)]), ["Q(u₁)"])
+        self.assertFalse(saturate([[literal("P", "u₁")]], [[literal("P", "u₂", True)]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import time
+import unittest
+
+from formula import Variable, Function
+from simplifier import (DUPLICATE_CLAUSES, SUBSUMED_CLAUSES, ClauseSimplifier, get_clause_key, get_literal_key,
+                        subsumes)
+
+
+def literal(name: str, var_name: str, negation=False) -> Function:
+    return Function(name, Variable(var_name), negation)
+
+
+def get_keys(clause: [Function]) -> [tuple]:
+    return [get_literal_key(literal) for literal in clause]
+
+
+class ClauseKeyTest(unittest.TestCase):
+    def test_tied_literals_in_any_order(self):
+        # the two P literals tie in the sort, Q decides which of them is numbered first
+        clause = [literal("P", "x"), literal("P", "y"), literal("Q", "x")]
+        variants = [
+            [literal("P", "y"), literal("P", "x"), literal("Q", "x")],
+            [literal("Q", "z"), literal("P", "w"), literal("P", "z")],
+        ]
+        for variant in variants:
+            self.assertEqual(get_clause_key(get_keys(variant)), get_clause_key(get_keys(clause)))
+        other = [literal("P", "x"), literal("P", "x"), literal("Q", "y")]
+        self.assertNotEqual(get_clause_key(get_keys(other)), get_clause_key(get_keys(clause)))
+
+    def test_long_clause_of_tied_literals(self):
+        # every P literal ties in the sort, trying their orders would take hours
+        names = ["x" + str(n) for n in range(40)]
+        clause = [literal("P", var_name) for var_name in names] + [literal("Q", names[7])]
+        variant = [literal("P", "y" + var_name) for var_name in reversed(names)] + [literal("Q", "y" + names[20])]
+        start = time.perf_counter()
+        self.assertEqual(get_clause_key(get_keys(clause)), get_clause_key(get_keys(variant)))
+        self.assertLess(time.perf_counter() - start, 1)
+
+    def test_variants_are_duplicates(self):
+        simplifier = ClauseSimplifier()
+        clauses = simplifier.simplify([
+            [literal("P", "x"), literal("P", "y"), literal("Q", "x")],
+            [literal("P", "y"), literal("P", "x"), literal("Q", "x")],
+        ])
+        self.assertEqual(len(clauses), 1)
+        self.assertEqual(simplifier.get_removed()[DUPLICATE_CLAUSES], 1)
+        self.assertEqual(simplifier.get_removed()[SUBSUMED_CLAUSES], 0)
+
+
+class SubsumptionTest(unittest.TestCase):
+    def test_literals_may_match_the_same_literal(self):
+        # x and y both take u₁
+        subsuming = get_keys([literal("P", "x"), literal("P", "y")])
+        self.assertTrue(subsumes(subsuming, get_keys([literal("P", "u₁"), literal("Q", "u₁")])))
+        # but a longer clause doesn't subsume a shorter one, such as its own factor
+        self.assertFalse(subsumes(subsuming, get_keys([literal("P", "u₁")])))
+
+    def test_backtracking(self):
+        # P(x) is matched first, only its second candidate leaves a match for Q(x)
+        subsuming = get_keys([literal("P", "x"), literal("Q", "x")])
+        for subsumed in (
+                [literal("P", "u₂"), literal("P", "u₁"), literal("Q", "u₂"), literal("Q", "u₃")],
+                [literal("P", "u₁"), literal("P", "u₂"), literal("Q", "u₂"), literal("Q", "u₃")],
+        ):
+            self.assertTrue(subsumes(subsuming, get_keys(subsumed)))
+        # every literal has a match on its own, but no single substitution matches both
+        self.assertFalse(subsumes(
+            subsuming,
+            get_keys([literal("P", "u₁"), literal("P", "u₂"), literal("Q", "u₃"), literal("R", "u₁")])
+        ))
+
+    def test_subsumed_clauses_are_removed(self):
+        simplifier = ClauseSimplifier()
+        clauses = simplifier.simplify([
+            [literal("P", "u₁"), literal("Q", "u₁")],
+            [literal("P", "x")],
+            [literal("P", "u₂"), literal("R", "u₂")],
+        ])
+        self.assertEqual([[literal.to_string() for literal in clause] for clause in clauses], [["P(x)"]])
+        self.assertEqual(simplifier.get_removed()[SUBSUMED_CLAUSES], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from enums import Connective, Quantifier
+from formula import Unary, Binary, Function, Variable
+from infix_parser import parse_infix
+from mvp.domain.services.TranspilerService import TranspilerService
+from mvp.domain.services.transpiler import Transpiler
+from test_infix_parser import PAIRS
+
+
+def get_shape(formula) -> tuple:
+    # the tree as plain values, the same for the prototype and the mvp models
+    kind = formula.get_formula_type().name
+    if kind == "BINARY":
+        return kind, formula.get_connective().name, get_shape(formula.get_left()), get_shape(formula.get_right())
+    if kind == "UNARY":
+        return (kind, formula.get_quantifier().name, formula.get_quant_var(), formula.get_negation(),
+                get_shape(formula.get_inside()))
+    if kind == "FUNCTION":
+        return kind, formula.get_func_name(), formula.get_negation(), get_shape(formula.get_inside())
+    return kind, formula.get_var_name()
+
+
+class TranspilerTest(unittest.TestCase):
+    def setUp(self):
+        self.transpiler = Transpiler(Unary, Binary, Function, Variable, Connective, Quantifier)
+
+    def test_same_tree_as_infix(self):
+        for infix, postfix in PAIRS:
+            formula = self.transpiler.transpile(postfix.split())
+            expected = parse_infix(infix)
+            self.assertEqual(get_shape(formula), get_shape(expected), postfix)
+            self.assertEqual(formula.get_var_count(), expected.get_var_count(), postfix)
+
+    def test_mvp_models(self):
+        service = TranspilerService()
+        for _, postfix in PAIRS:
+            formula = service.transpile(postfix.split())
+            expected = self.transpiler.transpile(postfix.split())
+            self.assertEqual(get_shape(formula), get_shape(expected), postfix)
+            self.assertEqual(formula.get_var_count(), expected.get_var_count(), postfix)
+
+    def test_done_and_unknown_tokens(self):
+        # input stops at done, tokens that aren't keywords are skipped
+        self.assertEqual(self.transpiler.transpile("FORM F x done FORM G x AND".split()).to_string(), "F(x)")
+        self.assertEqual(self.transpiler.transpile("FORM F x extra FORM G x AND".split()).to_string(), "(F(x) ∧ G(x))")
+        # names after FORM and the quantifiers are never read as keywords
+        formula = self.transpiler.transpile("FORM NOT AND FORALL AND".split())
+        self.assertEqual(
+            get_shape(formula),
+            ("UNARY", "UNIVERSAL", "AND", False, ("FUNCTION", "NOT", False, ("VARIABLE", "AND")))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
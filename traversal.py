@@ -0,0 +1,92 @@
+from typing import Callable, Iterator, List, Tuple
+
+from enums import Connective, Type
+
+
+def get_children(formula) -> Tuple:
+    formula_type = formula.get_formula_type()
+    if formula_type == Type.BINARY:
+        return formula.get_left(), formula.get_right()
+    if formula_type == Type.VARIABLE:
+        return ()
+    return formula.get_inside(),
+
+
+def visit_children(formula, state) -> List[Tuple]:
+    return [(child, state) for child in get_children(formula)]
+
+
+def visit_connectives(formula, state) -> List[Tuple]:
+    # like visit_children, but stops at atoms instead of entering their terms
+    if formula.get_formula_type() in (Type.BINARY, Type.UNARY):
+        return visit_children(formula, state)
+    return []
+
+
+def visit_conjuncts(formula, state) -> List[Tuple]:
+    # only enters conjunctions, so the conjuncts of a CNF formula are the leaves
+    if (formula.get_formula_type() == Type.BINARY
+            and formula.get_connective() == Connective.AND):
+        return visit_children(formula, state)
+    return []
+
+
+def keep_node(node, state, results):
+    return node
+
+
+def fold(
+        node,
+        descend: Callable[[object, object], List[Tuple]],
+        combine: Callable[[object, object, List], object],
+        state=None
+):
+    """
+    Depth first traversal driven by an explicit stack, so the depth of the
+    tree is not limited by the recursion limit.
+    descend(node, state) is called on the way down (pre-order) and returns
+    the (child, child_state) pairs to visit, left to right.
+    combine(node, state, results) is called on the way up (post-order) with
+    the results of those children, and its return value is the result of
+    the node.
+    """
+    results = []
+    # child_count is None until the node's children have been pushed
+    stack = [(node, state, None)]
+    push = stack.append
+    pop = stack.pop
+    while stack:
+        current, current_state, child_count = pop()
+        if child_count is None:
+            children = descend(current, current_state)
+            push((current, current_state, len(children)))
+            for child, child_state in reversed(children):
+                push((child, child_state, None))
+        elif child_count:
+            child_results = results[-child_count:]
+            del results[-child_count:]
+            results.append(combine(current, current_state, child_results))
+        else:
+            results.append(combine(current, current_state, []))
+    return results.pop()
+
+
+def walk(formula, descend=visit_children) -> Iterator:
+    """
+    Yields the nodes reached through descend in pre-order, left to right.
+    """
+    stack = [formula]
+    while stack:
+        node = stack.pop()
+        yield node
+        for child, _ in reversed(descend(node, None)):
+            stack.append(child)
+
+
+def walk_conjuncts(formula) -> Iterator:
+    """
+    Yields the conjuncts of a formula in CNF, left to right.
+    """
+    for node in walk(formula, visit_conjuncts):
+        if not visit_conjuncts(node, None):
+            yield node